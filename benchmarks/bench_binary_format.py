@@ -0,0 +1,69 @@
+"""Benchmark the compact binary format for numeric sorted containers.
+
+Compares payload size and JSON round-trip time of SortedList[float] and SortedList[int] fields
+serialized as JSON arrays with the same fields using BinaryFormat.
+
+Usage: python benchmarks/bench_binary_format.py [--sizes 1000 100000 1000000]
+"""
+
+import argparse
+import random
+import timeit
+from typing import Annotated
+
+from pydantic import TypeAdapter
+
+from sortedcontainers_pydantic import BinaryFormat, SortedList
+
+CASES = {
+    "SortedList[float]": (
+        TypeAdapter(SortedList[float]),
+        TypeAdapter(Annotated[SortedList[float], BinaryFormat()]),
+        lambda size: [random.random() for _ in range(size)],
+    ),
+    "SortedList[int]": (
+        TypeAdapter(SortedList[int]),
+        TypeAdapter(Annotated[SortedList[int], BinaryFormat()]),
+        lambda size: random.sample(range(size * 10), size),
+    ),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(
+        f"{'type':>18} {'size':>8} {'array (bytes)':>14} {'binary (bytes)':>15} "
+        f"{'array dump+load (s)':>20} {'binary dump+load (s)':>21} {'speedup':>8}"
+    )
+    for size in args.sizes:
+        for name, (array_ta, binary_ta, make_values) in CASES.items():
+            value = array_ta.validate_python(make_values(size))
+            sizes = []
+            seconds = []
+            for ta in (array_ta, binary_ta):
+                data = ta.dump_json(value)
+                assert ta.validate_json(data) == value
+                sizes.append(len(data))
+                number = max(1, 100_000 // size)
+                seconds.append(
+                    min(
+                        timeit.repeat(
+                            lambda ta=ta: ta.validate_json(ta.dump_json(value)),
+                            number=number,
+                            repeat=args.repeat,
+                        )
+                    )
+                    / number
+                )
+            print(
+                f"{name:>18} {size:>8} {sizes[0]:>14,} {sizes[1]:>15,} "
+                f"{seconds[0]:>20.5f} {seconds[1]:>21.5f} {seconds[0] / seconds[1]:>7.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
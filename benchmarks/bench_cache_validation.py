@@ -0,0 +1,63 @@
+"""Benchmark validating the same JSON payload repeatedly with CacheValidation.
+
+Compares validating a payload from JSON without a cache against validating it again with a
+warm CacheValidation cache, which skips validating and sorting the values but still parses the
+JSON, hashes the parsed input, and copies the cached container.
+
+Usage: python benchmarks/bench_cache_validation.py [--sizes 1000 10000 100000]
+"""
+
+import argparse
+import json
+import random
+import timeit
+from typing import Annotated
+
+from pydantic import TypeAdapter
+
+from sortedcontainers_pydantic import CacheValidation, SortedDict, SortedList, SortedSet
+
+CASES = {
+    "SortedList[int]": (SortedList[int], lambda ints: ints),
+    "SortedList[str]": (SortedList[str], lambda ints: [str(i) for i in ints]),
+    "SortedSet[int]": (SortedSet[int], lambda ints: ints),
+    "SortedDict[str, int]": (SortedDict[str, int], lambda ints: {str(i): i for i in ints}),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(
+        f"{'container':>22} {'size':>8} {'uncached (s)':>13} {'cache hit (s)':>14} {'speedup':>8}"
+    )
+    for size in args.sizes:
+        ints = random.sample(range(size * 10), size)
+        number = max(1, 100_000 // size)
+        for name, (annotation, make_input) in CASES.items():
+            payload = json.dumps(make_input(ints))
+            uncached = TypeAdapter(annotation)
+            cached = TypeAdapter(Annotated[annotation, CacheValidation()])
+            assert cached.validate_json(payload) == uncached.validate_json(payload)
+            times = [
+                min(
+                    timeit.repeat(
+                        lambda adapter=adapter: adapter.validate_json(payload),
+                        number=number,
+                        repeat=args.repeat,
+                    )
+                )
+                / number
+                for adapter in (uncached, cached)
+            ]
+            print(
+                f"{name:>22} {size:>8} {times[0]:>13.6f} {times[1]:>14.6f} "
+                f"{times[0] / times[1]:>7.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Benchmark the columnar format for SortedDict containers.
+
+Compares payload size and JSON round-trip time of SortedDict fields serialized as JSON objects
+with the same fields using ColumnarFormat.
+
+Usage: python benchmarks/bench_columnar_format.py [--sizes 1000 100000 1000000]
+"""
+
+import argparse
+import random
+import timeit
+from typing import Annotated
+
+from pydantic import TypeAdapter
+
+from sortedcontainers_pydantic import ColumnarFormat, SortedDict
+
+CASES = {
+    "SortedDict[int, float]": (
+        TypeAdapter(SortedDict[int, float]),
+        TypeAdapter(Annotated[SortedDict[int, float], ColumnarFormat()]),
+        lambda size: {i: random.random() for i in random.sample(range(size * 10), size)},
+    ),
+    "SortedDict[float, int]": (
+        TypeAdapter(SortedDict[float, int]),
+        TypeAdapter(Annotated[SortedDict[float, int], ColumnarFormat()]),
+        lambda size: {random.random(): i for i in range(size)},
+    ),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(
+        f"{'type':>22} {'size':>8} {'object (bytes)':>15} {'columnar (bytes)':>17} "
+        f"{'object dump+load (s)':>21} {'columnar dump+load (s)':>23} {'speedup':>8}"
+    )
+    for size in args.sizes:
+        for name, (object_ta, columnar_ta, make_values) in CASES.items():
+            value = object_ta.validate_python(make_values(size))
+            sizes = []
+            seconds = []
+            for ta in (object_ta, columnar_ta):
+                data = ta.dump_json(value)
+                assert ta.validate_json(data) == value
+                sizes.append(len(data))
+                number = max(1, 100_000 // size)
+                seconds.append(
+                    min(
+                        timeit.repeat(
+                            lambda ta=ta: ta.validate_json(ta.dump_json(value)),
+                            number=number,
+                            repeat=args.repeat,
+                        )
+                    )
+                    / number
+                )
+            print(
+                f"{name:>22} {size:>8} {sizes[0]:>15,} {sizes[1]:>17,} "
+                f"{seconds[0]:>21.5f} {seconds[1]:>23.5f} {seconds[0] / seconds[1]:>7.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
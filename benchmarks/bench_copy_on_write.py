@@ -0,0 +1,96 @@
+"""Benchmark snapshotting models with large sorted fields using model_copy(deep=True).
+
+Compares fields with sortedcontainers' classes, which are deep copied by copying every value into
+new containers that are sorted again, with sortedcontainers_pydantic's classes, which share their
+internal sorted sublists with the copy and only copy a sublist when either modifies it. The set
+of a SortedSet and the dict of a SortedDict are still copied. Reports the time and memory
+allocated to take a snapshot, and the time of the first few modifications to the snapshot
+afterwards, which copy the sublists they modify.
+
+Usage: python benchmarks/bench_copy_on_write.py [--sizes 10000 1000000] [--writes 100]
+"""
+
+import argparse
+import random
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, Tuple
+
+from pydantic import BaseModel, create_model
+
+from sortedcontainers_pydantic import (
+    AnnotatedSortedDict,
+    AnnotatedSortedList,
+    AnnotatedSortedSet,
+    SortedDict,
+    SortedList,
+    SortedSet,
+)
+
+# Field types for sortedcontainers and sortedcontainers_pydantic, input, and a modification
+CASES: Dict[str, Tuple[Any, Any, Callable[[Any], Any], Callable[[Any, int], None]]] = {
+    "SortedList[int]": (
+        AnnotatedSortedList[int],
+        SortedList[int],
+        lambda ints: ints,
+        lambda container, value: container.add(value),
+    ),
+    "SortedSet[int]": (
+        AnnotatedSortedSet[int],
+        SortedSet[int],
+        lambda ints: ints,
+        lambda container, value: container.add(value),
+    ),
+    "SortedDict[str, int]": (
+        AnnotatedSortedDict[str, int],
+        SortedDict[str, int],
+        lambda ints: {str(i): i for i in ints},
+        lambda container, value: container.__setitem__(str(value), value),
+    ),
+}
+
+
+def snapshot(model: BaseModel) -> Tuple[BaseModel, float, int]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    copied = model.model_copy(deep=True)
+    seconds = time.perf_counter() - start
+    allocated = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return copied, seconds, allocated
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 1_000_000])
+    parser.add_argument("--writes", type=int, default=100)
+    args = parser.parse_args()
+
+    print(
+        f"{'field':>22} {'classes':>26} {'size':>8} {'snapshot (s)':>13} "
+        f"{'snapshot (MiB)':>15} {f'{args.writes} writes (s)':>16}"
+    )
+    for size in args.sizes:
+        ints = random.sample(range(size * 10), size)
+        writes = random.sample(range(size * 10), args.writes)
+        for name, (*annotations, make_input, write) in CASES.items():
+            data = make_input(ints)
+            for module, annotation in zip(
+                ("sortedcontainers", "sortedcontainers_pydantic"), annotations
+            ):
+                model_cls = create_model("Model", field=(annotation, ...))
+                model = model_cls(field=data)
+                copied, seconds, allocated = snapshot(model)
+                start = time.perf_counter()
+                for value in writes:
+                    write(copied.field, value)
+                write_seconds = time.perf_counter() - start
+                assert model == model_cls(field=data)
+                print(
+                    f"{name:>22} {module:>26} {size:>8} {seconds:>13.4f} "
+                    f"{allocated / 2**20:>15.1f} {write_seconds:>16.4f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Benchmark applying small changes to large sorted containers with Delta.
+
+Compares sending and validating a whole changed container from JSON against validating a Delta
+of the changes from JSON and applying it to the existing container. The delta timings include
+undoing the change afterwards, so they're an upper bound.
+
+Usage: python benchmarks/bench_delta.py [--sizes 10000 100000 1000000] [--changes 10]
+"""
+
+import argparse
+import json
+import random
+import timeit
+
+from pydantic import TypeAdapter
+
+from sortedcontainers_pydantic import Delta, SortedDict, SortedSet
+
+CASES = {
+    "SortedSet[int]": (SortedSet[int], lambda ints: SortedSet(ints)),
+    "SortedDict[int, int]": (SortedDict[int, int], lambda ints: SortedDict(zip(ints, ints))),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--changes", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'type':>20} {'size':>8} {'full (s)':>10} {'delta (s)':>10} {'speedup':>8}")
+    for size in args.sizes:
+        ints = random.sample(range(size * 10), size + args.changes)
+        for name, (annotation, make_container) in CASES.items():
+            container = make_container(ints[:size])
+            changed = make_container(ints[args.changes :])
+            full_ta = TypeAdapter(annotation)
+            delta_ta = TypeAdapter(Delta[annotation])
+            full_data = full_ta.dump_json(changed)
+            delta_data = json.dumps(delta_ta.dump_python(Delta.between(container, changed)))
+
+            # Undo the change after applying it, so that it can be applied repeatedly
+            undo = Delta.between(changed, container)
+
+            def apply_delta():
+                undo.apply(delta_ta.validate_json(delta_data).apply(container))
+
+            assert delta_ta.validate_json(delta_data).apply(container.copy()) == changed
+            number = max(1, 100_000 // size)
+            full = min(
+                timeit.repeat(
+                    lambda: full_ta.validate_json(full_data), number=number, repeat=args.repeat
+                )
+            )
+            full /= number
+            delta = min(timeit.repeat(apply_delta, number=number, repeat=args.repeat)) / number
+            print(f"{name:>20} {size:>8} {full:>10.6f} {delta:>10.6f} {full / delta:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
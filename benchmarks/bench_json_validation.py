@@ -0,0 +1,72 @@
+"""Benchmark validating sorted containers from JSON.
+
+Compares the current schemas, which validate JSON arrays and objects natively as lists and dicts
+and bulk-load the container from them, with the previous approach of validating through the
+generic Iterable, Set, and Mapping schemas and passing the result to the constructor.
+
+Usage: python benchmarks/bench_json_validation.py [--sizes 1000 10000 100000 1000000]
+"""
+
+import argparse
+from functools import partial
+import json
+import random
+import timeit
+from typing import Annotated, Iterable, Mapping, Set
+
+from pydantic import AfterValidator, TypeAdapter
+
+from sortedcontainers_pydantic import SortedDict, SortedList, SortedSet
+
+CASES = {
+    "SortedList[int]": (
+        TypeAdapter(Annotated[Iterable[int], AfterValidator(lambda v: SortedList(v))]),
+        TypeAdapter(SortedList[int]),
+        lambda ints: ints,
+    ),
+    "SortedSet[int]": (
+        TypeAdapter(Annotated[Set[int], AfterValidator(lambda v: SortedSet(v))]),
+        TypeAdapter(SortedSet[int]),
+        lambda ints: ints,
+    ),
+    "SortedDict[str, int]": (
+        TypeAdapter(Annotated[Mapping[str, int], AfterValidator(lambda v: SortedDict(v))]),
+        TypeAdapter(SortedDict[str, int]),
+        lambda ints: {str(i): i for i in ints},
+    ),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000, 1_000_000]
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(
+        f"{'type':>20} {'size':>8} {'before (items/s)':>17} {'after (items/s)':>16} {'speedup':>8}"
+    )
+    for size in args.sizes:
+        ints = random.sample(range(size * 10), size)
+        for name, (before, after, make_input) in CASES.items():
+            data = json.dumps(make_input(ints))
+            assert before.validate_json(data) == after.validate_json(data)
+            rates = []
+            for ta in (before, after):
+                number = max(1, 100_000 // size)
+                seconds = min(
+                    timeit.repeat(
+                        partial(ta.validate_json, data), number=number, repeat=args.repeat
+                    )
+                )
+                rates.append(size * number / seconds)
+            print(
+                f"{name:>20} {size:>8} {rates[0]:>17,.0f} {rates[1]:>16,.0f} "
+                f"{rates[1] / rates[0]:>7.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
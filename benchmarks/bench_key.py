@@ -0,0 +1,58 @@
+"""Benchmark validating keyed sorted containers with Key.
+
+Compares Key, which passes validated values directly into the keyed container, with wrapping the
+un-keyed schema in an after validator, which first sorts the values into a container without the
+key and then re-sorts them into the keyed container.
+
+Usage: python benchmarks/bench_key.py [--sizes 1000 100000 500000] [--repeat 5]
+"""
+
+import argparse
+from functools import partial
+from operator import neg
+import random
+import timeit
+import tracemalloc
+from typing import Annotated
+
+from pydantic import AfterValidator, TypeAdapter
+
+from sortedcontainers_pydantic import Key, SortedKeyList, SortedList
+
+
+def peak_memory(func):
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 100_000, 500_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    adapters = {
+        "wrapped": TypeAdapter(
+            Annotated[SortedList[int], AfterValidator(partial(SortedKeyList, key=neg))]
+        ),
+        "Key": TypeAdapter(Annotated[SortedList[int], Key(neg)]),
+    }
+
+    print(f"{'size':>10} {'variant':>10} {'time (ms)':>12} {'peak memory (MB)':>18}")
+    for size in args.sizes:
+        data = random.sample(range(size * 10), size)
+        for name, ta in adapters.items():
+            assert list(ta.validate_python(data)) == sorted(data, reverse=True)
+            seconds = min(
+                timeit.repeat(partial(ta.validate_python, data), number=1, repeat=args.repeat)
+            )
+            peak = peak_memory(partial(ta.validate_python, data))
+            print(f"{size:>10} {name:>10} {seconds * 1e3:>12.2f} {peak / 2**20:>18.2f}")
+
+
+if __name__ == "__main__":
+    main()
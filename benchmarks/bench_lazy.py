@@ -0,0 +1,72 @@
+"""Benchmark validating models with large sorted fields eagerly and with Lazy.
+
+Compares a model with SortedList[int] and SortedDict[int, str] fields against the same model with
+the fields annotated with Lazy, for the time to validate from JSON, to validate and serialize
+back to JSON without using the fields, like a handler that passes them through, and to validate
+and then use both fields, which builds the lazy containers.
+
+Usage: python benchmarks/bench_lazy.py [--sizes 10000 1000000] [--repeat 3]
+"""
+
+import argparse
+import json
+import random
+import time
+from typing import Annotated, Any, Callable
+
+from pydantic import BaseModel
+
+from sortedcontainers_pydantic import Lazy, SortedDict, SortedList
+
+
+class EagerModel(BaseModel):
+    scores: SortedList[int]
+    index: SortedDict[int, str]
+
+
+class LazyModel(BaseModel):
+    scores: Annotated[SortedList[int], Lazy()]
+    index: Annotated[SortedDict[int, str], Lazy()]
+
+
+def best_time(function: Callable[[], Any], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'model':>11} {'size':>9} {'validate (s)':>13} {'round trip (s)':>15} {'use (s)':>9}")
+    for size in args.sizes:
+        scores = [random.randrange(size * 10) for _ in range(size)]
+        index = {random.randrange(size * 10): str(i) for i in range(size)}
+        data = json.dumps({"scores": scores, "index": index})
+        for model_cls in (EagerModel, LazyModel):
+
+            def round_trip() -> None:
+                model_cls.model_validate_json(data).model_dump_json()
+
+            def use() -> None:
+                model = model_cls.model_validate_json(data)
+                model.scores.bisect_left(size)
+                model.index.peekitem(0)
+
+            validate_seconds = best_time(lambda: model_cls.model_validate_json(data), args.repeat)
+            round_trip_seconds = best_time(round_trip, args.repeat)
+            use_seconds = best_time(use, args.repeat)
+            print(
+                f"{model_cls.__name__:>11} {size:>9} {validate_seconds:>13.4f} "
+                f"{round_trip_seconds:>15.4f} {use_seconds:>9.4f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Benchmark insert and lookup latency of SortedList fields with different LoadFactor settings.
+
+Validates a SortedList[int] field of each size with each load factor, then times adding and
+removing random values, membership checks, and indexing by position. Reports the mean latency
+of each operation in nanoseconds, the best of a few repeats. Smaller load factors make inserts
+cheaper and larger ones make indexing cheaper, while membership checks barely change.
+
+Usage: python benchmarks/bench_load_factor.py [--sizes 1000 1000000] [--loads 100 1000 auto]
+"""
+
+import argparse
+import random
+import time
+from typing import Annotated, Any, Callable, List
+
+from pydantic import TypeAdapter
+
+from sortedcontainers_pydantic import LoadFactor, SortedList
+
+
+def parse_load(value: str) -> Any:
+    return value if value == "auto" else int(value)
+
+
+def time_per_op(operation: Callable[[Any], Any], values: List[int], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for value in values:
+            operation(value)
+        best = min(best, time.perf_counter() - start)
+    return best / len(values) * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000, 1_000_000, 10_000_000]
+    )
+    parser.add_argument(
+        "--loads", type=parse_load, nargs="+", default=[100, 316, 1_000, 3_162, "auto"]
+    )
+    parser.add_argument("--ops", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(
+        f"{'size':>10} {'load factor':>12} {'sublists':>9} {'insert (ns)':>12} "
+        f"{'lookup (ns)':>12} {'index (ns)':>11}"
+    )
+    for size in args.sizes:
+        values = random.sample(range(size * 10), size)
+        probes = [random.randrange(size * 10) for _ in range(args.ops)]
+        indices = [random.randrange(size) for _ in range(args.ops)]
+        for load in args.loads:
+            ta = TypeAdapter(Annotated[SortedList[int], LoadFactor(load)])
+            sorted_list = ta.validate_python(values)
+
+            def insert(value: int) -> None:
+                sorted_list.add(value)
+                sorted_list.remove(value)
+
+            insert_ns = time_per_op(insert, probes, args.repeat) / 2
+            lookup_ns = time_per_op(sorted_list.__contains__, probes, args.repeat)
+            index_ns = time_per_op(sorted_list.__getitem__, indices, args.repeat)
+            name = f"{load} ({sorted_list._load})" if load == "auto" else str(load)
+            print(
+                f"{size:>10} {name:>12} {len(sorted_list._lists):>9} {insert_ns:>12.0f} "
+                f"{lookup_ns:>12.0f} {index_ns:>11.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Benchmark keeping only the top k items of a sorted container.
+
+Compares validating with MaxItems, which selects the kept items with a heap in O(n log k), with
+the previous approach of validating everything into a SortedList, sorting all n items, and then
+truncating the result.
+
+Usage: python benchmarks/bench_max_items.py [--sizes 10000 100000 1000000] [--k 10 1000]
+"""
+
+import argparse
+from functools import partial
+import random
+import timeit
+from typing import Annotated
+
+from pydantic import TypeAdapter
+
+from sortedcontainers_pydantic import MaxItems, SortedList
+
+
+def validate_then_truncate(ta: TypeAdapter, k: int, data: list) -> SortedList:
+    sorted_list = ta.validate_python(data)
+    del sorted_list[k:]
+    return sorted_list
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--k", type=int, nargs="+", default=[10, 1_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    full_ta = TypeAdapter(SortedList[float])
+    print(f"{'size':>8} {'k':>6} {'before (items/s)':>17} {'after (items/s)':>16} {'speedup':>8}")
+    for size in args.sizes:
+        data = [random.random() for _ in range(size)]
+        for k in args.k:
+            bounded_ta = TypeAdapter(Annotated[SortedList[float], MaxItems(k)])
+            before = partial(validate_then_truncate, full_ta, k, data)
+            after = partial(bounded_ta.validate_python, data)
+            assert list(before()) == list(after())
+            rates = []
+            for func in (before, after):
+                number = max(1, 100_000 // size)
+                seconds = min(timeit.repeat(func, number=number, repeat=args.repeat))
+                rates.append(size * number / seconds)
+            print(
+                f"{size:>8} {k:>6} {rates[0]:>17,.0f} {rates[1]:>16,.0f} "
+                f"{rates[1] / rates[0]:>7.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Benchmark model class creation time for models with many sorted container fields.
+
+Compares creating many model classes with the core schema cache enabled and disabled. Every
+model has the same mix of SortedList, SortedSet, and SortedDict fields, like a service that
+defines many models using the same container types.
+
+Usage: python benchmarks/bench_model_creation.py [--models 100] [--fields 30]
+"""
+
+import argparse
+import time
+from typing import Annotated
+
+from pydantic import create_model
+
+import sortedcontainers_pydantic
+from sortedcontainers_pydantic import Key, SortedDict, SortedList, SortedSet
+
+FIELD_TYPES = [
+    SortedList[int],
+    SortedSet[str],
+    SortedDict[str, float],
+    Annotated[SortedList[float], Key(abs)],
+]
+
+
+def create_models(num_models: int, num_fields: int) -> float:
+    start = time.perf_counter()
+    for i in range(num_models):
+        fields = {
+            f"field_{j}": (FIELD_TYPES[j % len(FIELD_TYPES)], ...) for j in range(num_fields)
+        }
+        create_model(f"Model{i}", **fields)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--models", type=int, default=100)
+    parser.add_argument("--fields", type=int, default=30)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    maxsize = sortedcontainers_pydantic._SCHEMA_CACHE_MAXSIZE
+    seconds = []
+    for cache_maxsize in (0, maxsize):
+        sortedcontainers_pydantic._SCHEMA_CACHE_MAXSIZE = cache_maxsize
+        times = []
+        for _ in range(args.repeat):
+            sortedcontainers_pydantic._schema_cache.clear()
+            times.append(create_models(args.models, args.fields))
+        seconds.append(min(times))
+
+    print(f"{'models':>7} {'fields':>7} {'no cache (s)':>13} {'cache (s)':>10} {'speedup':>8}")
+    print(
+        f"{args.models:>7} {args.fields:>7} {seconds[0]:>13.3f} {seconds[1]:>10.3f} "
+        f"{seconds[0] / seconds[1]:>7.2f}x"
+    )
+
+
+if __name__ == "__main__":
+    main()
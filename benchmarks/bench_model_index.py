@@ -0,0 +1,101 @@
+"""Benchmark SortedModelIndex against a SortedList of models sorted with Key.
+
+Compares a SortedList[Event] field sorted by timestamp with Key, where queries on other fields
+scan every model, with a SortedModelIndex[Event] field indexed by timestamp with secondary
+indexes by user and priority. Reports the time to validate the field from JSON, the mean time of
+a range query on the primary field and on a secondary field, and the mean time to add and remove
+a model.
+
+Usage: python benchmarks/bench_model_index.py [--sizes 10000 100000] [--queries 1000]
+"""
+
+import argparse
+import json
+import operator
+import random
+import time
+from typing import Annotated, Any, Callable
+
+from pydantic import BaseModel, TypeAdapter
+
+from sortedcontainers_pydantic import IndexBy, Key, SortedList, SortedModelIndex
+
+
+class Event(BaseModel):
+    ts: int
+    user: int
+    priority: int
+
+
+def per_call(function: Callable[[int], Any], count: int) -> float:
+    start = time.perf_counter()
+    for i in range(count):
+        function(i)
+    return (time.perf_counter() - start) / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--queries", type=int, default=1_000)
+    args = parser.parse_args()
+
+    adapters = {
+        "SortedList + Key": TypeAdapter(
+            Annotated[SortedList[Event], Key(operator.attrgetter("ts"))]
+        ),
+        "SortedModelIndex": TypeAdapter(
+            Annotated[SortedModelIndex[Event], IndexBy("ts", ("user", "priority"))]
+        ),
+    }
+    print(
+        f"{'field':>17} {'size':>8} {'validate (s)':>13} {'primary (us)':>13} "
+        f"{'secondary (us)':>15} {'add+remove (us)':>16}"
+    )
+    for size in args.sizes:
+        users = size // 10
+        data = json.dumps(
+            [
+                {"ts": ts, "user": random.randrange(users), "priority": random.randrange(5)}
+                for ts in random.sample(range(size * 10), size)
+            ]
+        )
+        starts = [random.randrange(size * 10) for _ in range(args.queries)]
+        user_ids = [random.randrange(users) for _ in range(args.queries)]
+        new_events = [
+            Event(ts=random.randrange(size * 10), user=random.randrange(users), priority=0)
+            for _ in range(args.queries)
+        ]
+        for name, adapter in adapters.items():
+            start = time.perf_counter()
+            events = adapter.validate_json(data)
+            validate_seconds = time.perf_counter() - start
+
+            def primary(i: int) -> None:
+                list(events.irange_key(starts[i], starts[i] + 100))
+
+            if isinstance(events, SortedModelIndex):
+
+                def secondary(i: int) -> None:
+                    list(events.irange_field("user", user_ids[i], user_ids[i]))
+            else:
+
+                def secondary(i: int) -> None:
+                    [event for event in events if event.user == user_ids[i]]
+
+            def add_remove(i: int) -> None:
+                events.add(new_events[i])
+                events.remove(new_events[i])
+
+            primary_us = per_call(primary, args.queries) * 1e6
+            # Scanning is slow, so time fewer queries
+            secondary_us = per_call(secondary, max(args.queries // 100, 1)) * 1e6
+            add_remove_us = per_call(add_remove, args.queries) * 1e6
+            print(
+                f"{name:>17} {size:>8} {validate_seconds:>13.3f} {primary_us:>13.1f} "
+                f"{secondary_us:>15.1f} {add_remove_us:>16.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Benchmark validating many JSON payloads in parallel with validate_json_many.
+
+Compares validating each payload in turn with TypeAdapter.validate_json against
+validate_json_many with different numbers of worker processes (or threads on free-threaded
+Python builds with the GIL disabled). Speedups depend on the number of available CPUs.
+
+Usage: python benchmarks/bench_parallel.py [--payloads 2000] [--size 2000] [--workers 2 4 8]
+"""
+
+import argparse
+import json
+import os
+import random
+import time
+
+from pydantic import BaseModel, TypeAdapter
+
+from sortedcontainers_pydantic import SortedDict, SortedList, validate_json_many
+
+
+class Document(BaseModel):
+    values: SortedList[int]
+    index: SortedDict[str, float]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--payloads", type=int, default=2_000)
+    parser.add_argument("--size", type=int, default=2_000, help="Values per payload")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    payloads = [
+        json.dumps(
+            {
+                "values": random.sample(range(args.size * 10), args.size),
+                "index": {str(i): i / 3 for i in random.sample(range(args.size * 10), args.size)},
+            }
+        )
+        for _ in range(args.payloads)
+    ]
+    print(f"{args.payloads:,} payloads with {args.size:,} values each, {os.cpu_count()} CPUs")
+
+    adapter = TypeAdapter(Document)
+    start = time.perf_counter()
+    expected = [adapter.validate_json(payload) for payload in payloads]
+    baseline = time.perf_counter() - start
+    print(f"{'approach':>24} {'seconds':>9} {'speedup':>8}")
+    print(f"{'sequential':>24} {baseline:>9.2f} {1:>7.2f}x")
+    for workers in args.workers:
+        start = time.perf_counter()
+        results = validate_json_many(Document, payloads, max_workers=workers)
+        seconds = time.perf_counter() - start
+        assert results == expected
+        name = f"{workers} workers"
+        print(f"{name:>24} {seconds:>9.2f} {baseline / seconds:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Benchmark pickling sorted containers.
+
+Compares sortedcontainers' classes, which pickle their values as a flat list or set that is
+sorted again when unpickled, with sortedcontainers_pydantic's classes, which pickle their
+internal sublists and load them without sorting. Times a round trip of pickle.dumps and
+pickle.loads with the highest protocol, as used when passing containers to process pools.
+
+Usage: python benchmarks/bench_pickle.py [--sizes 1000 100000 1000000]
+"""
+
+import argparse
+from functools import partial
+import pickle
+import random
+import timeit
+from typing import Any, Callable, Dict, List
+
+import sortedcontainers
+
+import sortedcontainers_pydantic
+
+VALUE_TYPES: Dict[str, Callable[[List[int]], List[Any]]] = {
+    "int": lambda ints: ints,
+    "float": lambda ints: [i / 7 for i in ints],
+    "str": lambda ints: [str(i) for i in ints],
+}
+
+CONTAINERS: Dict[str, Callable[[Any, List[Any]], Any]] = {
+    "SortedList": lambda module, values: module.SortedList(values),
+    "SortedSet": lambda module, values: module.SortedSet(values),
+    "SortedDict": lambda module, values: module.SortedDict(zip(values, values)),
+}
+
+
+def round_trip(obj: Any) -> Any:
+    return pickle.loads(pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(
+        f"{'container':>12} {'values':>6} {'size':>8} {'sortedcontainers (s)':>21} "
+        f"{'sortedcontainers_pydantic (s)':>30} {'speedup':>8}"
+    )
+    for size in args.sizes:
+        ints = random.sample(range(size * 10), size)
+        number = max(1, 100_000 // size)
+        for container, make_container in CONTAINERS.items():
+            for value_type, make_values in VALUE_TYPES.items():
+                values = make_values(ints)
+                before = make_container(sortedcontainers, values)
+                after = make_container(sortedcontainers_pydantic, values)
+                assert round_trip(after) == before
+                times = [
+                    min(timeit.repeat(partial(round_trip, obj), number=number, repeat=args.repeat))
+                    / number
+                    for obj in (before, after)
+                ]
+                print(
+                    f"{container:>12} {value_type:>6} {size:>8} {times[0]:>21.6f} "
+                    f"{times[1]:>30.6f} {times[0] / times[1]:>7.2f}x"
+                )
+
+
+if __name__ == "__main__":
+    main()
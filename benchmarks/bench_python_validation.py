@@ -0,0 +1,101 @@
+"""Benchmark validating sorted containers from Python objects.
+
+Compares the current schemas, which pick one validation branch up front from the type of the
+input, with the previous approach of a union that tries each branch in turn. Inputs are chosen to
+take the later branch of the previous union, such as a list of pairs for SortedDict.
+
+Usage: python benchmarks/bench_python_validation.py [--sizes 1000 10000 100000 1000000]
+"""
+
+import argparse
+import random
+import timeit
+from typing import Annotated, Iterable, Mapping, Set, Tuple, Union
+
+from pydantic import AfterValidator, Field, TypeAdapter
+
+from sortedcontainers_pydantic import (
+    SortedDict,
+    SortedList,
+    SortedSet,
+    count_validation_branches,
+    get_validation_branch_counts,
+    reset_validation_branch_counts,
+)
+
+CASES = {
+    "SortedList[int]": (
+        TypeAdapter(Annotated[Iterable[int], AfterValidator(lambda v: SortedList(v))]),
+        TypeAdapter(SortedList[int]),
+        lambda ints: ints,
+    ),
+    "SortedSet[int]": (
+        TypeAdapter(
+            Annotated[
+                Union[Set[int], Iterable[int]],
+                Field(union_mode="left_to_right"),
+                AfterValidator(lambda v: SortedSet(v)),
+            ]
+        ),
+        TypeAdapter(SortedSet[int]),
+        lambda ints: (i for i in ints),
+    ),
+    "SortedDict[str, int]": (
+        TypeAdapter(
+            Annotated[
+                Union[Mapping[str, int], Iterable[Tuple[str, int]]],
+                Field(union_mode="left_to_right"),
+                AfterValidator(lambda v: SortedDict(v)),
+            ]
+        ),
+        TypeAdapter(SortedDict[str, int]),
+        lambda ints: [(str(i), i) for i in ints],
+    ),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000, 1_000_000]
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    reset_validation_branch_counts()
+    print(
+        f"{'type':>20} {'size':>8} {'before (items/s)':>17} {'after (items/s)':>16} {'speedup':>8}"
+    )
+    for size in args.sizes:
+        ints = random.sample(range(size * 10), size)
+        for name, (before, after, make_input) in CASES.items():
+            # Count the branches taken only while checking the results, not while timing
+            count_validation_branches()
+            assert before.validate_python(make_input(ints)) == after.validate_python(
+                make_input(ints)
+            )
+            count_validation_branches(False)
+            rates = []
+            for ta in (before, after):
+                number = max(1, 100_000 // size)
+                data = [make_input(ints) for _ in range(number * args.repeat)]
+                inputs = iter(data)
+                seconds = min(
+                    timeit.repeat(
+                        lambda: ta.validate_python(next(inputs)), number=number, repeat=args.repeat
+                    )
+                )
+                rates.append(size * number / seconds)
+            print(
+                f"{name:>20} {size:>8} {rates[0]:>17,.0f} {rates[1]:>16,.0f} "
+                f"{rates[1] / rates[0]:>7.2f}x"
+            )
+
+    print()
+    print("Branches taken:")
+    for (cls_name, branch), count in sorted(get_validation_branch_counts().items()):
+        print(f"{cls_name:>20} {branch:>10} {count:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Benchmark serializing sorted containers with model_dump_json and model_dump.
+
+Compares the typed serializers, which use the item schemas, with untyped serializers that convert
+to a list or dict and leave pydantic-core to infer the type of every item.
+
+Usage: python benchmarks/bench_serialization.py [--size 300000] [--repeat 5]
+"""
+
+import argparse
+from functools import partial
+import random
+import timeit
+from typing import Annotated, Tuple
+
+from pydantic import BaseModel, PlainSerializer
+
+from sortedcontainers_pydantic import SortedDict, SortedList, SortedSet
+
+
+class Typed(BaseModel):
+    lst_float: SortedList[float]
+    lst_tuple: SortedList[Tuple[int, int]]
+    st_str: SortedSet[str]
+    dct_int: SortedDict[int, float]
+    dct_int_sorted: SortedDict[int, float]
+
+
+class Untyped(BaseModel):
+    lst_float: Annotated[SortedList[float], PlainSerializer(list)]
+    lst_tuple: Annotated[SortedList[Tuple[int, int]], PlainSerializer(list)]
+    st_str: Annotated[SortedSet[str], PlainSerializer(list)]
+    dct_int: Annotated[SortedDict[int, float], PlainSerializer(dict)]
+    dct_int_sorted: Annotated[SortedDict[int, float], PlainSerializer(dict)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=300_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    ints = random.sample(range(args.size * 10), args.size)
+    data = {
+        "lst_float": [float(i) for i in ints],
+        "lst_tuple": [(i, -i) for i in ints],
+        "st_str": [str(i) for i in ints],
+        "dct_int": {i: float(i) for i in ints},
+        # Insertion order matches sorted order, so the SortedDict can be serialized directly
+        "dct_int_sorted": {i: float(i) for i in sorted(ints)},
+    }
+
+    print(f"{'field':>14} {'model':>8} {'dump_json (ms)':>15} {'dump (ms)':>10}")
+    for field in data:
+        for model in (Untyped, Typed):
+            instance = model.model_validate(data)
+            results = []
+            for method in (instance.model_dump_json, instance.model_dump):
+                func = partial(method, include={field})
+                results.append(min(timeit.repeat(func, number=1, repeat=args.repeat)))
+            print(
+                f"{field:>14} {model.__name__:>8} {results[0] * 1e3:>15.2f} "
+                f"{results[1] * 1e3:>10.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Benchmark SortedArray against SortedList for numeric fields.
+
+Compares SortedList[float] with SortedArray[float] and SortedArray[numpy.float32] fields, for
+the time to validate from a JSON array, the memory allocated by the validated container, the
+time to look up the bisection index of many values one at a time and all at once (vectorized,
+SortedArray only), and the time to add values one at a time. Requires NumPy.
+
+Usage: python benchmarks/bench_sorted_array.py [--sizes 10000 1000000] [--lookups 100000]
+"""
+
+import argparse
+import json
+import random
+import time
+import tracemalloc
+
+import numpy as np
+from pydantic import TypeAdapter
+
+from sortedcontainers_pydantic import SortedArray, SortedList
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 1_000_000])
+    parser.add_argument("--lookups", type=int, default=100_000)
+    parser.add_argument("--adds", type=int, default=1_000)
+    args = parser.parse_args()
+
+    adapters = {
+        "SortedList[float]": TypeAdapter(SortedList[float]),
+        "SortedArray[float]": TypeAdapter(SortedArray[float]),
+        "SortedArray[float32]": TypeAdapter(SortedArray[np.float32]),
+    }
+    print(
+        f"{'type':>22} {'size':>9} {'validate (s)':>13} {'memory (MiB)':>13} "
+        f"{'bisect (s)':>11} {'vectorized (s)':>15} {'add (s)':>9}"
+    )
+    for size in args.sizes:
+        data = json.dumps([random.random() for _ in range(size)])
+        lookups = [random.random() for _ in range(args.lookups)]
+        adds = [random.random() for _ in range(args.adds)]
+        for name, adapter in adapters.items():
+            tracemalloc.start()
+            start = time.perf_counter()
+            container = adapter.validate_json(data)
+            validate_seconds = time.perf_counter() - start
+            memory = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+
+            start = time.perf_counter()
+            for value in lookups:
+                container.bisect_left(value)
+            bisect_seconds = time.perf_counter() - start
+
+            vectorized = ""
+            if isinstance(container, SortedArray):
+                values = np.array(lookups)
+                start = time.perf_counter()
+                container.bisect_left(values)
+                vectorized = f"{time.perf_counter() - start:.4f}"
+
+            start = time.perf_counter()
+            for value in adds:
+                container.add(value)
+            add_seconds = time.perf_counter() - start
+            print(
+                f"{name:>22} {size:>9} {validate_seconds:>13.4f} {memory / 2**20:>13.1f} "
+                f"{bisect_seconds:>11.4f} {vectorized:>15} {add_seconds:>9.4f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
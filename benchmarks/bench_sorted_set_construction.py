@@ -0,0 +1,67 @@
+"""Benchmark time and memory allocated to validate large SortedSet[str] fields.
+
+Compares validating into a set and passing it to the SortedSet constructor, which hashes every
+value again into its own set, with sortedcontainers_pydantic's SortedSet[str], which adopts the
+validated set as the container's set and only builds the sorted list from it. Inputs are lists
+of random strings with some duplicates, from Python and as JSON. Reports the time and the peak
+memory allocated during validation.
+
+Usage: python benchmarks/bench_sorted_set_construction.py [--sizes 100000 1000000]
+"""
+
+import argparse
+import json
+import random
+import string
+import time
+import tracemalloc
+from typing import Annotated, Any, Callable, Set, Tuple
+
+from pydantic import AfterValidator, TypeAdapter
+
+from sortedcontainers_pydantic import SortedSet
+
+
+def measure(validate: Callable[[Any], Any], data: Any) -> Tuple[Any, float, int]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = validate(data)
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, seconds, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000])
+    args = parser.parse_args()
+
+    adapters = {
+        "Set[str] -> SortedSet": TypeAdapter(
+            Annotated[Set[str], AfterValidator(lambda v: SortedSet(v))]
+        ),
+        "SortedSet[str]": TypeAdapter(SortedSet[str]),
+    }
+    print(f"{'input':>8} {'approach':>22} {'size':>9} {'seconds':>9} {'peak (MiB)':>11}")
+    for size in args.sizes:
+        pool = ["".join(random.choices(string.ascii_letters, k=12)) for _ in range(size)]
+        values = [random.choice(pool) for _ in range(size)]
+        for input_name, data in (("python", values), ("json", json.dumps(values))):
+            expected = None
+            for name, adapter in adapters.items():
+                validate = (
+                    adapter.validate_json if input_name == "json" else adapter.validate_python
+                )
+                # Warm up, so that only validation is measured
+                validate(data[:2] if input_name == "python" else "[]")
+                result, seconds, peak = measure(validate, data)
+                assert expected is None or result == expected
+                expected = result
+                print(
+                    f"{input_name:>8} {name:>22} {size:>9} {seconds:>9.3f} {peak / 2**20:>11.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Benchmark streaming validation of a large JSON array file into a SortedList.
+
+Compares reading the whole file and validating it with TypeAdapter.validate_json against
+validate_json_stream, measuring time and peak memory. Each approach runs in a fresh subprocess
+so that peak resident memory (ru_maxrss, Unix only) can be compared.
+
+Usage: python benchmarks/bench_streaming.py [--size 5000000] [--batch-size 10000]
+"""
+
+import argparse
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from pydantic import TypeAdapter
+
+from sortedcontainers_pydantic import SortedList, validate_json_stream
+
+
+def run(approach: str, path: str, batch_size: int) -> None:
+    """Validate the file with one approach and print seconds and peak memory as JSON."""
+    ta = TypeAdapter(SortedList[float])
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    if approach == "validate_json":
+        with open(path, "rb") as f:
+            sorted_list = ta.validate_json(f.read())
+    else:
+        with open(path, "rb") as f:
+            sorted_list = validate_json_stream(SortedList[float], f, batch_size=batch_size)
+    seconds = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    scale = 1 if sys.platform == "darwin" else 1024
+    print(
+        json.dumps(
+            {"seconds": seconds, "peak_bytes": (peak - baseline) * scale, "len": len(sorted_list)}
+        )
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=5_000_000)
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    parser.add_argument("--run", choices=["validate_json", "validate_json_stream"])
+    parser.add_argument("--path")
+    args = parser.parse_args()
+
+    if args.run:
+        run(args.run, args.path, args.batch_size)
+        return
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "data.json")
+        with open(path, "w") as f:
+            json.dump([random.random() for _ in range(args.size)], f)
+        file_size = os.path.getsize(path)
+
+        print(f"File size: {file_size / 2**20:,.1f} MiB, {args.size:,} values")
+        print(f"{'approach':>22} {'seconds':>9} {'peak memory (MiB)':>18}")
+        for approach in ("validate_json", "validate_json_stream"):
+            output = subprocess.run(
+                [
+                    sys.executable,
+                    __file__,
+                    "--run",
+                    approach,
+                    "--path",
+                    path,
+                    "--batch-size",
+                    str(args.batch_size),
+                ],
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout
+            result = json.loads(output)
+            assert result["len"] == args.size
+            print(
+                f"{approach:>22} {result['seconds']:>9.2f} {result['peak_bytes'] / 2**20:>18,.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+"""Benchmark suite for validation and serialization of every annotation variant.
+
+Times validate_python, validate_json, model_dump, and model_dump_json for models with a single
+field of each sorted container type, in each of the usage approaches, across input sizes and
+input shapes. Models with plain list, set, and dict fields are included as baselines.
+
+Results are written as JSON so that runs on different versions can be compared. Pass a previous
+results file with --compare to print the speedup of each case relative to it.
+
+Usage:
+    python benchmarks/bench_suite.py [--sizes 10 1000 100000] [--repeat 5] [--output results.json]
+    python benchmarks/bench_suite.py --compare before.json --output after.json
+"""
+
+import argparse
+import importlib.metadata
+import json
+import operator
+import platform
+import random
+import sys
+import time
+from typing import Annotated, Any, Callable, Dict, List, Set
+
+from pydantic import BaseModel, ValidationError, create_model
+
+from sortedcontainers_pydantic import (
+    AnnotatedSortedDict,
+    AnnotatedSortedList,
+    AnnotatedSortedSet,
+    Key,
+    SortedDict,
+    SortedList,
+    SortedSet,
+)
+
+SIZES = [10, 100, 1_000, 10_000, 100_000, 1_000_000]
+OPERATIONS = ["validate_python", "validate_json", "model_dump", "model_dump_json"]
+
+# Variant name -> (field type, kind of values, baseline variant name)
+VARIANTS: Dict[str, Any] = {
+    "SortedList[int]": (SortedList[int], "list", "list[int]"),
+    "SortedSet[int]": (SortedSet[int], "set", "set[int]"),
+    "SortedDict[int, int]": (SortedDict[int, int], "dict", "dict[int, int]"),
+    "SortedKeyList[int] (Key)": (
+        Annotated[SortedList[int], Key(operator.neg)],
+        "list",
+        "list[int]",
+    ),
+    "AnnotatedSortedList[int]": (AnnotatedSortedList[int], "list", "list[int]"),
+    "AnnotatedSortedSet[int]": (AnnotatedSortedSet[int], "set", "set[int]"),
+    "AnnotatedSortedDict[int, int]": (AnnotatedSortedDict[int, int], "dict", "dict[int, int]"),
+    "list[int]": (List[int], "list", None),
+    "set[int]": (Set[int], "set", None),
+    "dict[int, int]": (Dict[int, int], "dict", None),
+}
+
+# Kind of values -> input shape -> function making the input from a list of ints
+SHAPES: Dict[str, Dict[str, Callable[[List[int]], Any]]] = {
+    "list": {
+        "list": list,
+        "set": set,
+        "generator": lambda ints: (i for i in ints),
+    },
+    "set": {
+        "list": list,
+        "set": set,
+        "generator": lambda ints: (i for i in ints),
+    },
+    "dict": {
+        "dict": lambda ints: {i: i for i in ints},
+        "list": lambda ints: [(i, i) for i in ints],
+        "generator": lambda ints: ((i, i) for i in ints),
+    },
+}
+
+
+def time_calls(func: Callable[[Any], Any], make_arg: Callable[[], Any], size: int, repeat: int):
+    """Time calls of func, returning the best seconds per call. Arguments are made before timing,
+    since inputs like generators can only be used once."""
+    number = max(1, min(1_000, 100_000 // size))
+    best = float("inf")
+    for _ in range(repeat):
+        args = [make_arg() for _ in range(number)]
+        start = time.perf_counter()
+        for arg in args:
+            func(arg)
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+
+def run_variant(name: str, size: int, operations: List[str], repeat: int) -> List[Dict[str, Any]]:
+    field_type, kind, baseline = VARIANTS[name]
+    model: Any = create_model("Model", value=(field_type, ...))
+    ints = random.sample(range(size * 10), size)
+    base_input = SHAPES[kind]["dict" if kind == "dict" else "list"](ints)
+    instance = model(value=base_input)
+    results = []
+
+    def record(operation: str, shape: str, seconds: float) -> None:
+        results.append(
+            {
+                "variant": name,
+                "baseline": baseline,
+                "operation": operation,
+                "shape": shape,
+                "size": size,
+                "seconds": seconds,
+                "items_per_second": size / seconds,
+            }
+        )
+
+    if "validate_python" in operations:
+        shapes = dict(SHAPES[kind])
+        shapes["instance"] = lambda ints: instance.value
+        for shape, make_input in shapes.items():
+            try:
+                model.model_validate({"value": make_input(ints)})
+            except ValidationError:
+                # Not supported by this variant, e.g., a list of pairs for a plain dict field
+                continue
+            seconds = time_calls(
+                model.model_validate, lambda: {"value": make_input(ints)}, size, repeat
+            )
+            record("validate_python", shape, seconds)
+    if "validate_json" in operations:
+        data = instance.model_dump_json()
+        record(
+            "validate_json",
+            "json",
+            time_calls(model.model_validate_json, lambda: data, size, repeat),
+        )
+    if "model_dump" in operations:
+        record(
+            "model_dump",
+            "instance",
+            time_calls(BaseModel.model_dump, lambda: instance, size, repeat),
+        )
+    if "model_dump_json" in operations:
+        record(
+            "model_dump_json",
+            "instance",
+            time_calls(BaseModel.model_dump_json, lambda: instance, size, repeat),
+        )
+    return results
+
+
+def environment() -> Dict[str, str]:
+    versions = {
+        package: importlib.metadata.version(package)
+        for package in (
+            "sortedcontainers-pydantic",
+            "pydantic",
+            "pydantic-core",
+            "sortedcontainers",
+        )
+    }
+    return {"python": sys.version, "platform": platform.platform(), **versions}
+
+
+def compare(results: List[Dict[str, Any]], previous: List[Dict[str, Any]]) -> None:
+    """Print the speedup of each case relative to a previous run."""
+
+    def case(result):
+        return (result["variant"], result["operation"], result["shape"], result["size"])
+
+    previous_by_case = {case(result): result for result in previous}
+    print(
+        f"{'variant':>30} {'operation':>16} {'shape':>10} {'size':>8} "
+        f"{'before (s)':>11} {'after (s)':>11} {'speedup':>8}"
+    )
+    for result in results:
+        before = previous_by_case.get(case(result))
+        if before is None:
+            continue
+        print(
+            f"{result['variant']:>30} {result['operation']:>16} {result['shape']:>10} "
+            f"{result['size']:>8} {before['seconds']:>11.6f} {result['seconds']:>11.6f} "
+            f"{before['seconds'] / result['seconds']:>7.2f}x"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--variants", nargs="+", choices=list(VARIANTS), default=list(VARIANTS))
+    parser.add_argument("--operations", nargs="+", choices=OPERATIONS, default=OPERATIONS)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write results to this JSON file instead of stdout")
+    parser.add_argument("--compare", help="Previous results JSON file to compare against")
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    results = []
+    for size in args.sizes:
+        for name in args.variants:
+            print(f"Running {name} with size {size}", file=sys.stderr)
+            results.extend(run_variant(name, size, args.operations, args.repeat))
+    output = {"environment": environment(), "results": results}
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(output, f, indent=2)
+    elif not args.compare:
+        json.dump(output, sys.stdout, indent=2)
+        print()
+    if args.compare:
+        with open(args.compare) as f:
+            compare(results, json.load(f)["results"])
+
+
+if __name__ == "__main__":
+    main()
@@ -1,53 +1,115 @@
-from dataclasses import dataclass
-from functools import partial
-import importlib.metadata
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from bisect import bisect_right
+from collections import Counter, OrderedDict
+from contextvars import ContextVar
+import copy
+from dataclasses import dataclass, field, replace
+from functools import lru_cache, partial
+import heapq
+from itertools import islice, repeat
+import math
+import operator
+import sys
+import threading
 from typing import (
     TYPE_CHECKING,
     Annotated,
     Any,
     Callable,
+    Dict,
+    ForwardRef,
     Hashable,
     Iterable,
+    Iterator,
+    List,
+    Literal,
     Mapping,
+    NoReturn,
+    Optional,
     Set,
     Tuple,
     TypeVar,
+    Union,
     get_args,
     get_origin,
 )
 
-from pydantic import (
-    GetCoreSchemaHandler,
-)
-from pydantic_core import core_schema
 import sortedcontainers
 
+from sortedcontainers_pydantic._array import (
+    _ARRAY_METADATA_KEY,
+    SortedArray,
+    _array_binary_schema,
+)
+from sortedcontainers_pydantic._delta import Delta, Snapshot
+from sortedcontainers_pydantic._parallel import validate_json_many
+from sortedcontainers_pydantic._streaming import validate_json_stream, validate_json_stream_async
+
 if TYPE_CHECKING:
     from _typeshed import SupportsRichComparison
+    from pydantic import GetCoreSchemaHandler
+    from pydantic_core import core_schema
 
-
-__version__ = importlib.metadata.version("sortedcontainers-pydantic")
+    __version__: str
 
 __all__ = [
     "SortedDict",
     "SortedList",
     "SortedSet",
     "SortedKeyList",
+    "SortedArray",
+    "SortedModelIndex",
     "SortedDictPydanticAnnotation",
     "SortedListPydanticAnnotation",
     "SortedSetPydanticAnnotation",
     "AnnotatedSortedDict",
     "AnnotatedSortedList",
     "AnnotatedSortedSet",
+    "FrozenSortedDict",
+    "FrozenSortedKeyList",
+    "FrozenSortedList",
+    "FrozenSortedSet",
+    "BinaryFormat",
+    "CacheValidation",
+    "ColumnarFormat",
+    "Delta",
+    "IndexBy",
     "Key",
+    "Lazy",
+    "LoadFactor",
+    "MaxItems",
+    "Presorted",
+    "ReuseInstances",
+    "Snapshot",
     "UnsupportedSourceTypeError",
+    "count_validation_branches",
+    "get_validation_branch_counts",
+    "reset_validation_branch_counts",
+    "validate_json_many",
+    "validate_json_stream",
+    "validate_json_stream_async",
 ]
 
+
+def __getattr__(name: str) -> Any:
+    # Look up the version lazily, since reading distribution metadata is slow
+    if name == "__version__":
+        import importlib.metadata
+
+        version = importlib.metadata.version("sortedcontainers-pydantic")
+        globals()["__version__"] = version
+        return version
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 _KT = TypeVar("_KT", bound=Hashable)  # Key type.
 _VT = TypeVar("_VT")  # Value type.
 _T = TypeVar("_T")
 _OrderableT = TypeVar("_OrderableT", bound="SupportsRichComparison")
 _HashableT = TypeVar("_HashableT", bound=Hashable)
+_ModelT = TypeVar("_ModelT")
 
 
 class _UnsupportedSourceTypeError(Exception):
@@ -86,6 +148,656 @@ def _get_constructor(tp: Any) -> Any:
         raise _UnsupportedSourceTypeError(parsed)
 
 
+_SPEC_METADATA_KEY = "sortedcontainers_pydantic_spec"
+
+# Containers built with these __init__ methods can be bulk-loaded directly
+_BULK_LOADABLE_INITS = {
+    sortedcontainers.SortedDict.__init__,
+    sortedcontainers.SortedKeyList.__init__,
+    sortedcontainers.SortedList.__init__,
+    sortedcontainers.SortedSet.__init__,
+}
+
+
+@dataclass(frozen=True)
+class _ContainerSpec:
+    """Resolved parameters for building the core schema of a sorted container. Annotation
+    classes record this in the metadata of the schemas they generate so that outer annotations,
+    like Key, can rebuild the schema with modified parameters instead of wrapping it.
+    """
+
+    annotation: Any  # Annotation class that builds the schema, e.g., SortedListPydanticAnnotation
+    cls: Any  # Container class to construct, e.g., SortedList
+    args: Tuple[Any, ...]  # Type arguments parsed from the source type
+    key: Optional[Callable[[Any], "SupportsRichComparison"]] = None
+    presorted: Optional["Presorted"] = None
+    reuse: Optional["ReuseInstances"] = None
+    max_items: Optional["MaxItems"] = None
+    binary: Optional["BinaryFormat"] = None
+    columnar: Optional["ColumnarFormat"] = None
+    cache: Optional["CacheValidation"] = None
+    load_factor: Optional["LoadFactor"] = None
+    lazy: Optional["Lazy"] = None
+
+    def container_cls(self) -> Any:
+        """Get the class of the containers that are built, which is bounded if max_items is set."""
+        if self.max_items is None or issubclass(self.cls, _FrozenMixin):
+            # Items can't be added to frozen containers later, so they don't need to be bounded
+            return self.cls
+        cls = self.cls
+        if (
+            self.key is not None
+            and issubclass(cls, sortedcontainers.SortedList)
+            and not issubclass(cls, sortedcontainers.SortedKeyList)
+        ):
+            # SortedList subclasses can't take a key, so bound the keyed class instead
+            cls = SortedKeyList if issubclass(cls, SortedList) else sortedcontainers.SortedKeyList
+        return _bounded_class(cls, self.max_items.k, self.max_items.keep)
+
+    def constructor(self) -> Any:
+        """Get a function that constructs the container, optionally from an iterable."""
+        cls = self.container_cls()
+        if self.key is None:
+            return cls
+        if issubclass(cls, sortedcontainers.SortedDict):
+            # SortedDict takes the key function as its first positional argument
+            return partial(cls, self.key)
+        return partial(cls, key=self.key)
+
+    def instance_reuse(self) -> Optional["ReuseInstances"]:
+        """Get how existing instances are reused, if they are. Frozen containers can't be
+        modified, so unless set otherwise, frozen instances are shared after validating their
+        values if there are type arguments."""
+        if self.reuse is not None or not issubclass(self.cls, _FrozenMixin):
+            return self.reuse
+        return ReuseInstances("all" if self.args else "none")
+
+    def from_values(self) -> Callable[[Any], Any]:
+        """Get a function that builds the container from validated values."""
+        if (
+            self.presorted is None
+            and self.max_items is None
+            and self.load_factor is None
+            and self.cls.__init__ not in _BULK_LOADABLE_INITS
+        ):
+            # Subclass with a custom __init__, so don't bypass it
+            return self.constructor()  # type: ignore[no-any-return]
+
+        def from_values(values: Any) -> Any:
+            return _from_values(self, values)
+
+        return from_values
+
+
+def _get_spec(schema: core_schema.CoreSchema) -> Optional[_ContainerSpec]:
+    """Get the container spec recorded in a schema's metadata, if any."""
+    spec: Optional[_ContainerSpec] = (schema.get("metadata") or {}).get(_SPEC_METADATA_KEY)
+    return spec
+
+
+# Maximum number of core schemas to cache. Set to 0 to disable caching.
+_SCHEMA_CACHE_MAXSIZE = 1024
+_schema_cache: "OrderedDict[Hashable, core_schema.CoreSchema]" = OrderedDict()
+
+
+def _build_core_schema(
+    spec: _ContainerSpec, handler: GetCoreSchemaHandler
+) -> core_schema.CoreSchema:
+    """Build the core schema for a container spec, reusing a cached copy if the same spec was
+    built before with the same config. Generating the item schemas dominates the time to build
+    a container's schema, and models often have many fields with the same container type.
+    """
+    cache_key = _schema_cache_key(spec, handler)
+    if cache_key is not None:
+        cached = _schema_cache.get(cache_key)
+        if cached is not None:
+            _schema_cache.move_to_end(cache_key)
+            # Pydantic may modify schemas in place, so always hand out a copy
+            return _copy_schema(cached)  # type: ignore[no-any-return]
+    schema: core_schema.CoreSchema = spec.annotation._core_schema_from_spec(spec, handler)
+    if spec.cache is not None:
+        schema = spec.cache._wrap_schema(spec, schema)
+    if spec.lazy is not None:
+        schema = spec.lazy._wrap_schema(spec, schema)
+    if cache_key is not None and _is_self_contained(schema):
+        _schema_cache[cache_key] = _copy_schema(schema)
+        if len(_schema_cache) > _SCHEMA_CACHE_MAXSIZE:
+            _schema_cache.popitem(last=False)
+    return schema
+
+
+def _schema_cache_key(spec: _ContainerSpec, handler: GetCoreSchemaHandler) -> Optional[Hashable]:
+    """Get the key for caching the core schema of a spec, or None if it can't be cached."""
+    if _SCHEMA_CACHE_MAXSIZE <= 0 or _has_forward_refs(spec.args):
+        return None
+    # The handler doesn't expose the config publicly, so only cache if it can be found
+    config_wrapper = getattr(getattr(handler, "_generate_schema", None), "_config_wrapper", None)
+    config = getattr(config_wrapper, "config_dict", None)
+    if config is None:
+        return None
+    cache_key = (spec, tuple(config.items()))
+    try:
+        hash(cache_key)
+    except TypeError:
+        # Unhashable type arguments or config values
+        return None
+    return cache_key
+
+
+def _has_forward_refs(args: Tuple[Any, ...]) -> bool:
+    """Check whether type arguments contain forward references, whose resolution depends on the
+    namespace of the model being built."""
+    return any(
+        isinstance(arg, (str, ForwardRef)) or _has_forward_refs(get_args(arg)) for arg in args
+    )
+
+
+def _is_self_contained(schema: Any) -> bool:
+    """Check that a schema doesn't refer to or define schemas by reference, which only exist in
+    the context of the model being built."""
+    if isinstance(schema, dict):
+        if "ref" in schema or schema.get("type") in ("definition-ref", "definitions"):
+            return False
+        return all(map(_is_self_contained, schema.values()))
+    if isinstance(schema, list):
+        return all(map(_is_self_contained, schema))
+    return True
+
+
+def _copy_schema(schema: Any) -> Any:
+    """Copy the dicts and lists that make up a schema. Other objects, like functions, are
+    shared."""
+    if isinstance(schema, dict):
+        return {key: _copy_schema(value) for key, value in schema.items()}
+    if isinstance(schema, list):
+        return [_copy_schema(value) for value in schema]
+    return schema
+
+
+def _bulk_load(
+    sorted_list: Any,
+    values: List[Any],
+    presorted: Optional["Presorted"],
+    load_factor: Optional["LoadFactor"] = None,
+) -> None:
+    """Load values into an empty SortedList, sorting them in place and directly building its
+    internal sublists like SortedList.update does, but without copying the values into a new
+    sorted list. The values must be a new list that can be modified.
+
+    If the values are expected to be presorted, checks their order in a single pass. If a value
+    is out of order, either raises a ValueError if strict or otherwise falls back to sorting.
+    If a load factor is given, the list's load factor is set from it before loading.
+    """
+    if load_factor is not None:
+        sorted_list._load = load_factor._resolve(len(values))
+    key = sorted_list.key
+    if presorted is None or (key is None and not presorted.strict):
+        # Sorting in place only takes a single O(n) pass if the values are already sorted
+        values.sort(key=key)
+        keys = values if key is None else list(map(key, values))
+    else:
+        keys = values if key is None else list(map(key, values))
+        if any(map(operator.gt, keys, islice(keys, 1, None))):
+            if presorted.strict:
+                index = next(i for i in range(1, len(keys)) if keys[i - 1] > keys[i])
+                raise ValueError(
+                    f"Input should be sorted, but value at index {index} ({values[index]!r}) "
+                    "is out of order."
+                )
+            values.sort(key=key)
+            keys = list(map(key, values))
+
+    _load = sorted_list._load
+    _lists = sorted_list._lists
+    _lists.extend(values[pos : pos + _load] for pos in range(0, len(values), _load))
+    if key is None:
+        sorted_list._maxes.extend(sublist[-1] for sublist in _lists)
+    else:
+        _keys = sorted_list._keys
+        _keys.extend(keys[pos : pos + _load] for pos in range(0, len(keys), _load))
+        sorted_list._maxes.extend(sublist[-1] for sublist in _keys)
+    sorted_list._len = len(values)
+
+
+def _from_values(spec: _ContainerSpec, values: Any) -> Any:
+    """Build the container from validated values in one call, bulk-loading them into the
+    container's internal structure. Validated lists, sets, and dicts are new objects, so lists
+    are sorted in place rather than copied. If max_items is set, only the kept values are
+    selected with a heap and loaded.
+    """
+    container: Any = spec.constructor()()
+    max_items = spec.max_items
+    if issubclass(spec.cls, sortedcontainers.SortedDict):
+        items = values if isinstance(values, dict) else dict(values)
+        if max_items is not None and len(items) > max_items.k:
+            items = {k: items[k] for k in max_items._select(items, spec.key)}
+        dict.update(container, items)
+        _bulk_load(container._list, list(items), spec.presorted, spec.load_factor)
+    elif issubclass(spec.cls, sortedcontainers.SortedSet):
+        if max_items is None and (isinstance(values, set) or spec.presorted is None):
+            # Adopt the validated set, or a set of the values if they don't need to keep their
+            # order, as the container's set instead of hashing every value again
+            container._set = values if isinstance(values, set) else set(values)
+            _bind_sorted_set_set(container)
+            values = list(container._set)
+        else:
+            values = values if isinstance(values, list) else list(values)
+            if max_items is not None:
+                values = max_items._select(set(values), spec.key)
+            container._set.update(values)
+            if len(container._set) != len(values):
+                # Drop duplicates, keeping order
+                values = list(dict.fromkeys(values))
+        _bulk_load(container._list, values, spec.presorted, spec.load_factor)
+    else:
+        values = values if isinstance(values, list) else list(values)
+        if isinstance(container, SortedModelIndex):
+            container._check_values(values)
+        if max_items is not None:
+            values = max_items._select(values, spec.key)
+        _bulk_load(container, values, spec.presorted, spec.load_factor)
+        if isinstance(container, SortedModelIndex):
+            container._load_indexes(spec.load_factor)
+    return container
+
+
+def _bind_sorted_set_set(sorted_set: Any) -> None:
+    """Rebind the methods that a SortedSet exposes from its internal set, after replacing the
+    set."""
+    _set = sorted_set._set
+    sorted_set.isdisjoint = _set.isdisjoint
+    sorted_set.issubset = _set.issubset
+    sorted_set.issuperset = _set.issuperset
+
+
+def _sorted_list_state(sorted_list: Any) -> Tuple[Any, ...]:
+    """Get the state of a SortedList for pickling, which is its internal sublists of values and
+    their keys if it has a key function, and its load factor."""
+    keys = None if sorted_list.key is None else sorted_list._keys
+    return (sorted_list._lists, keys, sorted_list._load)
+
+
+def _restore_sorted_list_state(sorted_list: Any, state: Tuple[Any, ...]) -> None:
+    """Restore the state of an empty SortedList from _sorted_list_state without sorting."""
+    lists, keys, load = state
+    sorted_list._load = load
+    sorted_list._lists = lists
+    if keys is None:
+        sorted_list._maxes = [sublist[-1] for sublist in lists]
+    else:
+        sorted_list._keys = keys
+        sorted_list._maxes = [sublist[-1] for sublist in keys]
+    sorted_list._len = sum(map(len, lists))
+
+
+def _restore_sorted_list(cls: Any, key: Any, state: Tuple[Any, ...]) -> Any:
+    """Create a SortedList or SortedKeyList from its pickled state."""
+    sorted_list = cls() if key is None else cls(None, key)
+    _restore_sorted_list_state(sorted_list, state)
+    return sorted_list
+
+
+def _restore_sorted_set(cls: Any, key: Any, state: Tuple[Any, ...]) -> Any:
+    """Create a SortedSet from its pickled state."""
+    sorted_set = cls(None, key)
+    _restore_sorted_list_state(sorted_set._list, state)
+    sorted_set._set.update(sorted_set._list)
+    return sorted_set
+
+
+def _restore_sorted_dict(cls: Any, key: Any, state: Tuple[Any, ...], values: Any) -> Any:
+    """Create a SortedDict from its pickled state, which is the state of its sorted list of keys
+    and its values in sorted order of the keys."""
+    sorted_dict = cls(key)
+    _restore_sorted_list_state(sorted_dict._list, state)
+    dict.update(sorted_dict, zip(sorted_dict._list, values))
+    return sorted_dict
+
+
+def _copy_container(container: Any) -> Any:
+    """Copy a sorted container in O(n / load) time for its sorted list, without sorting its values
+    again like the copy method of sortedcontainers' classes does. The copy shares its internal
+    sublists with the original, which both copy a sublist before modifying it. The set of a
+    SortedSet and the dict of a SortedDict are copied."""
+    cls = type(container)
+    if issubclass(cls, _FrozenMixin):
+        # Frozen containers can be shared instead
+        return container
+    if issubclass(cls, sortedcontainers.SortedDict):
+        copied = cls(container.key)
+        # Update from the items, since updating from a dict subclass that overrides __iter__
+        # looks up every key
+        dict.update(copied, dict.items(container))
+        _share_sorted_list(container._list, copied._list)
+        _bind_sorted_dict_list(container)
+        _bind_sorted_dict_list(copied)
+    elif issubclass(cls, sortedcontainers.SortedSet):
+        copied = cls(None, container.key)
+        copied._set.update(container._set)
+        _share_sorted_list(container._list, copied._list)
+    else:
+        copied = cls() if container.key is None else cls(None, container.key)
+        _share_sorted_list(container, copied)
+        if issubclass(cls, SortedModelIndex):
+            copied._indexes = {
+                name: _copy_container(index) for name, index in container._indexes.items()
+            }
+    return copied
+
+
+def _share_sorted_list(source: Any, target: Any) -> None:
+    """Share the internal sublists of a SortedList with an empty SortedList, making both copy a
+    sublist before modifying it."""
+    target._load = source._load
+    target._lists = source._lists.copy()
+    target._maxes = source._maxes.copy()
+    if source.key is not None:
+        target._keys = source._keys.copy()
+    target._len = source._len
+    for sorted_list in (source, target):
+        if "_cow_base" not in type(sorted_list).__dict__:
+            sorted_list.__class__ = _copy_on_write_class(sorted_list.__class__)
+        sorted_list._cow_shared = set(map(id, sorted_list._lists))
+
+
+def _bind_sorted_dict_list(sorted_dict: Any) -> None:
+    """Bind the methods of a SortedDict's sorted list of keys that it keeps references to again,
+    after the list's class has changed."""
+    _list = sorted_dict._list
+    sorted_dict._list_add = _list.add
+    sorted_dict._list_clear = _list.clear
+    sorted_dict._list_pop = _list.pop
+    sorted_dict._list_remove = _list.remove
+    sorted_dict._list_update = _list.update
+    sorted_dict._reset = _list._reset
+
+
+@lru_cache(maxsize=None)
+def _copy_on_write_class(cls: Any) -> Any:
+    """Get a subclass of a SortedList class for instances that share some internal sublists
+    with copies, which copies a sublist before any method modifies it. Instances are switched to
+    this class when copied, so containers that are never copied don't pay for the checks. The
+    subclass has the same name so that it looks the same in reprs, and it derives from the class
+    directly so that instances have the same layout, which switching classes requires."""
+
+    class CopyOnWrite(cls):  # type: ignore[misc]
+        _cow_base = cls
+        _cow_shared: Set[int] = frozenset()  # type: ignore[assignment]  # IDs of shared sublists
+
+        def _unshare(self, pos: int) -> None:
+            shared = self._cow_shared
+            sublist = self._lists[pos]
+            if id(sublist) in shared:
+                shared.discard(id(sublist))
+                self._lists[pos] = sublist.copy()
+                if self.key is not None:
+                    self._keys[pos] = self._keys[pos].copy()
+
+        def add(self, value: Any) -> None:
+            if self._cow_shared and self._maxes:
+                key = self.key
+                pos = bisect_right(self._maxes, value if key is None else key(value))
+                self._unshare(min(pos, len(self._maxes) - 1))
+            super().add(value)
+
+        def _delete(self, pos: int, idx: int) -> None:
+            if self._cow_shared:
+                self._unshare(pos)
+                if pos and len(self._lists[pos]) <= (self._load >> 1) + 1:
+                    # The sublist will be merged into the previous one
+                    self._unshare(pos - 1)
+            super()._delete(pos, idx)
+
+        def clear(self) -> None:
+            super().clear()
+            self._cow_shared = set()
+
+        _clear = clear
+
+        def __reduce_ex__(self, protocol: Any) -> Any:
+            # Pickle as the original class, which is also how the state is recreated
+            reducer, args = super().__reduce_ex__(protocol)[:2]
+            if reducer is type(self):
+                reducer = cls
+            elif args and args[0] is type(self):
+                args = (cls, *args[1:])
+            return (reducer, args)
+
+    CopyOnWrite.__name__ = cls.__name__
+    CopyOnWrite.__qualname__ = cls.__qualname__
+    CopyOnWrite.__module__ = cls.__module__
+    return CopyOnWrite
+
+
+# Types that deepcopy returns as-is, so values of these types can be shared by deep copies
+_ATOMIC_TYPES = frozenset({type(None), bool, int, float, complex, str, bytes})
+
+
+def _all_atomic(values: Iterable[Any]) -> bool:
+    return set(map(type, values)) <= _ATOMIC_TYPES
+
+
+def _deepcopy_container(container: Any, memo: Dict[int, Any]) -> Any:
+    """Deep copy a sorted container. If its values (and, for SortedDict, keys) are all of types
+    that are never copied, like int and str, its sublists are shared with the copy instead of
+    copied, like with _copy_container."""
+    cls = type(container)
+    if issubclass(cls, sortedcontainers.SortedDict):
+        if not all(map(_all_atomic, container._list._lists)):
+            return _deepcopy_by_reducing(container, memo)
+        result = memo[id(container)] = _copy_container(container)
+        values = list(dict.values(container))
+        if not _all_atomic(values):
+            dict.update(result, zip(list(dict.keys(container)), copy.deepcopy(values, memo)))
+        return result
+    sorted_list = container._list if issubclass(cls, sortedcontainers.SortedSet) else container
+    if not all(map(_all_atomic, sorted_list._lists)):
+        return _deepcopy_by_reducing(container, memo)
+    result = memo[id(container)] = _copy_container(container)
+    return result
+
+
+def _deepcopy_by_reducing(container: Any, memo: Dict[int, Any]) -> Any:
+    """Deep copy a sorted container the default way, by deep copying its pickled state."""
+    reducer, args = container.__reduce_ex__(4)[:2]
+    result = memo[id(container)] = reducer(*copy.deepcopy(args, memo))
+    return result
+
+
+def _sorted_dict_to_dict(value: Any) -> Any:
+    """Convert a SortedDict to a dict with keys in sorted order for serialization."""
+    if not issubclass(type(value), sortedcontainers.SortedDict):
+        return dict(value)
+    keys = value._list
+    # A SortedDict is a dict, so if its insertion order is already the sorted order, like after
+    # validation, it can be serialized directly without copying
+    if all(map(operator.is_, dict.__iter__(value), keys)):
+        return value
+    return dict(zip(keys, map(value.__getitem__, keys)))
+
+
+_branch_counts: "Counter[Tuple[str, str]]" = Counter()
+_branch_counts_lock = threading.Lock()
+_count_branches = False
+
+
+def count_validation_branches(enabled: bool = True) -> None:
+    """Turn counting of the Python validation branches taken on or off. Counting is off by
+    default, so that validation doesn't pay for it."""
+    global _count_branches
+    _count_branches = enabled
+
+
+def get_validation_branch_counts() -> Dict[Tuple[str, str], int]:
+    """Return how many times each Python validation branch has been taken while counting was
+    turned on with count_validation_branches, keyed by (container class name, branch name).
+    Branches are "instance", "mapping", "sequence", "set", and "iterable"."""
+    with _branch_counts_lock:
+        return dict(_branch_counts)
+
+
+def reset_validation_branch_counts() -> None:
+    """Reset the counts returned by get_validation_branch_counts."""
+    with _branch_counts_lock:
+        _branch_counts.clear()
+
+
+def _count_branch(name: str, branch: str) -> None:
+    with _branch_counts_lock:
+        _branch_counts[name, branch] += 1
+
+
+def _dispatch_schema(
+    spec: _ContainerSpec, choices: Dict[str, core_schema.CoreSchema]
+) -> core_schema.CoreSchema:
+    """Build a schema that picks exactly one of the choices up front from the type of the input,
+    instead of trying each branch of a union in turn. Inputs without a matching choice fall back
+    to the "iterable" choice."""
+    cls = spec.container_cls()
+    check_instance = "instance" in choices
+    # Reused instances must also have been sorted with the same key
+    reuse = spec.instance_reuse()
+    check_key = reuse is not None
+    key = spec.key
+    check_mapping = "mapping" in choices
+    check_set = "set" in choices
+    check_sequence = "sequence" in choices
+    name = spec.cls.__name__
+
+    def input_branch(value: Any) -> str:
+        if check_instance and isinstance(value, cls) and (not check_key or value.key is key):
+            branch = "instance"
+        elif check_sequence and isinstance(value, (list, tuple)):
+            branch = "sequence"
+        elif check_set and isinstance(value, (set, frozenset)):
+            branch = "set"
+        elif check_mapping and isinstance(value, Mapping):
+            branch = "mapping"
+        else:
+            branch = "iterable"
+        if _count_branches:
+            _count_branch(name, branch)
+        return branch
+
+    return _untagged_union_schema(choices, input_branch)
+
+
+def _untagged_union_schema(
+    choices: Dict[str, core_schema.CoreSchema], discriminator: Callable[[Any], str]
+) -> core_schema.CoreSchema:
+    """Build a tagged union schema that reports errors at the same locations as the chosen
+    schema would by itself, without the tag that the union adds to the front of them."""
+    from pydantic_core import ValidationError, core_schema
+
+    def validate(value: Any, handler: core_schema.ValidatorFunctionWrapHandler) -> Any:
+        try:
+            return handler(value)
+        except ValidationError as e:
+            raise _relocate_errors(e, lambda loc: loc[1:]) from None
+
+    return core_schema.no_info_wrap_validator_function(
+        validate, core_schema.tagged_union_schema(choices, discriminator=discriminator)
+    )
+
+
+def _converting_schema(tp: type, schema: core_schema.CoreSchema) -> core_schema.CoreSchema:
+    """Build a schema that converts input that isn't an instance of tp, e.g., a tuple for list, to
+    tp before validating it with the schema, so that the input is accepted in strict mode too."""
+    from pydantic_core import core_schema
+
+    def convert(value: Any) -> Any:
+        return value if isinstance(value, tp) else tp(value)
+
+    return core_schema.no_info_before_validator_function(convert, schema)
+
+
+class _InvalidInput:
+    """Result of validating invalid input in _first_valid_schema, with the error to raise."""
+
+    def __init__(self, error: Any):
+        self.error = error
+
+
+def _first_valid_schema(
+    choices: Dict[str, core_schema.CoreSchema], discriminator: Callable[[Any], str]
+) -> core_schema.CoreSchema:
+    """Build a schema that tries the choices in order like a left to right union, but reports
+    only the errors of the choice picked by the discriminator, at the same locations as that
+    schema would by itself, instead of the errors of every choice under the union's labels.
+
+    Valid input is validated natively by the union, so JSON input is still validated as JSON.
+    Only if every choice fails is the input validated again with the picked choice, which gets
+    JSON input as parsed Python objects, to get its errors.
+    """
+    from pydantic_core import ValidationError, core_schema
+
+    def validate_picked(value: Any, handler: core_schema.ValidatorFunctionWrapHandler) -> Any:
+        try:
+            return handler(value)
+        except ValidationError as e:
+            # Raising here would add the errors of every choice, so raise them after the union
+            return _InvalidInput(e)
+
+    def raise_invalid(value: Any) -> Any:
+        if isinstance(value, _InvalidInput):
+            raise value.error
+        return value
+
+    union_schema = core_schema.union_schema(list(choices.values()), mode="left_to_right")
+    picked_schema = core_schema.no_info_wrap_validator_function(
+        validate_picked, _untagged_union_schema(choices, discriminator)
+    )
+    return core_schema.no_info_after_validator_function(
+        raise_invalid,
+        core_schema.union_schema([union_schema, picked_schema], mode="left_to_right"),
+    )
+
+
+def _json_type(value: Any) -> str:
+    """Discriminator for JSON input that's either an array or an object."""
+    return "mapping" if isinstance(value, dict) else "sequence"
+
+
+def _columnar_or_mapping(value: Any) -> str:
+    """Discriminator for mappings that are either in the columnar format or regular."""
+    if isinstance(value, Mapping) and "keys" in value and "values" in value:
+        return "columnar"
+    return "mapping"
+
+
+@lru_cache(maxsize=None)
+def _known_error_types() -> Set[str]:
+    from pydantic_core import core_schema
+
+    return set(get_args(core_schema.ErrorType))
+
+
+def _relocate_errors(
+    error: Any,
+    relocate: Callable[[Tuple[Union[int, str], ...]], Tuple[Union[int, str], ...]],
+    title: Optional[str] = None,
+) -> Any:
+    """Create a ValidationError with the errors of another one at new locations, keeping the type,
+    message, and context of each error. The title is the other one's unless given."""
+    from pydantic_core import PydanticCustomError, ValidationError
+
+    known_error_types = _known_error_types()
+    errors: List[Any] = []
+    for details in error.errors(include_url=False):
+        error_type = details["type"]
+        ctx = details.get("ctx")
+        relocated = {"loc": relocate(details["loc"]), "input": details["input"]}
+        if error_type not in known_error_types:
+            # Custom errors can't be created again from their type alone
+            relocated["type"] = PydanticCustomError(error_type, details["msg"], ctx)
+        else:
+            relocated["type"] = error_type
+            if ctx is not None:
+                relocated["ctx"] = ctx
+        errors.append(relocated)
+    return ValidationError.from_exception_data(error.title if title is None else title, errors)
+
+
 class SortedDictPydanticAnnotation:
     @classmethod
     def __get_pydantic_core_schema__(
@@ -95,12 +807,14 @@ class SortedDictPydanticAnnotation:
         Returns pydantic_core.CoreSchema that defines how Pydantic should validate and
         serialize this class.
 
-        - Validating from JSON: Validate as an iterable and pass to SortedList
-          constructor
-        - Validating from Python:
-            - If it's already a SortedList, do nothing
-            - If it's an iterable, pass to SortedList constructor
-        - Serialization: Convert to a list
+        - Validating from JSON: Validate as a mapping and pass to SortedDict constructor
+        - Validating from Python, picking one branch up front from the input's type:
+            - If it's already a SortedDict, do nothing
+            - If it's a mapping, validate as a mapping and pass to SortedDict constructor
+            - If it's a list or tuple, validate as a list of pairs and pass to SortedDict
+              constructor
+            - If it's any other iterable, validate as pairs and pass to SortedDict constructor
+        - Serialization: Convert to a dict
         """
         if cls is SortedDictPydanticAnnotation:
             # Used as annotation, i.e., Annotated[..., SortedDictPydanticAnnotation]
@@ -113,51 +827,116 @@ class SortedDictPydanticAnnotation:
                 )
                 raise UnsupportedSourceTypeError(msg) from e
 
+        spec = _ContainerSpec(
+            annotation=SortedDictPydanticAnnotation, cls=cls, args=get_args(source_type)
+        )
+        return _build_core_schema(spec, handler)
+
+    @staticmethod
+    def _core_schema_from_spec(
+        spec: _ContainerSpec, handler: GetCoreSchemaHandler
+    ) -> core_schema.CoreSchema:
+        from pydantic_core import core_schema
+
+        constructor = spec.from_values()
+        args = spec.args
+
         # Schema for when the input is already an instance of this class
-        instance_schema = core_schema.is_instance_schema(cls)
+        instance_schema = core_schema.is_instance_schema(spec.cls)
 
         # Get schema for Iterable type based on source type has arguments
-        args = get_args(source_type)
         if args:
+            key_schema = handler.generate_schema(args[0])
+            value_schema = handler.generate_schema(args[1])
             mapping_t_schema = handler.generate_schema(Mapping[args[0], args[1]])  # type: ignore[valid-type]
             iterable_of_pairs_t_schema = handler.generate_schema(Iterable[Tuple[args[0], args[1]]])  # type: ignore[valid-type]
         else:
+            key_schema = core_schema.any_schema()
+            value_schema = core_schema.any_schema()
             mapping_t_schema = handler.generate_schema(Mapping)
             iterable_of_pairs_t_schema = handler.generate_schema(Iterable[Tuple[Any, Any]])
 
         # Schema for when the input is a mapping
-        from_mapping_schema = core_schema.no_info_after_validator_function(
-            function=cls, schema=mapping_t_schema
+        from_mapping_schema: core_schema.CoreSchema = core_schema.no_info_after_validator_function(
+            function=constructor, schema=mapping_t_schema
+        )
+
+        # Schema for when the input is a list or tuple of pairs, validated natively as a list
+        from_sequence_of_pairs_schema = core_schema.no_info_after_validator_function(
+            function=constructor,
+            schema=_converting_schema(
+                list, core_schema.list_schema(core_schema.tuple_schema([key_schema, value_schema]))
+            ),
         )
 
         # Schema for when the input is an iterable of pairs
         from_iterable_of_pairs_schema = core_schema.no_info_after_validator_function(
-            function=cls, schema=iterable_of_pairs_t_schema
+            function=constructor, schema=iterable_of_pairs_t_schema
         )
 
-        # Union the schemas
-        # Only include instance_schema if there are no type arguments
-        # Otherwise an existing instance with wrong argument types won't be coerced
-        if args:
-            python_schema = core_schema.union_schema(
-                [from_mapping_schema, from_iterable_of_pairs_schema]
+        # Dispatch on the input's type
+        # Unless reusing instances is opted into or the class is frozen, only include
+        # instance_schema if there are no type arguments or key. Otherwise an existing instance
+        # with wrong argument types won't be coerced, and an existing instance sorted without the
+        # key won't be re-sorted
+        json_schema: core_schema.CoreSchema = from_mapping_schema
+        if spec.columnar is not None:
+            # Also accept the columnar format, which is tried before a regular mapping
+            from_columnar_schema = spec.columnar._validation_schema(spec, key_schema, value_schema)
+            json_schema = from_mapping_schema = _first_valid_schema(
+                {"columnar": from_columnar_schema, "mapping": from_mapping_schema},
+                _columnar_or_mapping,
             )
-        else:
-            python_schema = core_schema.union_schema(
-                [instance_schema, from_mapping_schema, from_iterable_of_pairs_schema]
+
+        choices: Dict[str, core_schema.CoreSchema] = {
+            "mapping": from_mapping_schema,
+            "sequence": from_sequence_of_pairs_schema,
+            "iterable": from_iterable_of_pairs_schema,
+        }
+        reuse = spec.instance_reuse()
+        if reuse is not None:
+            choices["instance"] = reuse._instance_schema(
+                spec, core_schema.list_schema(core_schema.tuple_schema([key_schema, value_schema]))
             )
+        elif not args and spec.key is None:
+            choices["instance"] = instance_schema
+        python_schema = _dispatch_schema(spec, choices)
 
-        as_dict_serializer = core_schema.plain_serializer_function_ser_schema(dict)
+        # Serializer that converts an instance to a dict, typed with the key and value schemas so
+        # that they don't have to be inferred
+        as_dict_serializer = core_schema.plain_serializer_function_ser_schema(
+            _sorted_dict_to_dict, return_schema=core_schema.dict_schema(key_schema, value_schema)
+        )
 
         return core_schema.json_or_python_schema(
-            json_schema=from_mapping_schema,
+            json_schema=json_schema,
             python_schema=python_schema,
-            serialization=as_dict_serializer,
+            serialization=(
+                as_dict_serializer
+                if spec.columnar is None
+                else spec.columnar._serialization_schema(key_schema, value_schema)
+            ),
+            metadata={_SPEC_METADATA_KEY: spec},
         )
 
 
 class SortedDict(sortedcontainers.SortedDict[_KT, _VT], SortedDictPydanticAnnotation):
-    pass
+    def __reduce_ex__(self, protocol: Any) -> Any:
+        # Pickle the sorted keys and values in order so that unpickling doesn't sort again
+        state = _sorted_list_state(self._list)  # type: ignore[attr-defined]
+        values = list(map(self.__getitem__, self._list))  # type: ignore[attr-defined]
+        return (_restore_sorted_dict, (type(self), self.key, state, values))
+
+    def copy(self) -> Any:
+        """Return a shallow copy of the sorted dict. The copy shares the internal sorted
+        sublists with the original until either modifies them, so it takes O(n / load) time for
+        the sorted list instead of O(n log n)."""
+        return _copy_container(self)
+
+    __copy__ = copy
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> Any:
+        return _deepcopy_container(self, memo)
 
 
 AnnotatedSortedDict = Annotated[
@@ -174,11 +953,11 @@ class SortedListPydanticAnnotation:
         Returns pydantic_core.CoreSchema that defines how Pydantic should validate and
         serialize this class.
 
-        - Validating from JSON: Validate as an iterable and pass to SortedList
-          constructor
-        - Validating from Python:
+        - Validating from JSON: Validate as a list and bulk-load into SortedList
+        - Validating from Python, picking one branch up front from the input's type:
             - If it's already a SortedList, do nothing
-            - If it's an iterable, pass to SortedList constructor
+            - If it's a list or tuple, validate as a list and bulk-load into SortedList
+            - If it's any other iterable, pass to SortedList constructor
         - Serialization: Convert to a list
         """
         if cls is SortedListPydanticAnnotation:
@@ -192,46 +971,113 @@ class SortedListPydanticAnnotation:
                 )
                 raise UnsupportedSourceTypeError(msg) from e
 
+        spec = _ContainerSpec(
+            annotation=SortedListPydanticAnnotation, cls=cls, args=get_args(source_type)
+        )
+        return _build_core_schema(spec, handler)
+
+    @staticmethod
+    def _core_schema_from_spec(
+        spec: _ContainerSpec, handler: GetCoreSchemaHandler
+    ) -> core_schema.CoreSchema:
+        from pydantic_core import core_schema
+
+        constructor = spec.from_values()
+        args = spec.args
+
         # Schema for when the input is already an instance of this class
-        instance_schema = core_schema.is_instance_schema(cls)
+        instance_schema = core_schema.is_instance_schema(spec.cls)
 
         # Get schema for Iterable type based on source type has arguments
-        args = get_args(source_type)
         if args:
+            item_schema = handler.generate_schema(args[0])
             iterable_t_schema = handler.generate_schema(Iterable[args[0]])  # type: ignore[valid-type]
         else:
+            item_schema = core_schema.any_schema()
             iterable_t_schema = handler.generate_schema(Iterable)
 
         # Schema for when the input is an iterable
         from_iterable_schema = core_schema.no_info_after_validator_function(
-            function=cls, schema=iterable_t_schema
+            function=constructor, schema=iterable_t_schema
         )
 
-        # Union of the two schemas
-        # Only include instance_schema if there are no type arguments
-        # Otherwise an existing instance with wrong argument types won't be coerced
-        python_schema: core_schema.CoreSchema
-        if args:
-            python_schema = from_iterable_schema
-        else:
-            python_schema = core_schema.union_schema([instance_schema, from_iterable_schema])
+        # Schema for when the input is a JSON array, validated natively as a list instead of
+        # lazily as an iterable
+        from_json_array_schema = core_schema.no_info_after_validator_function(
+            function=constructor, schema=core_schema.list_schema(item_schema)
+        )
+
+        # Schema for when the input is a list or tuple
+        from_sequence_schema = core_schema.no_info_after_validator_function(
+            function=constructor,
+            schema=_converting_schema(list, core_schema.list_schema(item_schema)),
+        )
 
-        # Serializer that converts an instance to a list
-        as_list_serializer = core_schema.plain_serializer_function_ser_schema(list)
+        # Dispatch on the input's type
+        # Unless reusing instances is opted into or the class is frozen, only include
+        # instance_schema if there are no type arguments or key. Otherwise an existing instance
+        # with wrong argument types won't be coerced, and an existing instance sorted without the
+        # key won't be re-sorted
+        choices: Dict[str, core_schema.CoreSchema] = {
+            "sequence": from_sequence_schema,
+            "iterable": from_iterable_schema,
+        }
+        json_schema: core_schema.CoreSchema = from_json_array_schema
+        if spec.binary is not None:
+            # Also accept the binary format, as a mapping in Python or a JSON object
+            from_binary_schema = spec.binary._validation_schema(spec)
+            choices["mapping"] = from_binary_schema
+            json_schema = _first_valid_schema(
+                {"sequence": json_schema, "mapping": from_binary_schema}, _json_type
+            )
+        reuse = spec.instance_reuse()
+        if reuse is not None:
+            choices["instance"] = reuse._instance_schema(
+                spec, core_schema.list_schema(item_schema)
+            )
+        elif not args and spec.key is None:
+            choices["instance"] = instance_schema
+        python_schema = _dispatch_schema(spec, choices)
+
+        # Serializer that converts an instance to a list, typed with the item schema so that items
+        # don't have to be inferred
+        as_list_serializer = core_schema.plain_serializer_function_ser_schema(
+            list, return_schema=core_schema.list_schema(item_schema)
+        )
 
         return core_schema.json_or_python_schema(
-            json_schema=from_iterable_schema,
+            json_schema=json_schema,
             python_schema=python_schema,
-            serialization=as_list_serializer,
+            serialization=(
+                as_list_serializer if spec.binary is None else spec.binary._serialization_schema()
+            ),
+            metadata={_SPEC_METADATA_KEY: spec},
         )
 
 
 class SortedList(sortedcontainers.SortedList[_T], SortedListPydanticAnnotation):
-    pass
+    def __reduce_ex__(self, protocol: Any) -> Any:
+        # Pickle the values, and keys for SortedKeyList, in sorted order so that unpickling
+        # doesn't sort again
+        state = _sorted_list_state(self)
+        return (_restore_sorted_list, (type(self), self.key, state))
+
+    def copy(self) -> Any:
+        """Return a shallow copy of the sorted list. The copy shares the internal sorted
+        sublists with the original until either modifies them, so it takes O(n / load) time for
+        the sorted list instead of O(n log n)."""
+        return _copy_container(self)
+
+    __copy__ = copy
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> Any:
+        return _deepcopy_container(self, memo)
 
 
 class SortedKeyList(sortedcontainers.SortedKeyList[_T, _OrderableT], SortedList[_T]):
-    pass
+    # sortedcontainers.SortedKeyList's copy comes first in the MRO and sorts the values again
+    copy = SortedList.copy
+    __copy__ = SortedList.copy
 
 
 AnnotatedSortedList = Annotated[sortedcontainers.SortedList[_T], SortedListPydanticAnnotation]  # type: ignore[misc]
@@ -250,12 +1096,11 @@ class SortedSetPydanticAnnotation:
         Returns pydantic_core.CoreSchema that defines how Pydantic should validate and
         serialize this class.
 
-        - Validating from JSON: Validate as an iterable and pass to SortedSet
-          constructor
-        - Validating from Python:
+        - Validating from JSON: Validate as a set and adopt it as the SortedSet's set
+        - Validating from Python, picking one branch up front from the input's type:
             - If it's already a SortedSet, do nothing
-            - If it's a set, parse as a set and pass to SortedSet constructor
-            - If it's an iterable, pass to SortedSet constructor
+            - If it's a set, list, or tuple, parse as a set and adopt it as the SortedSet's set
+            - If it's any other iterable, collect it into a set and adopt it likewise
         - Serialization: Convert to a list
         """
         if cls is SortedSetPydanticAnnotation:
@@ -269,75 +1114,1397 @@ class SortedSetPydanticAnnotation:
                 )
                 raise UnsupportedSourceTypeError(msg) from e
 
+        spec = _ContainerSpec(
+            annotation=SortedSetPydanticAnnotation, cls=cls, args=get_args(source_type)
+        )
+        return _build_core_schema(spec, handler)
+
+    @staticmethod
+    def _core_schema_from_spec(
+        spec: _ContainerSpec, handler: GetCoreSchemaHandler
+    ) -> core_schema.CoreSchema:
+        from pydantic_core import core_schema
+
+        constructor = spec.from_values()
+        args = spec.args
+
         # Schema for when the input is already an instance of this class
-        instance_schema = core_schema.is_instance_schema(cls)
+        instance_schema = core_schema.is_instance_schema(spec.cls)
 
         # Get schema for Iterable type based on source type has arguments
-        args = get_args(source_type)
         if args:
+            item_schema = handler.generate_schema(args[0])
             set_t_schema = handler.generate_schema(Set[args[0]])  # type: ignore[valid-type]
             iterable_t_schema = handler.generate_schema(Iterable[args[0]])  # type: ignore[valid-type]
         else:
+            item_schema = core_schema.any_schema()
             set_t_schema = handler.generate_schema(Set)
             iterable_t_schema = handler.generate_schema(Iterable)
 
-        # Schema for when the input is a set
-        from_set_schema = core_schema.no_info_after_validator_function(
-            function=cls, schema=set_t_schema
-        )
-
         # Schema for when the input is an iterable
         from_iterable_schema = core_schema.no_info_after_validator_function(
-            function=cls, schema=iterable_t_schema
+            function=constructor, schema=iterable_t_schema
         )
 
-        # Union of the schemas
-        # Only include instance_schema if there are no type arguments
-        # Otherwise an existing instance with wrong argument types won't be coerced
-        if args:
-            python_schema = core_schema.union_schema([from_set_schema, from_iterable_schema])
+        # Schema for when the input is a set
+        # Sets don't keep the order of the input, so presorted input is validated as an iterable,
+        # or as a list for lists, tuples and JSON arrays
+        from_list_schema = core_schema.no_info_after_validator_function(
+            function=constructor,
+            schema=_converting_schema(list, core_schema.list_schema(item_schema)),
+        )
+        choices: Dict[str, core_schema.CoreSchema]
+        json_schema: core_schema.CoreSchema
+        if spec.presorted is None:
+            from_set_schema = core_schema.no_info_after_validator_function(
+                function=constructor, schema=_converting_schema(set, set_t_schema)
+            )
+            # Lists and tuples are validated as a list, since a set schema rejects them in strict
+            # mode, and the validated list is passed to the set constructor
+            choices = {
+                "set": from_set_schema,
+                "sequence": from_list_schema,
+                "iterable": from_iterable_schema,
+            }
+            json_schema = from_set_schema
         else:
-            python_schema = core_schema.union_schema(
-                [instance_schema, from_set_schema, from_iterable_schema]
+            choices = {"sequence": from_list_schema, "iterable": from_iterable_schema}
+            json_schema = from_list_schema
+        if spec.binary is not None:
+            # Also accept the binary format, as a mapping in Python or a JSON object
+            from_binary_schema = spec.binary._validation_schema(spec)
+            choices["mapping"] = from_binary_schema
+            # Arrays are validated as a list, since a set schema reports errors of parsed JSON
+            # arrays at indexes in set order rather than array order
+            json_schema = _first_valid_schema(
+                {"sequence": from_list_schema, "mapping": from_binary_schema}, _json_type
+            )
+
+        # Dispatch on the input's type
+        # Unless reusing instances is opted into or the class is frozen, only include
+        # instance_schema if there are no type arguments or key. Otherwise an existing instance
+        # with wrong argument types won't be coerced, and an existing instance sorted without the
+        # key won't be re-sorted
+        reuse = spec.instance_reuse()
+        if reuse is not None:
+            choices["instance"] = reuse._instance_schema(
+                spec, core_schema.list_schema(item_schema)
             )
+        elif not args and spec.key is None:
+            choices["instance"] = instance_schema
+        python_schema = _dispatch_schema(spec, choices)
 
-        # Serializer that converts an instance to a list
-        as_list_serializer = core_schema.plain_serializer_function_ser_schema(list)
+        # Serializer that converts an instance to a list, typed with the item schema so that items
+        # don't have to be inferred
+        as_list_serializer = core_schema.plain_serializer_function_ser_schema(
+            list, return_schema=core_schema.list_schema(item_schema)
+        )
 
         return core_schema.json_or_python_schema(
-            json_schema=from_set_schema,
+            json_schema=json_schema,
             python_schema=python_schema,
-            serialization=as_list_serializer,
+            serialization=(
+                as_list_serializer if spec.binary is None else spec.binary._serialization_schema()
+            ),
+            metadata={_SPEC_METADATA_KEY: spec},
         )
 
 
 class SortedSet(sortedcontainers.SortedSet[_HashableT], SortedSetPydanticAnnotation):
-    pass
+    def __reduce_ex__(self, protocol: Any) -> Any:
+        # Pickle the values in sorted order so that unpickling doesn't sort again
+        state = _sorted_list_state(self._list)  # type: ignore[attr-defined]
+        return (_restore_sorted_set, (type(self), self.key, state))
+
+    def copy(self) -> Any:
+        """Return a shallow copy of the sorted set. The copy shares the internal sorted
+        sublists with the original until either modifies them, so it takes O(n / load) time for
+        the sorted list instead of O(n log n)."""
+        return _copy_container(self)
+
+    __copy__ = copy
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> Any:
+        return _deepcopy_container(self, memo)
 
 
 AnnotatedSortedSet = Annotated[sortedcontainers.SortedSet[_HashableT], SortedSetPydanticAnnotation]
 
 
-@dataclass(frozen=True)
-class Key:
-    key: Callable[[Any], "SupportsRichComparison"]
+def _immutable(self: Any, *args: Any, **kwargs: Any) -> NoReturn:
+    raise TypeError(f"'{type(self).__name__}' object is immutable")
+
+
+class _FrozenMixin(ABC):
+    """Mixin for sorted containers that can't be modified after they're built, which makes them
+    hashable and safe to share between models and threads without copying. The hash is computed
+    on first use and cached, and comparing two frozen containers of the same class with cached
+    hashes that differ returns False without comparing their values."""
+
+    _cached_hash: Optional[int] = None
+    _mutable_cls: Any  # Mutable counterpart of the class
+
+    @abstractmethod
+    def _compute_hash(self) -> int: ...
+
+    def __hash__(self) -> int:
+        if self._cached_hash is None:
+            self._cached_hash = self._compute_hash()
+        return self._cached_hash
+
+    def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
+        if (
+            type(other) is type(self)
+            and self._cached_hash is not None
+            and other._cached_hash is not None
+            and self._cached_hash != other._cached_hash
+        ):
+            return False
+        return super().__eq__(other)
+
+    def __ne__(self, other: object) -> bool:
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    def copy(self) -> Any:
+        # Frozen containers can't change, so copies can be the same object, like for tuples
+        return self
+
+    __copy__ = copy
+
+
+class _FrozenListMixin(_FrozenMixin):
+    add = update = clear = discard = remove = pop = __setitem__ = __delitem__ = _immutable
+    _update = _clear = _reset = _immutable
+
+    def __init__(self, iterable: Any = None, *args: Any, **kwargs: Any) -> None:
+        # The constructor adds the values with _update, which is blocked, so add them with the
+        # update method of the mutable class instead
+        super().__init__(None, *args, **kwargs)  # type: ignore[call-arg]
+        if iterable is not None:
+            self._mutable_cls.update(self, iterable)
+
+    def _compute_hash(self) -> int:
+        return hash(tuple(self))  # type: ignore[arg-type]
+
+    # Augmented assignment returns a new container, like for tuples
+    def __iadd__(self, other: Any) -> Any:
+        return self + other
+
+    def __imul__(self, num: int) -> Any:
+        return self * num  # type: ignore[operator]
+
+
+class _FrozenSetMixin(_FrozenMixin):
+    add = update = clear = discard = remove = pop = __delitem__ = _immutable
+    difference_update = intersection_update = symmetric_difference_update = _immutable
+    _add = _discard = _update = _immutable
+
+    def __init__(self, iterable: Any = None, *args: Any, **kwargs: Any) -> None:
+        # The constructor adds the values with _update, which is blocked, so add them with the
+        # update method of the mutable class instead
+        super().__init__(None, *args, **kwargs)  # type: ignore[call-arg]
+        if iterable is not None:
+            self._mutable_cls.update(self, iterable)
+
+    def _compute_hash(self) -> int:
+        return hash(frozenset(self._set))  # type: ignore[attr-defined]
+
+    # Augmented assignment returns a new container, like for frozensets
+    def __ior__(self, other: Any) -> Any:
+        return self | other
+
+    def __isub__(self, other: Any) -> Any:
+        return self - other
+
+    def __iand__(self, other: Any) -> Any:
+        return self & other
+
+    def __ixor__(self, other: Any) -> Any:
+        return self ^ other
+
+
+class _FrozenSortedKeysView(sortedcontainers.SortedKeysView[Any]):
+    __slots__ = ()
+
+    def __delitem__(self, index: Any) -> NoReturn:
+        _immutable(self._mapping)  # type: ignore[attr-defined]
+
+
+class _FrozenSortedItemsView(sortedcontainers.SortedItemsView[Any, Any]):
+    __slots__ = ()
+
+    def __delitem__(self, index: Any) -> NoReturn:
+        _immutable(self._mapping)  # type: ignore[attr-defined]
+
+
+class _FrozenSortedValuesView(sortedcontainers.SortedValuesView[Any]):
+    __slots__ = ()
+
+    def __delitem__(self, index: Any) -> NoReturn:
+        _immutable(self._mapping)  # type: ignore[attr-defined]
+
+
+class _FrozenDictMixin(_FrozenMixin):
+    __setitem__ = __delitem__ = clear = pop = popitem = setdefault = update = _immutable
+
+    def _compute_hash(self) -> int:
+        return hash(frozenset(dict.items(self)))  # type: ignore[arg-type]
+
+    # Augmented assignment returns a new container, like for frozensets
+    def __ior__(self, other: Any) -> Any:
+        return self | other
+
+    # Views of sorted dicts can delete items by index, so return views that can't
+    def keys(self) -> Any:
+        return _FrozenSortedKeysView(self)  # type: ignore[arg-type]
+
+    def items(self) -> Any:
+        return _FrozenSortedItemsView(self)  # type: ignore[arg-type]
+
+    def values(self) -> Any:
+        return _FrozenSortedValuesView(self)  # type: ignore[arg-type]
+
+
+class FrozenSortedList(_FrozenListMixin, SortedList[_T]):
+    """Immutable and hashable SortedList, which raises TypeError on any method that would modify
+    it. Values must be hashable for the container to be hashed. Like SortedList, creating one
+    with a key function returns a FrozenSortedKeyList."""
+
+    _mutable_cls: Any = SortedList
+
+    def __new__(cls, iterable: Any = None, key: Any = None) -> Any:
+        if key is not None and cls is FrozenSortedList:
+            return object.__new__(FrozenSortedKeyList)
+        return super().__new__(cls, iterable, key)
+
+
+class FrozenSortedKeyList(FrozenSortedList[_T], SortedKeyList[_T, _OrderableT]):
+    """Immutable and hashable SortedKeyList."""
+
+    _mutable_cls: Any = SortedKeyList
+
+
+class FrozenSortedSet(_FrozenSetMixin, SortedSet[_HashableT]):
+    """Immutable and hashable SortedSet, which raises TypeError on any method that would modify
+    it. Its hash is equal to the hash of a frozenset of the same values."""
+
+    _mutable_cls: Any = SortedSet
+
+
+class FrozenSortedDict(_FrozenDictMixin, SortedDict[_KT, _VT]):
+    """Immutable and hashable SortedDict, which raises TypeError on any method that would modify
+    it. Values must be hashable for the container to be hashed."""
+
+    _mutable_cls: Any = SortedDict
+
+
+# The IndexBy whose schema is being built, so that SortedModelIndex can check that it's
+# annotated with one
+_index_by: "ContextVar[Optional[IndexBy]]" = ContextVar("_index_by", default=None)
+
+
+class SortedModelIndex(SortedKeyList[_ModelT, Any]):
+    """SortedKeyList of models sorted by a primary field, with secondary sorted indexes of the
+    same models by other fields that are kept in sync as models are added and removed. The key
+    must be an IndexBy, which names the fields. Each secondary index is a SortedKeyList keyed by
+    its field and then the primary field, so that models with equal values of the field are
+    still found by bisection when removed. As with any sorted container, indexed fields of
+    models in the index must not be modified. Indexed fields must not be None either, since None
+    can't be compared: validation fails for input with None in an indexed field, and adding such
+    a model raises TypeError.
+
+    irange_field iterates over the models in a range of values of any indexed field in
+    O(log n + k) time for k models.
+    """
+
+    def __init__(self, iterable: Optional[Iterable[_ModelT]] = None, key: Any = None):
+        if not isinstance(key, IndexBy):
+            raise TypeError(
+                f"SortedModelIndex requires an IndexBy key, got {key!r}. Annotate fields with "
+                "IndexBy, e.g., Annotated[SortedModelIndex[Model], IndexBy('field')]."
+            )
+        self._indexes: Dict[str, Any] = {
+            name: SortedKeyList(key=operator.attrgetter(name, key.primary))
+            for name in key.secondary
+        }
+        super().__init__(iterable, key)  # type: ignore[call-arg]
+
+    @classmethod
+    def __get_pydantic_core_schema__(
+        cls, source_type: Any, handler: GetCoreSchemaHandler
+    ) -> core_schema.CoreSchema:
+        # The fields to index are only known from IndexBy, which sets _index_by while it builds
+        # the schema of the annotated type
+        if _index_by.get() is None:
+            msg = (
+                "SortedModelIndex must be annotated with IndexBy, "
+                f"got annotation '{source_type}'. Use, e.g., "
+                "Annotated[SortedModelIndex[Model], IndexBy('field')]."
+            )
+            raise UnsupportedSourceTypeError(msg)
+        # Unset it for the schemas of the items, so that any nested SortedModelIndex needs its own
+        token = _index_by.set(None)
+        try:
+            return super().__get_pydantic_core_schema__(source_type, handler)
+        finally:
+            _index_by.reset(token)
+
+    def add(self, value: _ModelT) -> None:
+        super().add(value)
+        for index in self._indexes.values():
+            index.add(value)
+
+    def update(self, iterable: Iterable[_ModelT]) -> None:
+        # SortedKeyList.update adds values with add or clears the list with _clear, which would
+        # update the secondary indexes twice, so update them here instead
+        values = list(iterable)
+        if self._len and len(values) * 4 < self._len:  # type: ignore[attr-defined]
+            for value in values:
+                self.add(value)
+            return
+        values.extend(self)
+        self.clear()
+        _bulk_load(self, values, None)
+        self._load_indexes()
+
+    _update = update
+
+    def clear(self) -> None:
+        super().clear()
+        for index in self._indexes.values():
+            index.clear()
+
+    _clear = clear
+
+    def _delete(self, pos: int, idx: int) -> None:
+        value = self._lists[pos][idx]  # type: ignore[attr-defined]
+        super()._delete(pos, idx)  # type: ignore[misc]
+        for index in self._indexes.values():
+            index.remove(value)
+
+    def _check_values(self, values: List[_ModelT]) -> None:
+        """Check that none of the models to load has None in an indexed field."""
+        key = self._key  # type: ignore[attr-defined]
+        for name in (key.primary, *key.secondary):
+            field_values = list(map(operator.attrgetter(name), values))
+            if any(map(operator.is_, field_values, repeat(None))):
+                index = next(i for i, value in enumerate(field_values) if value is None)
+                raise ValueError(
+                    f"Input should not have None in indexed field {name!r}, got None at index "
+                    f"{index}."
+                )
+
+    def _load_indexes(self, load_factor: Optional["LoadFactor"] = None) -> None:
+        """Bulk-load the secondary indexes from the models in the primary index."""
+        values = list(self)
+        for index in self._indexes.values():
+            index.clear()
+            _bulk_load(index, values.copy(), None, load_factor)
+
+    def irange_field(
+        self,
+        field: str,
+        minimum: Any = None,
+        maximum: Any = None,
+        inclusive: Tuple[bool, bool] = (True, True),
+        reverse: bool = False,
+    ) -> Iterator[_ModelT]:
+        """Iterate over the models whose value of an indexed field is between minimum and
+        maximum, in order of that field, like irange_key. A bound of None is unbounded."""
+        primary = self._key.primary  # type: ignore[attr-defined]
+        if field == primary:
+            return self.irange_key(minimum, maximum, inclusive, reverse)
+        index = self._indexes.get(field)
+        if index is None:
+            fields = ", ".join(map(repr, (primary, *self._indexes)))
+            raise ValueError(f"{field!r} is not an indexed field, expected one of {fields}.")
+        # Keys of secondary indexes are (value, primary value) pairs. A 1-tuple of a value sorts
+        # before all pairs with that value, and a pair with _AFTER_ALL after all of them
+        min_key = max_key = None
+        if minimum is not None:
+            min_key = (minimum,) if inclusive[0] else (minimum, _AFTER_ALL)
+        if maximum is not None:
+            max_key = (maximum, _AFTER_ALL) if inclusive[1] else (maximum,)
+        return index.irange_key(min_key, max_key, reverse=reverse)  # type: ignore[no-any-return]
+
+    def __reduce_ex__(self, protocol: Any) -> Any:
+        # Pickle the state of the secondary indexes too, so that unpickling doesn't sort again
+        states = {name: _sorted_list_state(index) for name, index in self._indexes.items()}
+        return (
+            _restore_sorted_model_index,
+            (type(self), self.key, _sorted_list_state(self), states),
+        )
+
+
+class _AfterAll:
+    """Sentinel that compares greater than any other value."""
+
+    def __eq__(self, other: object) -> bool:
+        return other is self
+
+    def __lt__(self, other: object) -> bool:
+        return False
+
+    def __gt__(self, other: object) -> bool:
+        return other is not self
+
+    __hash__ = object.__hash__
+
+
+_AFTER_ALL = _AfterAll()
+
+# SortedModelIndex.__init__ only sets up the secondary indexes, which _from_values loads
+_BULK_LOADABLE_INITS.add(SortedModelIndex.__init__)  # type: ignore[arg-type]
+
+
+def _restore_sorted_model_index(
+    cls: Any, key: "IndexBy", state: Tuple[Any, ...], states: Dict[str, Tuple[Any, ...]]
+) -> Any:
+    """Create a SortedModelIndex from its pickled state and those of its secondary indexes."""
+    model_index = cls(None, key)
+    _restore_sorted_list_state(model_index, state)
+    for name, index_state in states.items():
+        _restore_sorted_list_state(model_index._indexes[name], index_state)
+    return model_index
+
+
+@dataclass(frozen=True)
+class Key:
+    key: Callable[[Any], "SupportsRichComparison"]
 
     def __get_pydantic_core_schema__(
         self, source_type: Any, handler: GetCoreSchemaHandler
     ) -> core_schema.CoreSchema:
+        from pydantic_core import core_schema
+
         try:
-            constructor = _get_constructor(source_type)
+            _get_constructor(source_type)
         except _UnsupportedSourceTypeError as e:
             msg = (
                 "Expected subclass of a sortedcontainers or sortedcontainers_pydantic class, "
                 f"got '{e.parsed}' parsed from annotation '{source_type}'."
             )
             raise UnsupportedSourceTypeError(msg) from e
-        # sortedcontainers.SortedList has magic behavior where the SortedList constructor returns
-        # SortedKeyList if given a key. We match that behavior for our SortedList.
-        if constructor is SortedList:
-            constructor = SortedKeyList
+        schema = handler(source_type)
+        spec = _get_spec(schema)
+        if spec is None:
+            # Not built by one of our annotation classes, so we can only wrap it
+            constructor = _keyed_class(_get_constructor(source_type))
+            if issubclass(constructor, sortedcontainers.SortedDict):
+                function = partial(constructor, self.key)
+            else:
+                function = partial(constructor, key=self.key)
+            return core_schema.no_info_after_validator_function(function=function, schema=schema)
+
+        # Rebuild the schema so that validated values are passed directly into the keyed
+        # container, rather than first being sorted into a container without the key
+        spec = replace(spec, cls=_keyed_class(spec.cls), key=self.key)
+        return _build_core_schema(spec, handler)
+
+
+def _keyed_class(cls: Any) -> Any:
+    """Get the class to construct with a key function. sortedcontainers.SortedList has magic
+    behavior where the SortedList constructor returns SortedKeyList if given a key. We match that
+    behavior for our SortedList."""
+    if cls is SortedList:
+        return SortedKeyList
+    if cls is FrozenSortedList:
+        return FrozenSortedKeyList
+    return cls
+
+
+@dataclass(frozen=True)
+class IndexBy:
+    """Annotation and key function for SortedModelIndex, which sorts models by the primary field
+    and keeps secondary sorted indexes of them by each of the secondary fields. Fields are
+    checked against the model's fields when the schema is built."""
+
+    primary: str
+    secondary: Tuple[str, ...] = ()
+
+    def __post_init__(self) -> None:
+        # Accept any iterable of field names, but store a tuple so that the key is hashable
+        object.__setattr__(self, "secondary", tuple(self.secondary))
+        fields = (self.primary, *self.secondary)
+        if len(set(fields)) != len(fields):
+            raise ValueError(f"Indexed fields must be distinct, got {fields}.")
+
+    def __call__(self, value: Any) -> Any:
+        return getattr(value, self.primary)
+
+    def __get_pydantic_core_schema__(
+        self, source_type: Any, handler: GetCoreSchemaHandler
+    ) -> core_schema.CoreSchema:
+        token = _index_by.set(self)
+        try:
+            spec = _get_spec(handler(source_type))
+        finally:
+            _index_by.reset(token)
+        if spec is None or not issubclass(spec.cls, SortedModelIndex):
+            msg = f"IndexBy must be used with SortedModelIndex, got annotation '{source_type}'."
+            raise UnsupportedSourceTypeError(msg)
+        self._check_fields(spec.args[0] if spec.args else None)
+        spec = replace(spec, key=self)
+        return _build_core_schema(spec, handler)
+
+    def _check_fields(self, model: Any) -> None:
+        """Check that the model has the indexed fields, if it's a Pydantic model."""
+        from pydantic import BaseModel
+
+        if not (isinstance(model, type) and issubclass(model, BaseModel)):
+            return
+        for name in (self.primary, *self.secondary):
+            if name not in model.model_fields and not hasattr(model, name):
+                raise ValueError(f"{model.__name__} has no field {name!r} to index.")
+
+
+@dataclass(frozen=True)
+class Presorted:
+    """Annotation for input that is expected to already be sorted, so that the container can be
+    bulk-loaded in a single O(n) pass instead of being sorted in O(n log n). If a value is found
+    to be out of order, the input is sorted as usual, or, if strict is True, validation fails.
+    For SortedDict, the order of the keys is checked.
+    """
+
+    strict: bool = False
+
+    def __get_pydantic_core_schema__(
+        self, source_type: Any, handler: GetCoreSchemaHandler
+    ) -> core_schema.CoreSchema:
+        spec = _get_spec(handler(source_type))
+        if spec is None:
+            msg = (
+                "Presorted must be used with a sortedcontainers_pydantic class or annotation, "
+                f"got annotation '{source_type}'."
+            )
+            raise UnsupportedSourceTypeError(msg)
+        spec = replace(spec, presorted=self)
+        return _build_core_schema(spec, handler)
+
+
+@dataclass(frozen=True)
+class ReuseInstances:
+    """Annotation for reusing existing instances of the container class as-is, instead of
+    rebuilding and re-sorting them from their values. Only instances sorted with the same key
+    are reused. How much of an instance's contents is validated is set by validate:
+
+    - "none": Trust the instance outright without validating any values
+    - "all": Validate every value, without re-sorting
+    - "sample": Validate a random sample of sample_size values, without re-sorting
+
+    If validation coerces any value into a different object, e.g., the string "1" into the
+    integer 1, all values are validated and the container is rebuilt from them.
+    """
+
+    validate: Literal["none", "all", "sample"] = "none"
+    sample_size: int = 100
+
+    def __get_pydantic_core_schema__(
+        self, source_type: Any, handler: GetCoreSchemaHandler
+    ) -> core_schema.CoreSchema:
+        spec = _get_spec(handler(source_type))
+        if spec is None:
+            msg = (
+                "ReuseInstances must be used with a sortedcontainers_pydantic class or "
+                f"annotation, got annotation '{source_type}'."
+            )
+            raise UnsupportedSourceTypeError(msg)
+        spec = replace(spec, reuse=self)
+        return _build_core_schema(spec, handler)
+
+    def _instance_schema(
+        self, spec: _ContainerSpec, items_schema: core_schema.CoreSchema
+    ) -> core_schema.CoreSchema:
+        """Build the schema for existing instances, given a schema that validates a list of the
+        instance's items, i.e., its values or, for SortedDict, its (key, value) pairs."""
+        import random
+
+        from pydantic_core import core_schema
+
+        if self.validate == "none":
+            return core_schema.any_schema()
+
+        is_dict = issubclass(spec.cls, sortedcontainers.SortedDict)
+        from_values = spec.from_values()
+        sample_size = self.sample_size if self.validate == "sample" else None
+
+        def validate_instance(
+            value: Any, handler: core_schema.ValidatorFunctionWrapHandler
+        ) -> Any:
+            if sample_size is not None and len(value) > sample_size:
+                indices = sorted(random.sample(range(len(value)), sample_size))
+                get_item = value.peekitem if is_dict else value.__getitem__
+                items = [get_item(index) for index in indices]
+                if _items_unchanged(handler(items), items, is_dict):
+                    return value
+            items = list(value.items()) if is_dict else list(value)
+            validated = handler(items)
+            if _items_unchanged(validated, items, is_dict):
+                return value
+            return from_values(validated)
+
+        return core_schema.no_info_wrap_validator_function(
+            function=validate_instance, schema=items_schema
+        )
+
+
+def _items_unchanged(validated: List[Any], items: List[Any], pairs: bool) -> bool:
+    """Check whether validation returned the same objects as the original items."""
+    if pairs:
+        return all(
+            validated_key is key and validated_value is value
+            for (validated_key, validated_value), (key, value) in zip(validated, items)
+        )
+    return all(map(operator.is_, validated, items))
+
+
+@dataclass(frozen=True)
+class MaxItems:
+    """Annotation for keeping only the k smallest or largest items, which are selected with a
+    heap during validation in O(n log k) instead of sorting all n items. Validated containers are
+    instances of a bounded subclass of the container class that keeps enforcing the bound when
+    items are added later. For SortedDict, the keys are compared. Items are compared using the
+    key function if one is set with Key.
+    """
+
+    k: int
+    keep: Literal["smallest", "largest"] = "smallest"
+
+    def __post_init__(self) -> None:
+        if self.k < 0:
+            raise ValueError(f"k must be non-negative, got {self.k}.")
+        if self.keep not in ("smallest", "largest"):
+            raise ValueError(f"keep must be 'smallest' or 'largest', got {self.keep!r}.")
+
+    def __get_pydantic_core_schema__(
+        self, source_type: Any, handler: GetCoreSchemaHandler
+    ) -> core_schema.CoreSchema:
+        spec = _get_spec(handler(source_type))
+        if spec is None:
+            msg = (
+                "MaxItems must be used with a sortedcontainers_pydantic class or annotation, "
+                f"got annotation '{source_type}'."
+            )
+            raise UnsupportedSourceTypeError(msg)
+        spec = replace(spec, max_items=self)
+        return _build_core_schema(spec, handler)
+
+    def _select(
+        self, values: Iterable[Any], key: Optional[Callable[[Any], "SupportsRichComparison"]]
+    ) -> List[Any]:
+        """Select the kept values, returned in sorted order."""
+        if self.keep == "smallest":
+            return heapq.nsmallest(self.k, values, key=key)
+        selected = heapq.nlargest(self.k, values, key=key)
+        selected.reverse()
+        return selected
+
+
+class _BoundedMixin:
+    """Mixin for sorted containers that keep at most _max_items items, dropping the smallest or
+    largest items after every method that adds items."""
+
+    _base: Any
+    _max_items: int
+    _keep: str
+
+    def _trim(self) -> None:
+        excess = len(self) - self._max_items  # type: ignore[arg-type]
+        if excess > 0:
+            if self._keep == "smallest":
+                self._delete_slice(slice(-excess, None))
+            else:
+                self._delete_slice(slice(None, excess))
+
+    def _delete_slice(self, index: slice) -> None:
+        del self[index]  # type: ignore[attr-defined]
+
+    def __reduce_ex__(self, protocol: Any) -> Any:
+        # Bounded classes are created dynamically, so pickle a call that recreates the class
+        # and passes it to the base class's reducer
+        reducer, args = super().__reduce_ex__(protocol)[:2]  # type: ignore[str-unpack]
+        if reducer is type(self):
+            return (_make_bounded, (self._base, self._max_items, self._keep, args))
+        return (_make_bounded, (self._base, self._max_items, self._keep, args[1:], reducer))
+
+
+class _BoundedListMixin(_BoundedMixin):
+    def add(self, value: Any) -> None:
+        super().add(value)  # type: ignore[misc]
+        self._trim()
+
+    def update(self, *args: Any) -> None:
+        super().update(*args)  # type: ignore[misc]
+        self._trim()
+
+    _update = update
+
+    def __iadd__(self, other: Any) -> Any:
+        self.update(other)
+        return self
+
+    __ior__ = __iadd__
+
+    def __imul__(self, num: int) -> Any:
+        super().__imul__(num)  # type: ignore[misc]
+        self._trim()
+        return self
+
+
+class _BoundedDictMixin(_BoundedMixin):
+    def _delete_slice(self, index: slice) -> None:
+        _list = self._list  # type: ignore[attr-defined]
+        for key in _list[index]:
+            dict.__delitem__(self, key)  # type: ignore[arg-type]
+        del _list[index]
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        super().__setitem__(key, value)  # type: ignore[misc]
+        self._trim()
+
+    def setdefault(self, key: Any, default: Any = None) -> Any:
+        value = super().setdefault(key, default)  # type: ignore[misc]
+        self._trim()
+        return value
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        super().update(*args, **kwargs)  # type: ignore[misc]
+        self._trim()
+
+    _update = update
+
+
+@lru_cache(maxsize=None)
+def _bounded_class(cls: Any, max_items: int, keep: str) -> Any:
+    """Get a subclass of a sorted container class that keeps at most max_items items."""
+    if issubclass(cls, sortedcontainers.SortedDict):
+        mixin: type = _BoundedDictMixin
+    else:
+        mixin = _BoundedListMixin
+    return type(
+        f"Bounded{cls.__name__}",
+        (mixin, cls),
+        {"_base": cls, "_max_items": max_items, "_keep": keep, "__module__": cls.__module__},
+    )
+
+
+def _make_bounded(
+    cls: Any,
+    max_items: int,
+    keep: str,
+    args: Tuple[Any, ...],
+    reducer: Optional[Callable[..., Any]] = None,
+) -> Any:
+    """Create an instance of a bounded class, used for unpickling. The instance is created by
+    calling the class with args, or reducer with the class and args if given."""
+    bounded_cls = _bounded_class(cls, max_items, keep)
+    if reducer is None:
+        return bounded_cls(*args)
+    return reducer(bounded_cls, *args)
+
+
+@dataclass(frozen=True)
+class LoadFactor:
+    """Annotation for setting the load factor of validated containers, which is the length of
+    the internal sorted sublists that sortedcontainers splits values into. Sublists are split
+    when they grow past twice the load factor. Smaller load factors make adding and removing
+    values cheaper, since less of a sublist is shifted, while larger load factors make indexing
+    by position and iterating cheaper and use less memory. sortedcontainers' default is 1000.
+
+    With "auto", the load factor is picked from the number of validated values: the default up
+    to about a million values, and the square root of the number of values beyond that, up to
+    10,000. Existing instances that are reused as-is keep their load factor.
+    """
+
+    load: Union[int, Literal["auto"]]
+
+    def __post_init__(self) -> None:
+        if self.load != "auto" and (
+            not isinstance(self.load, int) or isinstance(self.load, bool) or self.load < 4
+        ):
+            raise ValueError(
+                f"load must be an integer of at least 4 or 'auto', got {self.load!r}."
+            )
+
+    def __get_pydantic_core_schema__(
+        self, source_type: Any, handler: GetCoreSchemaHandler
+    ) -> core_schema.CoreSchema:
+        spec = _get_spec(handler(source_type))
+        if spec is None:
+            msg = (
+                "LoadFactor must be used with a sortedcontainers_pydantic class or annotation, "
+                f"got annotation '{source_type}'."
+            )
+            raise UnsupportedSourceTypeError(msg)
+        spec = replace(spec, load_factor=self)
+        return _build_core_schema(spec, handler)
+
+    def _resolve(self, size: int) -> int:
+        """Get the load factor for a container of size values."""
+        if isinstance(self.load, int):
+            return self.load
+        return min(max(math.isqrt(size), _DEFAULT_LOAD), _MAX_AUTO_LOAD)
+
+
+_DEFAULT_LOAD = sortedcontainers.SortedList.DEFAULT_LOAD_FACTOR
+_MAX_AUTO_LOAD = 10_000
+
+
+_INTEGER_TYPECODES = frozenset("bBhHiIlLqQ")
+_FLOAT_TYPECODES = frozenset("fd")
+
+
+def _integer_range(typecode: str) -> Tuple[int, int]:
+    """Get the smallest and largest values of an integer array typecode."""
+    from array import array
+
+    bits = array(typecode).itemsize * 8
+    if typecode.isupper():
+        return 0, 2**bits - 1
+    return -(2 ** (bits - 1)), 2 ** (bits - 1) - 1
+
+
+@dataclass(frozen=True)
+class BinaryFormat:
+    """Annotation for serializing numeric SortedList and SortedSet containers, and SortedArray,
+    compactly as a packed array of values instead of a list, using Python's array module (or
+    NumPy for SortedArray). Serializes to a dict with the array typecode ("dtype"), number of
+    values ("length"), and little-endian bytes of the values ("data"), which are base64-encoded
+    in JSON mode. Validation also accepts this format in addition to the usual ones, loading the
+    values in bulk.
+
+    SortedList and SortedSet containers must have int or float values, with an integer or float
+    typecode respectively, and int values are validated to fit in the typecode. If dtype isn't
+    given, it's "q" (64-bit signed integers) for int values and "d" (64-bit floats) for float
+    values, or the typecode of the same size and kind as a SortedArray's dtype. Input in the
+    binary format may use any typecode of the same kind.
+    """
+
+    dtype: Optional[str] = None
+
+    def __post_init__(self) -> None:
+        if self.dtype is not None and self.dtype not in _INTEGER_TYPECODES | _FLOAT_TYPECODES:
+            raise ValueError(f"dtype must be a numeric array typecode, got {self.dtype!r}.")
+
+    def __get_pydantic_core_schema__(
+        self, source_type: Any, handler: GetCoreSchemaHandler
+    ) -> core_schema.CoreSchema:
+        schema = handler(source_type)
+        array_metadata = (schema.get("metadata") or {}).get(_ARRAY_METADATA_KEY)
+        if array_metadata is not None:
+            array_cls, array_dtype = array_metadata
+            return _array_binary_schema(source_type, array_cls, array_dtype, self)
+        spec = _get_spec(schema)
+        if spec is None or issubclass(spec.cls, sortedcontainers.SortedDict):
+            msg = (
+                "BinaryFormat must be used with a sortedcontainers_pydantic SortedList, "
+                f"SortedSet, or SortedArray class or annotation, got annotation '{source_type}'."
+            )
+            raise UnsupportedSourceTypeError(msg)
+        # Decoded values are loaded without validating them, so only allow plain numbers
+        item_type = spec.args[0] if spec.args else None
+        if item_type is not int and item_type is not float:
+            msg = (
+                "BinaryFormat must be used with int or float values, got annotation "
+                f"'{source_type}'."
+            )
+            raise UnsupportedSourceTypeError(msg)
+        dtype = self.dtype or ("q" if item_type is int else "d")
+        if (dtype in _INTEGER_TYPECODES) != (item_type is int):
+            msg = (
+                f"BinaryFormat dtype {dtype!r} doesn't match the {item_type.__name__} values of "
+                f"annotation '{source_type}'."
+            )
+            raise UnsupportedSourceTypeError(msg)
+        if item_type is int:
+            # Validate the range of values, so that they can be serialized without changing
+            from annotated_types import Interval
+
+            low, high = _integer_range(dtype)
+            item_type = Annotated[int, Interval(ge=low, le=high)]
+        spec = replace(spec, args=(item_type,), binary=BinaryFormat(dtype))
+        return _build_core_schema(spec, handler)
+
+    def _validation_schema(self, spec: _ContainerSpec) -> core_schema.CoreSchema:
+        """Build the schema for input in the binary format."""
+        from array import array
+        import base64
+
+        from pydantic_core import core_schema
+
+        field_dtype = self.dtype
+        assert field_dtype is not None
+        is_integer = field_dtype in _INTEGER_TYPECODES
+        typecodes = _INTEGER_TYPECODES if is_integer else _FLOAT_TYPECODES
+        low, high = _integer_range(field_dtype) if is_integer else (None, None)
+        # Serialized values are in sorted order, so load them without sorting
+        from_values = replace(spec, presorted=spec.presorted or Presorted()).from_values()
+
+        def from_binary(value: Dict[str, Any]) -> Any:
+            dtype = value["dtype"]
+            if dtype not in typecodes:
+                raise ValueError(
+                    f"Input should have a dtype of {sorted(typecodes)}, got {dtype!r}."
+                )
+            data = value["data"]
+            values = array(dtype)
+            values.frombytes(base64.b64decode(data) if isinstance(data, str) else data)
+            if sys.byteorder == "big":
+                values.byteswap()
+            if len(values) != value["length"]:
+                raise ValueError(
+                    f"Input should have {value['length']} values, got {len(values)} values."
+                )
+            if is_integer and dtype != field_dtype and values:
+                smallest, largest = min(values), max(values)
+                if smallest < low or largest > high:
+                    raise ValueError(
+                        f"Input should have values from {low} to {high} to fit in dtype "
+                        f"{field_dtype!r}, got values from {smallest} to {largest}."
+                    )
+            return from_values(values.tolist())
+
+        fields = {
+            "dtype": core_schema.typed_dict_field(core_schema.str_schema()),
+            "length": core_schema.typed_dict_field(core_schema.int_schema(ge=0)),
+            "data": core_schema.typed_dict_field(
+                core_schema.json_or_python_schema(
+                    json_schema=core_schema.str_schema(),
+                    python_schema=core_schema.union_schema(
+                        [core_schema.bytes_schema(), core_schema.str_schema()]
+                    ),
+                )
+            ),
+        }
         return core_schema.no_info_after_validator_function(
-            function=partial(constructor, key=self.key),
-            schema=handler(source_type),
+            function=from_binary, schema=core_schema.typed_dict_schema(fields)
+        )
+
+    def _serialization_schema(self) -> core_schema.SerSchema:
+        """Build the serializer that converts an instance to the binary format."""
+        from array import array
+        import base64
+
+        from pydantic_core import core_schema
+
+        dtype = self.dtype
+        assert dtype is not None
+
+        def to_binary(value: Any, info: core_schema.SerializationInfo) -> Dict[str, Any]:
+            try:
+                values = array(dtype, value)
+            except OverflowError:
+                raise ValueError(f"Values should fit in dtype {dtype!r}.") from None
+            if sys.byteorder == "big":
+                values.byteswap()
+            data = values.tobytes()
+            return {
+                "dtype": dtype,
+                "length": len(values),
+                "data": base64.b64encode(data).decode("ascii") if info.mode_is_json() else data,
+            }
+
+        return core_schema.plain_serializer_function_ser_schema(to_binary, info_arg=True)
+
+
+@dataclass(frozen=True)
+class ColumnarFormat:
+    """Annotation for serializing SortedDict containers in a columnar format, as a dict with a
+    list of the keys in sorted order ("keys") and a list of the corresponding values ("values").
+    Unlike a JSON object, keys aren't converted to strings. Validation also accepts this format
+    in addition to the usual ones, loading the keys in bulk without sorting them. Input mappings
+    with "keys" and "values" fields are always read in this format.
+    """
+
+    def __get_pydantic_core_schema__(
+        self, source_type: Any, handler: GetCoreSchemaHandler
+    ) -> core_schema.CoreSchema:
+        spec = _get_spec(handler(source_type))
+        if spec is None or not issubclass(spec.cls, sortedcontainers.SortedDict):
+            msg = (
+                "ColumnarFormat must be used with a sortedcontainers_pydantic SortedDict class "
+                f"or annotation, got annotation '{source_type}'."
+            )
+            raise UnsupportedSourceTypeError(msg)
+        spec = replace(spec, columnar=self)
+        return _build_core_schema(spec, handler)
+
+    def _validation_schema(
+        self,
+        spec: _ContainerSpec,
+        key_schema: core_schema.CoreSchema,
+        value_schema: core_schema.CoreSchema,
+    ) -> core_schema.CoreSchema:
+        """Build the schema for input in the columnar format."""
+        from pydantic_core import core_schema
+
+        # Serialized keys are in sorted order, so load them without sorting
+        from_values = replace(spec, presorted=spec.presorted or Presorted()).from_values()
+
+        def from_columns(value: Dict[str, List[Any]]) -> Any:
+            keys = value["keys"]
+            values = value["values"]
+            if len(keys) != len(values):
+                raise ValueError(
+                    f"Input should have as many values as keys, got {len(keys)} keys and "
+                    f"{len(values)} values."
+                )
+            mapping = dict(zip(keys, values))
+            if len(mapping) != len(keys):
+                raise ValueError(
+                    f"Input should have unique keys, got {len(keys) - len(mapping)} duplicate "
+                    "keys."
+                )
+            return from_values(mapping)
+
+        fields = {
+            "keys": core_schema.typed_dict_field(core_schema.list_schema(key_schema)),
+            "values": core_schema.typed_dict_field(core_schema.list_schema(value_schema)),
+        }
+        return core_schema.no_info_after_validator_function(
+            function=from_columns, schema=core_schema.typed_dict_schema(fields)
+        )
+
+    def _serialization_schema(
+        self, key_schema: core_schema.CoreSchema, value_schema: core_schema.CoreSchema
+    ) -> core_schema.SerSchema:
+        """Build the serializer that converts an instance to the columnar format."""
+        from pydantic_core import core_schema
+
+        def to_columns(value: Any) -> Dict[str, List[Any]]:
+            if issubclass(type(value), sortedcontainers.SortedDict):
+                keys = list(value._list)
+            else:
+                keys = sorted(value)
+            return {"keys": keys, "values": list(map(value.__getitem__, keys))}
+
+        fields = {
+            "keys": core_schema.typed_dict_field(core_schema.list_schema(key_schema)),
+            "values": core_schema.typed_dict_field(core_schema.list_schema(value_schema)),
+        }
+        return core_schema.plain_serializer_function_ser_schema(
+            to_columns, return_schema=core_schema.typed_dict_schema(fields)
+        )
+
+
+@dataclass(frozen=True, eq=False)
+class CacheValidation:
+    """Annotation for caching validated containers, keyed on a hash of the input, so that
+    validating the same input again returns a copy of the previously built container instead of
+    validating and sorting the values again. Useful for data like configuration that is
+    validated from the same JSON repeatedly.
+
+    Inputs are hashed with BLAKE2b after serializing them with marshal, so only inputs made of
+    built-in types like lists, dicts, strings, and numbers (including any input parsed from
+    JSON) are cached. Cached containers are evicted in least recently used order to keep at most
+    max_entries containers with at most max_elements items in total. Hits return a copy that shares
+    the cached container's sorted sublists until either is modified, which takes much less time
+    than validating. If the items (or keys and values) aren't all of immutable built-in types
+    like int and str, hits return a deep copy instead, so that modifying an item of the result,
+    like a list or a model, doesn't modify the cached container. Hit, miss, and eviction counts
+    are available from stats. Input validated in strict mode or JSON mode is cached separately,
+    and input validated with a context isn't cached.
+
+    Each instance has its own cache, which can be shared between fields by reusing the instance.
+    """
+
+    max_entries: int = 128
+    max_elements: int = 1_000_000
+    _entries: "OrderedDict[Hashable, Any]" = field(
+        default_factory=OrderedDict, init=False, repr=False
+    )
+    _counts: Counter[str] = field(default_factory=Counter, init=False, repr=False)
+    _lock: Any = field(default_factory=threading.Lock, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.max_entries < 1:
+            raise ValueError(f"max_entries must be positive, got {self.max_entries}.")
+        if self.max_elements < 1:
+            raise ValueError(f"max_elements must be positive, got {self.max_elements}.")
+
+    def __get_pydantic_core_schema__(
+        self, source_type: Any, handler: GetCoreSchemaHandler
+    ) -> core_schema.CoreSchema:
+        spec = _get_spec(handler(source_type))
+        if spec is None:
+            msg = (
+                "CacheValidation must be used with a sortedcontainers_pydantic class or "
+                f"annotation, got annotation '{source_type}'."
+            )
+            raise UnsupportedSourceTypeError(msg)
+        spec = replace(spec, cache=self)
+        return _build_core_schema(spec, handler)
+
+    def stats(self) -> Dict[str, int]:
+        """Get the numbers of hits, misses, and evictions, and the numbers of cached entries and
+        of items in them."""
+        with self._lock:
+            return {
+                "hits": self._counts["hits"],
+                "misses": self._counts["misses"],
+                "evictions": self._counts["evictions"],
+                "entries": len(self._entries),
+                "elements": self._counts["elements"],
+            }
+
+    def clear(self) -> None:
+        """Remove all cached containers and reset the statistics."""
+        with self._lock:
+            self._entries.clear()
+            self._counts.clear()
+
+    def _wrap_schema(
+        self, spec: _ContainerSpec, schema: core_schema.CoreSchema
+    ) -> core_schema.CoreSchema:
+        """Wrap a container's schema with a validator that looks up and stores containers."""
+        import hashlib
+        import marshal
+
+        from pydantic_core import core_schema
+
+        # Separate the entries of different schemas that share this instance
+        namespace = object()
+        # Containers of mutable items must not share them with the cached container
+        copy_container: Callable[[Any], Any]
+        if spec.args and all(arg in _ATOMIC_TYPES for arg in spec.args):
+            copy_container = _copy_container
+        else:
+            copy_container = copy.deepcopy
+
+        def validate(
+            strict: bool,
+            value: Any,
+            handler: core_schema.ValidatorFunctionWrapHandler,
+            info: core_schema.ValidationInfo,
+        ) -> Any:
+            if info.context is not None:
+                # Validators may depend on the context, which can't be part of the key
+                return handler(value)
+            try:
+                digest = hashlib.blake2b(marshal.dumps(value), digest_size=16).digest()
+            except ValueError:
+                # Not made of built-in types that marshal can serialize
+                return handler(value)
+            # The same input can validate differently in strict mode and in JSON mode. Objects
+            # validated from attributes can't be serialized with marshal, so they're not cached
+            key = (namespace, strict, info.mode, digest)
+            with self._lock:
+                cached = self._entries.get(key)
+                if cached is not None:
+                    self._entries.move_to_end(key)
+                    self._counts["hits"] += 1
+                else:
+                    self._counts["misses"] += 1
+            if cached is not None:
+                return copy_container(cached)
+            container = handler(value)
+            # Cache a copy, since the returned container may be modified
+            self._store(key, copy_container(container))
+            return container
+
+        # Validation info doesn't include whether validation is strict, so use separate validators
+        return core_schema.lax_or_strict_schema(
+            lax_schema=core_schema.with_info_wrap_validator_function(
+                partial(validate, False), schema
+            ),
+            strict_schema=core_schema.with_info_wrap_validator_function(
+                partial(validate, True), schema
+            ),
+            serialization=schema.get("serialization"),
+            metadata={_SPEC_METADATA_KEY: spec},
+        )
+
+    def _store(self, key: Hashable, container: Any) -> None:
+        size = len(container)
+        if size > self.max_elements:
+            return
+        with self._lock:
+            if key in self._entries:
+                return
+            self._entries[key] = container
+            counts = self._counts
+            counts["elements"] += size
+            while len(self._entries) > self.max_entries or counts["elements"] > self.max_elements:
+                _, evicted = self._entries.popitem(last=False)
+                counts["elements"] -= len(evicted)
+                counts["evictions"] += 1
+
+
+@dataclass(frozen=True)
+class Lazy:
+    """Annotation for deferring validation and sorting until the container is first used, for
+    large fields that are often never accessed. Validation only checks that the input is a list,
+    tuple, set, frozenset, or dict (any other input is validated right away) and stores it. The
+    container is validated and built the first time any of its attributes, methods, or
+    operators is used, which raises a ValidationError with the errors that validating the model
+    would have raised, at locations that start with the field name.
+
+    Until then, serializing the container returns the stored input as it was given, without
+    validating or sorting it, so invalid input is serialized as it is instead of raising an
+    error. Use the container before serializing it if the output must be valid. Containers with
+    BinaryFormat or ColumnarFormat, and SortedDict input given as pairs rather than a mapping,
+    are built before serializing.
+
+    Stored input is validated as Python objects, so JSON input that only validates in JSON mode,
+    like ISO 8601 strings for datetimes in strict mode, fails when the container is built.
+    """
+
+    def __get_pydantic_core_schema__(
+        self, source_type: Any, handler: GetCoreSchemaHandler
+    ) -> core_schema.CoreSchema:
+        spec = _get_spec(handler(source_type))
+        if spec is None:
+            msg = (
+                "Lazy must be used with a sortedcontainers_pydantic class or annotation, "
+                f"got annotation '{source_type}'."
+            )
+            raise UnsupportedSourceTypeError(msg)
+        spec = replace(spec, lazy=self)
+        return _build_core_schema(spec, handler)
+
+    def _wrap_schema(
+        self, spec: _ContainerSpec, schema: core_schema.CoreSchema
+    ) -> core_schema.CoreSchema:
+        """Wrap a container's schema with a validator that stores the input in a lazy container,
+        which validates it with the wrapped schema when first used."""
+        from pydantic_core import core_schema
+
+        lazy_cls = _lazy_class(spec.container_cls())
+        is_dict = issubclass(spec.cls, sortedcontainers.SortedDict)
+        new = dict.__new__ if is_dict else object.__new__
+        pass_through = spec.binary is None and spec.columnar is None
+
+        def validate(
+            value: Any,
+            handler: core_schema.ValidatorFunctionWrapHandler,
+            info: core_schema.ValidationInfo,
+        ) -> Any:
+            if not isinstance(value, _LAZY_INPUT_TYPES):
+                return handler(value)
+            if info.mode == "python" and isinstance(value, (list, set, dict)):
+                # Copy mutable input, which could be modified before the container is built
+                value = value.copy()
+            container = new(lazy_cls)
+            state = object.__getattribute__(container, "__dict__")
+            state["_lazy_input"] = value
+            # Errors are raised with the title of the model, like when validating it
+            title = (info.config or {}).get("title") or spec.cls.__name__
+            state["_lazy_build"] = partial(_validate_lazy_input, handler, info.field_name, title)
+            return container
+
+        def serialize(value: Any, handler: core_schema.SerializerFunctionWrapHandler) -> Any:
+            if pass_through and _is_lazy(value):
+                values = object.__getattribute__(value, "__dict__").get("_lazy_input", _MISSING)
+                if is_dict and isinstance(values, dict):
+                    return dict(values)
+                if not is_dict and isinstance(values, (list, tuple, set, frozenset)):
+                    return list(values)
+            return handler(value)
+
+        return core_schema.with_info_wrap_validator_function(
+            validate,
+            schema,
+            serialization=core_schema.wrap_serializer_function_ser_schema(
+                serialize,
+                schema=core_schema.any_schema(serialization=schema.get("serialization")),
+            ),
+            metadata={_SPEC_METADATA_KEY: spec},
         )
+
+
+# Inputs that lazy containers store instead of validating them right away
+_LAZY_INPUT_TYPES = (list, tuple, set, frozenset, dict)
+
+_MISSING = object()
+
+# Held while building a lazy container, so that it's only built once
+_lazy_lock = threading.RLock()
+
+# Special methods, which Python looks up on the class rather than with __getattribute__, that
+# build a lazy container before delegating to the built container's method
+_LAZY_SPECIAL_METHODS = (
+    "__setattr__", "__delattr__", "__dir__", "__repr__", "__str__", "__format__",
+    "__sizeof__", "__reduce__", "__reduce_ex__", "__getstate__", "__copy__", "__deepcopy__",
+    "__eq__", "__ne__", "__lt__", "__le__", "__gt__", "__ge__", "__hash__", "__bool__",
+    "__len__", "__iter__", "__reversed__", "__contains__", "__getitem__", "__setitem__",
+    "__delitem__", "__add__", "__radd__", "__iadd__", "__mul__", "__rmul__", "__imul__",
+    "__and__", "__rand__", "__iand__", "__or__", "__ror__", "__ior__", "__sub__", "__rsub__",
+    "__isub__", "__xor__", "__rxor__", "__ixor__",
+)  # fmt: skip
+
+
+def _is_lazy(container: Any) -> bool:
+    """Check whether a container is a lazy container that hasn't been built yet."""
+    return "_lazy_base" in type(container).__dict__
+
+
+def _validate_lazy_input(
+    handler: core_schema.ValidatorFunctionWrapHandler,
+    field_name: Optional[str],
+    title: str,
+    value: Any,
+) -> Any:
+    """Validate the stored input of a lazy container with the handler captured when the input
+    was validated, which raises errors at locations that start with the field name. The errors
+    are raised as they are, with the given title instead of the handler's."""
+    from pydantic_core import ValidationError
+
+    try:
+        return handler(value, field_name)
+    except ValidationError as e:
+        raise _relocate_errors(e, lambda loc: loc, title) from None
+
+
+def _build_lazy(container: Any) -> None:
+    """Build a lazy container from its stored input, then make it the built container by taking
+    its state and switching to its class."""
+    with _lazy_lock:
+        if not _is_lazy(container):
+            # Built by another thread
+            return
+        state = object.__getattribute__(container, "__dict__")
+        built = state["_lazy_build"](state["_lazy_input"])
+        # The state of sorted containers only refers to their internal lists and sets, rather
+        # than to the container itself, so it can be moved to another instance
+        state.clear()
+        state.update(built.__dict__)
+        if isinstance(built, dict):
+            dict.update(container, dict.items(built))
+        object.__setattr__(container, "__class__", type(built))
+
+
+def _lazy_special_method(name: str) -> Callable[..., Any]:
+    def method(self: Any, *args: Any, **kwargs: Any) -> Any:
+        _build_lazy(self)
+        return getattr(self, name)(*args, **kwargs)
+
+    method.__name__ = name
+    return method
+
+
+@lru_cache(maxsize=None)
+def _lazy_class(cls: Any) -> Any:
+    """Get a subclass of a container class for lazy containers, which are created without
+    calling __init__ and switch to the class of the built container when first used. Like the
+    copy-on-write classes, the subclass has the same name and derives from the class directly,
+    so that instances look the same and pass isinstance checks without being built."""
+
+    class LazyContainer(cls):  # type: ignore[misc]
+        _lazy_base = cls
+
+        def __getattribute__(self, name: str) -> Any:
+            # isinstance looks up __class__, which shouldn't build the container
+            if name != "__class__":
+                _build_lazy(self)
+            return object.__getattribute__(self, name)
+
+    for name in _LAZY_SPECIAL_METHODS:
+        if getattr(cls, name, None) is not None:
+            setattr(LazyContainer, name, _lazy_special_method(name))
+    LazyContainer.__name__ = cls.__name__
+    LazyContainer.__qualname__ = cls.__qualname__
+    LazyContainer.__module__ = cls.__module__
+    return LazyContainer
@@ -0,0 +1,569 @@
+"""Sorted arrays of numbers stored contiguously in NumPy arrays."""
+
+from __future__ import annotations
+
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterator,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+    get_args,
+)
+
+if TYPE_CHECKING:
+    from pydantic import GetCoreSchemaHandler
+    from pydantic_core import core_schema
+
+    from sortedcontainers_pydantic import BinaryFormat
+
+_ScalarT = TypeVar("_ScalarT")
+
+# Schemas of SortedArray record their class and dtype in their metadata under this key, so that
+# BinaryFormat can rebuild them with the binary format
+_ARRAY_METADATA_KEY = "sortedcontainers_pydantic_array"
+
+# Kinds of NumPy dtypes that are supported: signed and unsigned integers, and floats
+_NUMERIC_KINDS = frozenset("iuf")
+
+# Array typecodes with the same kind and size as NumPy dtypes, for BinaryFormat
+_BINARY_TYPECODES = {
+    ("i", 1): "b",
+    ("i", 2): "h",
+    ("i", 4): "i",
+    ("i", 8): "q",
+    ("u", 1): "B",
+    ("u", 2): "H",
+    ("u", 4): "I",
+    ("u", 8): "Q",
+    ("f", 4): "f",
+    ("f", 8): "d",
+}
+
+_MIN_CAPACITY = 8
+
+
+def _import_numpy() -> Any:
+    try:
+        import numpy
+    except ImportError as e:
+        raise ImportError(
+            "SortedArray requires NumPy, which can be installed with the numpy extra, e.g., "
+            "pip install sortedcontainers-pydantic[numpy]"
+        ) from e
+    return numpy
+
+
+class SortedArray(Sequence[_ScalarT]):
+    """Sorted sequence of numbers stored contiguously in a NumPy array, using a fraction of the
+    memory of a SortedList of the same numbers. Sorting, bisection, and range queries are
+    vectorized with np.sort and np.searchsorted, and bisect_left and bisect_right also accept
+    arrays of values to look up at once.
+
+    Values are kept in a buffer with spare capacity, so add takes O(log n) time to find the
+    position and a single O(n) move of the larger values, without allocating most of the time.
+    Adding k values at once with update takes O(n + k log k) time.
+
+    The dtype is inferred from the values if it isn't given. Values that would change when
+    stored as an integer dtype, like 1.5 or out of range values, raise ValueError. For Pydantic,
+    parametrize it with the dtype, e.g., SortedArray[numpy.float32], or SortedArray[int] and
+    SortedArray[float] for 64-bit integers and floats. Requires NumPy.
+    """
+
+    def __init__(self, iterable: Any = None, dtype: Any = None):
+        np = _import_numpy()
+        if iterable is None:
+            values = np.empty(0, dtype=np.float64 if dtype is None else dtype)
+            if values.dtype.kind not in _NUMERIC_KINDS:
+                raise TypeError(f"dtype should be an integer or float dtype, got '{dtype}'.")
+        else:
+            values = _as_array(np, iterable, dtype)
+            values.sort()
+        self._buffer = values
+        self._len = len(values)
+
+    @classmethod
+    def _from_sorted(cls, values: Any) -> Any:
+        """Create a sorted array that takes ownership of a sorted 1-dimensional array."""
+        sorted_array = cls.__new__(cls)
+        sorted_array._buffer = values
+        sorted_array._len = len(values)
+        return sorted_array
+
+    @property
+    def dtype(self) -> Any:
+        """NumPy dtype of the values."""
+        return self._buffer.dtype
+
+    @property
+    def values(self) -> Any:
+        """Read-only view of the values as a NumPy array. The view reflects later changes to the
+        sorted array, so copy it to keep the current values."""
+        view = self._buffer[: self._len]
+        view.flags.writeable = False
+        return view
+
+    def __array__(self, dtype: Any = None, copy: Optional[bool] = None) -> Any:
+        values = self.values
+        if dtype is not None and dtype != values.dtype:
+            return values.astype(dtype)
+        return values.copy() if copy else values
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __iter__(self) -> Iterator[_ScalarT]:
+        return iter(self.values)
+
+    def __reversed__(self) -> Iterator[_ScalarT]:
+        return iter(self.values[::-1])
+
+    def __getitem__(self, index: Any) -> Any:
+        if isinstance(index, slice):
+            # Copy, since the buffer is modified in place when values are added or removed
+            return self.values[index].copy()
+        return self.values[index]
+
+    def __delitem__(self, index: Any) -> None:
+        if isinstance(index, slice):
+            np = _import_numpy()
+            self._buffer = np.delete(self.values, index)
+            self._len = len(self._buffer)
+            return
+        if index < 0:
+            index += self._len
+        if not 0 <= index < self._len:
+            raise IndexError("sorted array index out of range")
+        self._delete(index)
+
+    def __contains__(self, value: object) -> bool:
+        pos = int(self._searchsorted(value))
+        return pos < self._len and bool(self._buffer[pos] == value)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Sequence) or isinstance(other, (str, bytes)):
+            return NotImplemented
+        np = _import_numpy()
+        return len(self) == len(other) and bool(np.array_equal(self.values, np.asarray(other)))
+
+    def __ne__(self, other: object) -> bool:
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.values.tolist()!r}, dtype='{self.dtype}')"
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        # Pickle the values in sorted order without spare capacity, so unpickling doesn't sort
+        return (_restore_sorted_array, (type(self), self.values.copy()))
+
+    def copy(self) -> Any:
+        """Return a shallow copy of the sorted array."""
+        return self._from_sorted(self.values.copy())
+
+    __copy__ = copy
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> Any:
+        # Values are numbers, so a shallow copy is already deep
+        return self.copy()
+
+    def add(self, value: Any) -> None:
+        """Add a value to the sorted array, after any equal values."""
+        np = _import_numpy()
+        dtype = self.dtype
+        try:
+            scalar = dtype.type(value)
+        except OverflowError as e:
+            raise ValueError(f"Value {value!r} is out of range for dtype '{dtype}'.") from e
+        if dtype.kind != "f" and scalar != value:
+            raise ValueError(f"Value {value!r} can't be stored as dtype '{dtype}'.")
+        length = self._len
+        buffer = self._buffer
+        pos = int(buffer[:length].searchsorted(scalar, side="right"))
+        if length == len(buffer):
+            # Grow geometrically, so that most additions don't allocate
+            self._buffer = np.empty(max(_MIN_CAPACITY, 2 * length), dtype=dtype)
+            self._buffer[:pos] = buffer[:pos]
+        self._buffer[pos + 1 : length + 1] = buffer[pos:length]
+        self._buffer[pos] = scalar
+        self._len = length + 1
+
+    def update(self, iterable: Any) -> None:
+        """Add many values to the sorted array at once, merging them into the sorted values."""
+        np = _import_numpy()
+        new = _as_array(np, iterable, self.dtype)
+        new.sort()
+        values = self.values
+        self._buffer = np.insert(values, values.searchsorted(new, side="right"), new)
+        self._len = len(self._buffer)
+
+    def _searchsorted(self, value: Any, side: str = "left") -> Any:
+        """Find where to insert values with np.searchsorted. Numbers of the same kind as the
+        dtype, and any numbers for float dtypes, are converted to the dtype first, like NumPy
+        does to compare with Python numbers. Otherwise, NumPy would convert all the sorted values
+        to the dtype of the values on every call."""
+        dtype = self._buffer.dtype
+        value_type = type(value)
+        if value_type is float or value_type is int:
+            try:
+                converted = dtype.type(value)
+            except (OverflowError, ValueError):
+                converted = None
+            if dtype.kind == "f" or converted == value:
+                value = converted
+        else:
+            value_dtype = getattr(value, "dtype", None)
+            if value_dtype is not None and (
+                value_dtype.kind == dtype.kind
+                or (dtype.kind == "f" and value_dtype.kind in _NUMERIC_KINDS)
+            ):
+                value = value.astype(dtype)
+        return self._buffer[: self._len].searchsorted(value, side=side)
+
+    def _delete(self, pos: int) -> None:
+        length = self._len
+        self._buffer[pos : length - 1] = self._buffer[pos + 1 : length]
+        self._len = length - 1
+
+    def discard(self, value: Any) -> None:
+        """Remove a value from the sorted array if it's a member."""
+        pos = int(self._searchsorted(value))
+        if pos < self._len and self._buffer[pos] == value:
+            self._delete(pos)
+
+    def remove(self, value: Any) -> None:
+        """Remove a value from the sorted array, raising ValueError if it's not a member."""
+        pos = int(self._searchsorted(value))
+        if pos == self._len or self._buffer[pos] != value:
+            raise ValueError(f"{value!r} not in sorted array")
+        self._delete(pos)
+
+    def pop(self, index: int = -1) -> Any:
+        """Remove and return the value at an index, by default the largest value."""
+        if not self._len:
+            raise IndexError("pop from empty sorted array")
+        value = self[index]
+        del self[index]
+        return value
+
+    def clear(self) -> None:
+        """Remove all values from the sorted array."""
+        self._len = 0
+
+    def bisect_left(self, value: Any) -> Any:
+        """Get the index to insert a value at, before any equal values. If value is an array,
+        gets an array of indices."""
+        return _to_index(self._searchsorted(value, side="left"))
+
+    def bisect_right(self, value: Any) -> Any:
+        """Get the index to insert a value at, after any equal values. If value is an array,
+        gets an array of indices."""
+        return _to_index(self._searchsorted(value, side="right"))
+
+    bisect = bisect_right
+
+    def count(self, value: Any) -> int:
+        """Get the number of occurrences of a value."""
+        return int(self._searchsorted(value, side="right") - self._searchsorted(value))
+
+    def index(self, value: Any, start: Optional[int] = None, stop: Optional[int] = None) -> int:
+        """Get the index of the first occurrence of a value, raising ValueError if it's not a
+        member."""
+        start, stop, _ = slice(start, stop).indices(self._len)
+        pos = max(start, int(self._searchsorted(value)))
+        if pos >= stop or self._buffer[pos] != value:
+            raise ValueError(f"{value!r} is not in sorted array")
+        return pos
+
+    def irange(
+        self,
+        minimum: Any = None,
+        maximum: Any = None,
+        inclusive: Tuple[bool, bool] = (True, True),
+        reverse: bool = False,
+    ) -> Iterator[_ScalarT]:
+        """Iterate over the values between minimum and maximum, like SortedList.irange. Use
+        range_values to get them as an array instead."""
+        values = self.range_values(minimum, maximum, inclusive)
+        return iter(values[::-1] if reverse else values)
+
+    def range_values(
+        self, minimum: Any = None, maximum: Any = None, inclusive: Tuple[bool, bool] = (True, True)
+    ) -> Any:
+        """Get a read-only view of the values between minimum and maximum as a NumPy array."""
+        start = 0
+        stop = self._len
+        if minimum is not None:
+            start = int(self._searchsorted(minimum, side="left" if inclusive[0] else "right"))
+        if maximum is not None:
+            stop = int(self._searchsorted(maximum, side="right" if inclusive[1] else "left"))
+        return self.values[start:stop]
+
+    @classmethod
+    def __get_pydantic_core_schema__(
+        cls, source_type: Any, handler: GetCoreSchemaHandler
+    ) -> core_schema.CoreSchema:
+        """
+        Returns pydantic_core.CoreSchema that defines how Pydantic should validate and
+        serialize this class.
+
+        - Validating from JSON: Validate as a list of numbers and sort them into an array
+        - Validating from Python, picking one branch up front from the input's type:
+            - If it's already a SortedArray of the same dtype, do nothing
+            - If it's a NumPy array or a SortedArray of another dtype, cast it to the dtype if
+              no values change, sorting it unless it's a SortedArray
+            - Otherwise, validate as a list of numbers and sort them into an array
+        - Serialization: Convert to a list
+        """
+        from sortedcontainers_pydantic import UnsupportedSourceTypeError
+
+        np = _import_numpy()
+        args = get_args(source_type)
+        dtype = None
+        if args:
+            try:
+                dtype = np.dtype(args[0])
+            except TypeError:
+                pass
+            if dtype is None or dtype.kind not in _NUMERIC_KINDS:
+                msg = (
+                    "SortedArray must be parametrized with an integer or float type, e.g., int, "
+                    f"float, or numpy.float32, got annotation '{source_type}'."
+                )
+                raise UnsupportedSourceTypeError(msg)
+        return _array_core_schema(cls, dtype, None)
+
+
+def _as_array(np: Any, iterable: Any, dtype: Any) -> Any:
+    """Convert an iterable of numbers to a new 1-dimensional array of the dtype, or of the dtype
+    inferred from the values if it's None, raising ValueError if any value would change."""
+    if not isinstance(iterable, (np.ndarray, Sequence)):
+        iterable = list(iterable)
+    source = np.asarray(iterable)
+    if source.ndim != 1:
+        raise ValueError(f"Values should be 1-dimensional, got {source.ndim} dimensions.")
+    return _cast(np, source, source.dtype if dtype is None else np.dtype(dtype))
+
+
+def _cast(np: Any, source: Any, dtype: Any) -> Any:
+    """Cast an array to a new array of a numeric dtype, raising ValueError if the source isn't
+    numeric or if integer values would change."""
+    if dtype.kind not in _NUMERIC_KINDS:
+        raise TypeError(f"dtype should be an integer or float dtype, got '{dtype}'.")
+    if len(source) and source.dtype.kind not in _NUMERIC_KINDS and source.dtype.kind != "O":
+        raise ValueError(f"Values should be numbers, got dtype '{source.dtype}'.")
+    try:
+        cast = source.astype(dtype)
+    except (OverflowError, TypeError, ValueError) as e:
+        raise ValueError(f"Values can't be stored as dtype '{dtype}'.") from e
+    if dtype.kind != "f" and not np.array_equal(cast, source):
+        raise ValueError(f"Values can't be stored as dtype '{dtype}' without changing.")
+    return cast
+
+
+def _to_index(result: Any) -> Any:
+    """Convert the result of searchsorted for a single value to an int."""
+    return int(result) if result.ndim == 0 else result
+
+
+def _restore_sorted_array(cls: Any, values: Any) -> Any:
+    """Create a SortedArray from its pickled values, which are in sorted order."""
+    return cls._from_sorted(values)
+
+
+def _array_core_schema(
+    cls: Any, dtype: Any, binary: Optional[BinaryFormat]
+) -> core_schema.CoreSchema:
+    """Build the core schema of a SortedArray class with a dtype, or with the dtype inferred
+    from the input if it's None, optionally also validating and serializing the binary format."""
+    from pydantic_core import core_schema
+
+    import sortedcontainers_pydantic
+    from sortedcontainers_pydantic import (
+        _count_branch,
+        _first_valid_schema,
+        _json_type,
+        _untagged_union_schema,
+    )
+
+    np = _import_numpy()
+
+    item_schema: core_schema.CoreSchema
+    if dtype is None:
+        item_schema = core_schema.union_schema(
+            [core_schema.int_schema(strict=True), core_schema.float_schema()]
+        )
+    elif dtype.kind == "f":
+        item_schema = core_schema.float_schema()
+    else:
+        # Validate the range of integers, so that the values are stored without changing
+        info = np.iinfo(dtype)
+        item_schema = core_schema.int_schema(ge=int(info.min), le=int(info.max))
+
+    def from_list(values: Any) -> Any:
+        array = np.array(values, dtype=dtype)
+        if array.dtype.kind not in _NUMERIC_KINDS:
+            raise ValueError("Input should be numbers that fit in 64 bits.")
+        array.sort()
+        return cls._from_sorted(array)
+
+    def from_array(value: Any) -> Any:
+        source = np.asarray(value)
+        if source.ndim != 1:
+            raise ValueError(f"Input should be 1-dimensional, got {source.ndim} dimensions.")
+        target = source.dtype if dtype is None else dtype
+        if target.kind not in _NUMERIC_KINDS:
+            raise ValueError(f"Input should be an array of numbers, got dtype '{target}'.")
+        array = _cast(np, source, target)
+        if not isinstance(value, SortedArray):
+            array.sort()
+        return cls._from_sorted(array)
+
+    list_schema = core_schema.list_schema(item_schema)
+    from_list_schema = core_schema.no_info_after_validator_function(
+        function=from_list, schema=list_schema
+    )
+    choices: Dict[str, core_schema.CoreSchema] = {
+        "instance": core_schema.any_schema(),
+        "array": core_schema.no_info_plain_validator_function(from_array),
+        "iterable": from_list_schema,
+    }
+    json_schema: core_schema.CoreSchema = from_list_schema
+    serialization: core_schema.SerSchema = core_schema.plain_serializer_function_ser_schema(
+        _to_list, return_schema=list_schema
+    )
+    if binary is not None:
+        from_binary_schema = _binary_validation_schema(cls, dtype, binary)
+        choices["mapping"] = from_binary_schema
+        json_schema = _first_valid_schema(
+            {"sequence": json_schema, "mapping": from_binary_schema}, _json_type
+        )
+        serialization = _binary_serialization_schema(binary)
+
+    name = cls.__name__
+    ndarray = np.ndarray
+    check_mapping = binary is not None
+
+    def input_branch(value: Any) -> str:
+        if isinstance(value, cls) and (dtype is None or value.dtype == dtype):
+            branch = "instance"
+        elif isinstance(value, (ndarray, SortedArray)):
+            branch = "array"
+        elif check_mapping and isinstance(value, dict):
+            branch = "mapping"
+        else:
+            branch = "iterable"
+        if sortedcontainers_pydantic._count_branches:
+            _count_branch(name, branch)
+        return branch
+
+    return core_schema.json_or_python_schema(
+        json_schema=json_schema,
+        python_schema=_untagged_union_schema(choices, input_branch),
+        serialization=serialization,
+        metadata={_ARRAY_METADATA_KEY: (cls, dtype)},
+    )
+
+
+def _to_list(value: SortedArray[Any]) -> Any:
+    return value.values.tolist()
+
+
+def _array_binary_schema(
+    source_type: Any, cls: Any, dtype: Any, binary: BinaryFormat
+) -> core_schema.CoreSchema:
+    """Build the core schema of a SortedArray class with BinaryFormat, which defaults to the
+    typecode of the array's dtype."""
+    from sortedcontainers_pydantic import BinaryFormat, UnsupportedSourceTypeError
+
+    if binary.dtype is None:
+        typecode = None if dtype is None else _BINARY_TYPECODES.get((dtype.kind, dtype.itemsize))
+        if typecode is None:
+            msg = (
+                "BinaryFormat needs a dtype for SortedArray without a dtype, got annotation "
+                f"'{source_type}'."
+            )
+            raise UnsupportedSourceTypeError(msg)
+        binary = BinaryFormat(typecode)
+    return _array_core_schema(cls, dtype, binary)
+
+
+def _binary_validation_schema(
+    cls: Any, dtype: Any, binary: BinaryFormat
+) -> core_schema.CoreSchema:
+    """Build the schema for input in the binary format, decoded with NumPy."""
+    import base64
+
+    from pydantic_core import core_schema
+
+    from sortedcontainers_pydantic import _FLOAT_TYPECODES, _INTEGER_TYPECODES
+
+    np = _import_numpy()
+    assert binary.dtype is not None
+    typecodes = _INTEGER_TYPECODES if binary.dtype in _INTEGER_TYPECODES else _FLOAT_TYPECODES
+    target = np.dtype(binary.dtype) if dtype is None else dtype
+
+    def from_binary(value: Dict[str, Any]) -> Any:
+        typecode = value["dtype"]
+        if typecode not in typecodes:
+            raise ValueError(
+                f"Input should have a dtype of {sorted(typecodes)}, got {typecode!r}."
+            )
+        data = value["data"]
+        data = base64.b64decode(data) if isinstance(data, str) else data
+        source_dtype = np.dtype(typecode).newbyteorder("<")
+        if len(data) % source_dtype.itemsize:
+            raise ValueError(f"Input data should be a multiple of {source_dtype.itemsize} bytes.")
+        source = np.frombuffer(data, dtype=source_dtype)
+        if len(source) != value["length"]:
+            raise ValueError(
+                f"Input should have {value['length']} values, got {len(source)} values."
+            )
+        array = _cast(np, source, target)
+        # Serialized values are in sorted order, so only sort if they aren't
+        if not (array[:-1] <= array[1:]).all():
+            array.sort()
+        return cls._from_sorted(array)
+
+    fields = {
+        "dtype": core_schema.typed_dict_field(core_schema.str_schema()),
+        "length": core_schema.typed_dict_field(core_schema.int_schema(ge=0)),
+        "data": core_schema.typed_dict_field(
+            core_schema.json_or_python_schema(
+                json_schema=core_schema.str_schema(),
+                python_schema=core_schema.union_schema(
+                    [core_schema.bytes_schema(), core_schema.str_schema()]
+                ),
+            )
+        ),
+    }
+    return core_schema.no_info_after_validator_function(
+        function=from_binary, schema=core_schema.typed_dict_schema(fields)
+    )
+
+
+def _binary_serialization_schema(binary: BinaryFormat) -> core_schema.SerSchema:
+    """Build the serializer that converts a SortedArray to the binary format."""
+    import base64
+
+    from pydantic_core import core_schema
+
+    np = _import_numpy()
+    typecode = binary.dtype
+    assert typecode is not None
+    little_endian = np.dtype(typecode).newbyteorder("<")
+
+    def to_binary(value: SortedArray[Any], info: core_schema.SerializationInfo) -> Dict[str, Any]:
+        data = value.values.astype(little_endian).tobytes()
+        return {
+            "dtype": typecode,
+            "length": len(value),
+            "data": base64.b64encode(data).decode("ascii") if info.mode_is_json() else data,
+        }
+
+    return core_schema.plain_serializer_function_ser_schema(to_binary, info_arg=True)
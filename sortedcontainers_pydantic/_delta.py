@@ -0,0 +1,270 @@
+"""Incremental changes to sorted containers, validated and applied without rebuilding them."""
+
+from __future__ import annotations
+
+from collections import Counter
+from functools import lru_cache
+import types
+from typing import (
+    TYPE_CHECKING,
+    Annotated,
+    Any,
+    Dict,
+    Generic,
+    List,
+    Literal,
+    Optional,
+    TypeVar,
+    Union,
+    get_args,
+    get_origin,
+)
+
+import sortedcontainers
+
+if TYPE_CHECKING:
+    from pydantic import BaseModel, GetCoreSchemaHandler, TypeAdapter
+    from pydantic_core import core_schema
+
+_C = TypeVar("_C")
+
+# Type of X | Y unions, on Python 3.10+
+_UnionType = getattr(types, "UnionType", Union)
+
+
+class Delta(Generic[_C]):
+    """Change to a sorted container, as values to add and remove for SortedList and SortedSet,
+    or items to set and keys to remove for SortedDict.
+
+    Use it parametrized with the container type, e.g., Delta[SortedSet[int]] or
+    Delta[Annotated[SortedDict[str, int], Key(...)]], to validate changes like
+    {"add": [...], "remove": [...]} or {"set": {...}, "remove": [...]} against the container's
+    item schemas. Both fields are optional. Applying a change of k values to a container of n
+    values takes O(k log n) time instead of rebuilding the container.
+    """
+
+    # Not a dataclass, since Pydantic builds its own schema for parametrized generic dataclasses
+
+    def __init__(
+        self,
+        add: Optional[List[Any]] = None,
+        remove: Optional[List[Any]] = None,
+        set: Optional[Dict[Any, Any]] = None,
+    ):
+        self.add = [] if add is None else add
+        self.remove = [] if remove is None else remove
+        self.set = {} if set is None else set
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(add={self.add!r}, remove={self.remove!r}, set={self.set!r})"
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Delta):
+            return NotImplemented
+        return (self.add, self.remove, self.set) == (other.add, other.remove, other.set)
+
+    def __bool__(self) -> bool:
+        return bool(self.add or self.remove or self.set)
+
+    def apply(self, container: _C) -> _C:
+        """Apply the change to the container in place and return it. Values or keys to remove
+        that aren't in the container are ignored. Removals are applied before additions."""
+        target: Any = container
+        if isinstance(target, sortedcontainers.SortedDict):
+            for key in self.remove:
+                if key in target:
+                    del target[key]
+            target.update(self.set)
+        elif isinstance(target, sortedcontainers.SortedSet):
+            target.difference_update(self.remove)
+            target.update(self.add)
+        else:
+            for value in self.remove:
+                target.discard(value)
+            target.update(self.add)
+        return container
+
+    @classmethod
+    def between(cls, old: Any, new: Any) -> Delta[Any]:
+        """Get the change from one container to another of the same type. Values of SortedDict
+        containers are compared by equality, and SortedList values must be hashable. None, like
+        an Optional field that isn't set, is treated as an empty container, so the change from
+        None adds every value and the change to None removes every value."""
+        container = old if new is None else new
+        if old is None or new is None:
+            # Treat None as an empty container of the other container's type
+            empty: Any = {} if isinstance(container, sortedcontainers.SortedDict) else ()
+            old = empty if old is None else old
+            new = empty if new is None else new
+        if isinstance(container, sortedcontainers.SortedDict):
+            return cls(
+                remove=[key for key in old if key not in new],
+                set={
+                    key: value for key, value in new.items() if key not in old or old[key] != value
+                },
+            )
+        if isinstance(container, sortedcontainers.SortedSet):
+            return cls(
+                add=[value for value in new if value not in old],
+                remove=[value for value in old if value not in new],
+            )
+        old_counts = Counter(old)
+        new_counts = Counter(new)
+        return cls(
+            add=list((new_counts - old_counts).elements()),
+            remove=list((old_counts - new_counts).elements()),
+        )
+
+    @classmethod
+    def __get_pydantic_core_schema__(
+        cls, source_type: Any, handler: GetCoreSchemaHandler
+    ) -> core_schema.CoreSchema:
+        from pydantic_core import core_schema
+
+        from sortedcontainers_pydantic import UnsupportedSourceTypeError, _get_spec
+
+        args = get_args(source_type)
+        spec = _get_spec(handler.generate_schema(args[0])) if args else None
+        if spec is None:
+            msg = (
+                "Delta must be parametrized with a sortedcontainers_pydantic class or annotation, "
+                f"got annotation '{source_type}'."
+            )
+            raise UnsupportedSourceTypeError(msg)
+
+        fields: Dict[str, core_schema.TypedDictField]
+        if issubclass(spec.cls, sortedcontainers.SortedDict):
+            if spec.args:
+                key_schema = handler.generate_schema(spec.args[0])
+                value_schema = handler.generate_schema(spec.args[1])
+            else:
+                key_schema = value_schema = core_schema.any_schema()
+            fields = {
+                "set": core_schema.typed_dict_field(
+                    core_schema.dict_schema(key_schema, value_schema), required=False
+                ),
+                "remove": core_schema.typed_dict_field(
+                    core_schema.list_schema(key_schema), required=False
+                ),
+            }
+        else:
+            if spec.args:
+                item_schema = handler.generate_schema(spec.args[0])
+            else:
+                item_schema = core_schema.any_schema()
+            fields = {
+                "add": core_schema.typed_dict_field(
+                    core_schema.list_schema(item_schema), required=False
+                ),
+                "remove": core_schema.typed_dict_field(
+                    core_schema.list_schema(item_schema), required=False
+                ),
+            }
+        names = tuple(fields)
+
+        def to_delta(value: Dict[str, Any]) -> Delta[Any]:
+            return cls(**value)
+
+        def to_dict(value: Delta[Any]) -> Dict[str, Any]:
+            return {name: getattr(value, name) for name in names}
+
+        delta_dict_schema = core_schema.typed_dict_schema(fields, extra_behavior="forbid")
+        from_dict_schema = core_schema.no_info_after_validator_function(
+            function=to_delta, schema=delta_dict_schema
+        )
+        return core_schema.json_or_python_schema(
+            json_schema=from_dict_schema,
+            python_schema=core_schema.tagged_union_schema(
+                {"instance": core_schema.is_instance_schema(cls), "mapping": from_dict_schema},
+                discriminator=lambda value: "instance" if isinstance(value, cls) else "mapping",
+            ),
+            serialization=core_schema.plain_serializer_function_ser_schema(
+                to_dict, return_schema=delta_dict_schema
+            ),
+        )
+
+
+class Snapshot:
+    """Snapshot of the sorted container fields of a Pydantic model instance, for getting or
+    dumping only the changes made to them since. Fields annotated with a union of a sorted
+    container type and other types, like Optional[SortedList[int]], are included, and None is
+    treated as an empty container, as in Delta.between.
+
+    Containers are copied shallowly, so SortedDict values changed in place aren't detected.
+    """
+
+    def __init__(self, model: BaseModel):
+        self.model_type = type(model)
+        self.containers = {
+            name: None if value is None else value.copy()
+            for name, value in model
+            if _get_delta_adapter(self.model_type, name) is not None
+        }
+
+    def delta(self, model: BaseModel) -> Dict[str, Delta[Any]]:
+        """Get the changes to the model's sorted container fields since the snapshot, for
+        fields that have changed."""
+        if type(model) is not self.model_type:
+            raise TypeError(
+                f"Expected an instance of {self.model_type.__name__}, got {type(model).__name__}."
+            )
+        deltas = {}
+        for name, old in self.containers.items():
+            delta: Delta[Any] = Delta.between(old, getattr(model, name))
+            if delta:
+                deltas[name] = delta
+        return deltas
+
+    def dump_delta(
+        self, model: BaseModel, *, mode: Literal["json", "python"] = "python"
+    ) -> Dict[str, Any]:
+        """Dump the changes to the model's sorted container fields since the snapshot, like
+        model_dump, as {"add": [...], "remove": [...]} or {"set": {...}, "remove": [...]} for
+        each field that has changed. Each change can be validated with Delta and applied to
+        the field of another instance."""
+        deltas = {}
+        for name, delta in self.delta(model).items():
+            adapter = _get_delta_adapter(self.model_type, name)
+            assert adapter is not None
+            deltas[name] = adapter.dump_python(delta, mode=mode)
+        return deltas
+
+
+@lru_cache(maxsize=None)
+def _get_delta_adapter(model_type: Any, name: str) -> Optional[TypeAdapter[Any]]:
+    """Get the adapter of changes to a field, for the sorted container type in its annotation,
+    or None if it has no sorted container type."""
+    from pydantic import TypeAdapter
+
+    from sortedcontainers_pydantic import UnsupportedSourceTypeError
+
+    field = model_type.model_fields.get(name)
+    if field is None:
+        return None
+    for annotation in _union_members(field.rebuild_annotation()):
+        try:
+            return TypeAdapter(Delta[annotation])  # type: ignore[valid-type]
+        except UnsupportedSourceTypeError:
+            continue
+    return None
+
+
+def _union_members(annotation: Any) -> List[Any]:
+    """Get the members of a union annotation other than None, including those of nested unions
+    and of unions in Annotated, which keep the Annotated metadata, or the annotation itself if
+    it isn't a union."""
+    origin = get_origin(annotation)
+    if origin is Annotated:
+        inner, *metadata = get_args(annotation)
+        return [
+            member if member is inner else Annotated[(member, *metadata)]
+            for member in _union_members(inner)
+        ]
+    if origin is Union or origin is _UnionType:
+        return [
+            member
+            for arg in get_args(annotation)
+            if arg is not type(None)
+            for member in _union_members(arg)
+        ]
+    return [annotation]
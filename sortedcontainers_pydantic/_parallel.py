@@ -0,0 +1,110 @@
+"""Parallel validation of many JSON payloads across processes or threads."""
+
+from __future__ import annotations
+
+from functools import lru_cache
+import os
+import sys
+from typing import TYPE_CHECKING, Any, List, Optional, Sequence, Union
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+    from pydantic import TypeAdapter
+
+
+def validate_json_many(
+    type_: Any,
+    payloads: Sequence[Union[str, bytes, bytearray]],
+    *,
+    max_workers: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+    executor: Optional[Executor] = None,
+) -> List[Any]:
+    """Validate many independent JSON payloads against a type in parallel, returning the results
+    in the same order as the payloads. Payloads that fail validation have their ValidationError
+    in place of a result instead of stopping the whole batch.
+
+    The type can be any type supported by Pydantic's TypeAdapter, e.g., SortedList[int] or a
+    model with sorted container fields, and must be picklable to be validated in other
+    processes. Payloads are split into chunks of chunk_size payloads, and each chunk is
+    validated in a worker with a TypeAdapter that's created once per worker. Workers are
+    threads on free-threaded Python builds with the GIL disabled, and processes otherwise, up to
+    max_workers at once (by default, the number of CPUs). Validated sorted containers are
+    pickled back from worker processes as their internal sorted sublists, so they aren't sorted
+    again. An executor can be passed instead to control the pool, and with max_workers=1,
+    payloads are validated in the current thread.
+    """
+    payloads = list(payloads)
+    if executor is None and max_workers is None:
+        max_workers = os.cpu_count() or 1
+    if max_workers is not None and max_workers < 1:
+        raise ValueError(f"max_workers must be positive, got {max_workers}.")
+    if chunk_size is None:
+        # A few chunks per worker balances the load while amortizing the cost of each task
+        workers = max_workers or os.cpu_count() or 1
+        chunk_size = max(1, -(-len(payloads) // (workers * 4)))
+    elif chunk_size < 1:
+        raise ValueError(f"chunk_size must be positive, got {chunk_size}.")
+
+    if executor is None and (max_workers == 1 or len(payloads) <= chunk_size):
+        return _validate_chunk(type_, payloads)
+    chunks = [payloads[pos : pos + chunk_size] for pos in range(0, len(payloads), chunk_size)]
+    if executor is not None:
+        return _map_chunks(executor, type_, chunks)
+
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+    pool: Executor
+    if _is_gil_disabled():
+        pool = ThreadPoolExecutor(max_workers=max_workers)
+    else:
+        pool = ProcessPoolExecutor(max_workers=max_workers)
+    with pool:
+        return _map_chunks(pool, type_, chunks)
+
+
+def _map_chunks(executor: Executor, type_: Any, chunks: List[List[Any]]) -> List[Any]:
+    results = []
+    for chunk_results in executor.map(_validate_chunk, [type_] * len(chunks), chunks):
+        results.extend(chunk_results)
+    return results
+
+
+def _validate_chunk(type_: Any, payloads: List[Union[str, bytes, bytearray]]) -> List[Any]:
+    """Validate a chunk of JSON payloads, returning errors in place of results."""
+    from pydantic import ValidationError
+
+    validate_json = _get_adapter(type_).validate_json
+    results: List[Any] = []
+    for payload in payloads:
+        try:
+            results.append(validate_json(payload))
+        except ValidationError as e:
+            results.append(e)
+    return results
+
+
+def _get_adapter(type_: Any) -> TypeAdapter[Any]:
+    """Get a TypeAdapter for the type, reusing it across chunks in the same worker if the type
+    is hashable."""
+    try:
+        hash(type_)
+    except TypeError:
+        from pydantic import TypeAdapter
+
+        return TypeAdapter(type_)
+    return _get_cached_adapter(type_)
+
+
+@lru_cache(maxsize=128)
+def _get_cached_adapter(type_: Any) -> TypeAdapter[Any]:
+    from pydantic import TypeAdapter
+
+    return TypeAdapter(type_)
+
+
+def _is_gil_disabled() -> bool:
+    """Check if running on a free-threaded build of Python with the GIL disabled."""
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return is_gil_enabled is not None and not is_gil_enabled()
@@ -0,0 +1,334 @@
+"""Streaming validation of large JSON arrays and objects into sorted containers."""
+
+from __future__ import annotations
+
+import codecs
+from dataclasses import replace
+import re
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Tuple,
+    Union,
+)
+
+import sortedcontainers
+
+if TYPE_CHECKING:
+    from pydantic import TypeAdapter
+
+_DEFAULT_CHUNK_SIZE = 1 << 16
+_DEFAULT_BATCH_SIZE = 10_000
+
+# Structural tokens of JSON. Strings are matched whole so that brackets and commas inside them
+# are skipped, and a lone quote starts a string that continues in the next chunk.
+_TOKEN_PATTERN = re.compile(r'"(?:[^"\\]|\\.)*"|"|[\[\]{},]', re.DOTALL)
+_NON_WHITESPACE_PATTERN = re.compile(r"\S")
+
+
+def validate_json_stream(
+    type_: Any,
+    stream: Any,
+    *,
+    batch_size: int = _DEFAULT_BATCH_SIZE,
+    chunk_size: int = _DEFAULT_CHUNK_SIZE,
+) -> Any:
+    """Validate a JSON array, or a JSON object for SortedDict, read incrementally from a stream
+    into a sorted container, without materializing the whole input.
+
+    The stream can be a binary or text file-like object, or an iterable of bytes or str chunks.
+    The type can be any sortedcontainers_pydantic class or annotation, e.g., SortedList[int] or
+    Annotated[SortedDict[str, int], Key(...)]. The stream is read chunk_size bytes or characters
+    at a time, and the text of every batch_size values is validated in JSON mode against the
+    item schema, so peak memory is proportional to the container plus one batch. Validated
+    values are bulk-loaded into the container at the end or, with MaxItems, added to the bounded
+    container after every batch. Validation error locations are indices into the whole array, or
+    keys for objects.
+
+    Invalid JSON raises a ValidationError with a json_invalid error, like validate_json, and a
+    batch_size that isn't positive raises a ValueError.
+    """
+    validator = _StreamValidator(type_, batch_size)
+    for chunk in _iter_chunks(stream, chunk_size):
+        for batch in validator.split(chunk):
+            validator.add(batch)
+    return validator.finish()
+
+
+async def validate_json_stream_async(
+    type_: Any,
+    stream: Any,
+    *,
+    batch_size: int = _DEFAULT_BATCH_SIZE,
+    chunk_size: int = _DEFAULT_CHUNK_SIZE,
+) -> Any:
+    """Validate a JSON array, or a JSON object for SortedDict, read incrementally from an
+    asyncio stream into a sorted container, without materializing the whole input.
+
+    The stream can be an asyncio.StreamReader or any object with an async read method, or an
+    async iterable of bytes or str chunks. Otherwise, this works like validate_json_stream, and
+    control is returned to the event loop after every validated batch so that validating a
+    large input doesn't block other tasks for long.
+    """
+    import asyncio
+
+    validator = _StreamValidator(type_, batch_size)
+    async for chunk in _aiter_chunks(stream, chunk_size):
+        for batch in validator.split(chunk):
+            validator.add(batch)
+            await asyncio.sleep(0)
+    return validator.finish()
+
+
+class _StreamValidator:
+    """Validates batches of a JSON array or object split from text chunks and collects the
+    values into a sorted container."""
+
+    def __init__(self, type_: Any, batch_size: int):
+        from pydantic import TypeAdapter
+
+        from sortedcontainers_pydantic import UnsupportedSourceTypeError, _FrozenMixin, _get_spec
+
+        spec = _get_spec(TypeAdapter(type_).core_schema)
+        if spec is None:
+            raise UnsupportedSourceTypeError(
+                "Expected a sortedcontainers_pydantic class or annotation, "
+                f"got annotation '{type_}'."
+            )
+        if batch_size < 1:
+            raise ValueError(f"batch_size must be positive, got {batch_size}.")
+        self.spec = spec
+        self.frozen = issubclass(spec.cls, _FrozenMixin)
+
+        self.adapter: TypeAdapter[Any]
+        if issubclass(spec.cls, sortedcontainers.SortedDict):
+            key_type, value_type = spec.args or (Any, Any)
+            self.adapter = TypeAdapter(Dict[key_type, value_type])  # type: ignore[valid-type]
+            self.splitter = _BatchSplitter("{", batch_size)
+            self.values: Any = {}
+            self.add_values = self.values.update
+        else:
+            item_type = spec.args[0] if spec.args else Any
+            self.adapter = TypeAdapter(List[item_type])  # type: ignore[valid-type]
+            self.splitter = _BatchSplitter("[", batch_size)
+            if issubclass(spec.cls, sortedcontainers.SortedSet) and spec.presorted is None:
+                # Drop duplicates while reading instead of keeping them until the end. Presorted
+                # values are checked in the order read, so they're kept in a list
+                self.values = set()
+                self.add_values = self.values.update
+            else:
+                self.values = []
+                self.add_values = self.values.extend
+        if spec.max_items is not None:
+            # Keep only the selected items while reading instead of collecting every value. Frozen
+            # containers can't be added to, so their mutable counterpart is used until the end
+            if self.frozen:
+                self.values = replace(spec, cls=spec.cls._mutable_cls).constructor()()
+            else:
+                self.values = spec.constructor()()
+            self.add_values = self.values.update
+        self.start = 0
+
+    def split(self, text: str) -> List[Tuple[str, int]]:
+        try:
+            return self.splitter.feed(text)
+        except _JSONSyntaxError as e:
+            raise self.json_invalid(e) from None
+
+    def add(self, batch: Tuple[str, int]) -> None:
+        """Validate the text of a batch, offsetting error locations by the batch's start index."""
+        from pydantic import ValidationError
+
+        from sortedcontainers_pydantic import _relocate_errors
+
+        text, count = batch
+        try:
+            self.add_values(self.adapter.validate_json(text))
+        except ValidationError as e:
+            start = self.start
+
+            def relocate(loc: Tuple[Union[int, str], ...]) -> Tuple[Union[int, str], ...]:
+                if loc and isinstance(loc[0], int):
+                    return (loc[0] + start, *loc[1:])
+                return loc
+
+            raise _relocate_errors(e, relocate) from None
+        self.start += count
+
+    def json_invalid(self, error: _JSONSyntaxError) -> Exception:
+        """Get the validation error for invalid JSON structure, like validate_json raises."""
+        from pydantic import ValidationError
+
+        line_error = {
+            "type": "json_invalid",
+            "loc": (),
+            "input": error.text,
+            "ctx": {"error": str(error)},
+        }
+        title = self.adapter.validator.title
+        return ValidationError.from_exception_data(title, [line_error])  # type: ignore[list-item]
+
+    def finish(self) -> Any:
+        from pydantic import ValidationError
+
+        try:
+            self.splitter.close()
+        except _JSONSyntaxError as e:
+            raise self.json_invalid(e) from None
+        if self.spec.max_items is not None and not self.frozen and self.spec.load_factor is None:
+            return self.values
+        try:
+            return self.spec.from_values()(self.values)
+        except ValueError as e:
+            # Raised for values that aren't sorted with Presorted(strict=True), which validating
+            # the whole input at once reports as a validation error
+            error = {"type": "value_error", "loc": (), "input": self.values, "ctx": {"error": e}}
+            title = self.adapter.validator.title
+            raise ValidationError.from_exception_data(title, [error]) from None  # type: ignore[list-item]
+
+
+def _iter_chunks(stream: Any, chunk_size: int) -> Iterator[str]:
+    """Iterate over text chunks of a file-like object or iterable of bytes or str chunks,
+    decoding bytes as UTF-8."""
+    raw_chunks: Iterable[Union[bytes, str]]
+    if hasattr(stream, "read"):
+        raw_chunks = iter(lambda: stream.read(chunk_size), stream.read(0))
+    else:
+        raw_chunks = stream
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    for chunk in raw_chunks:
+        text = decoder.decode(chunk) if isinstance(chunk, bytes) else chunk
+        if text:
+            yield text
+    text = decoder.decode(b"", final=True)
+    if text:
+        yield text
+
+
+async def _aiter_chunks(stream: Any, chunk_size: int) -> AsyncIterator[str]:
+    """Iterate over text chunks of an asyncio stream or async iterable of bytes or str chunks,
+    decoding bytes as UTF-8."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    if hasattr(stream, "read"):
+        while True:
+            chunk = await stream.read(chunk_size)
+            if not chunk:
+                break
+            text = decoder.decode(chunk) if isinstance(chunk, bytes) else chunk
+            if text:
+                yield text
+    else:
+        async for chunk in stream:
+            text = decoder.decode(chunk) if isinstance(chunk, bytes) else chunk
+            if text:
+                yield text
+    text = decoder.decode(b"", final=True)
+    if text:
+        yield text
+
+
+class _JSONSyntaxError(ValueError):
+    """Invalid JSON structure found while splitting, with the text being scanned."""
+
+    def __init__(self, message: str, text: str):
+        super().__init__(message)
+        self.text = text
+
+
+class _BatchSplitter:
+    """Splits a top-level JSON array or object fed in text chunks into batches of batch_size
+    items or members, as the text of each batch wrapped in brackets and its number of items.
+
+    Only the structure is scanned here, and invalid structure raises a _JSONSyntaxError. The
+    items themselves are parsed by pydantic-core when the batch is validated, which also reports
+    any invalid JSON within them.
+    """
+
+    def __init__(self, opening: str, batch_size: int):
+        self.opening = opening
+        self.closing = "]" if opening == "[" else "}"
+        self.batch_size = batch_size
+        self.buffer = ""
+        self.started = False
+        self.done = False
+        self.start = 0  # Start of the current batch's text in the buffer
+        self.pos = 0  # Position to resume scanning from
+        self.depth = 1
+        self.count = 0  # Number of complete items in the current batch
+        self.item_start = 0  # Start of the current item's text in the buffer
+        self.empty = True  # Whether no items have been split off yet
+
+    def feed(self, text: str) -> List[Tuple[str, int]]:
+        if self.done:
+            if text.strip():
+                raise _JSONSyntaxError("unexpected data after the top level", text)
+            return []
+        buffer = self.buffer + text
+        if not self.started:
+            buffer = buffer.lstrip()
+            if not buffer:
+                return []
+            if buffer[0] != self.opening:
+                raise _JSONSyntaxError(f"expected {self.opening!r}, found {buffer[0]!r}", buffer)
+            self.started = True
+            self.start = self.pos = self.item_start = 1
+
+        batches = []
+        opening, closing, batch_size = self.opening, self.closing, self.batch_size
+        start, pos, depth, count = self.start, self.pos, self.depth, self.count
+        item_start, empty = self.item_start, self.empty
+        for match in _TOKEN_PATTERN.finditer(buffer, pos):
+            token = match.group()
+            if token == '"':
+                # Unterminated string, so scan it again once more text is read
+                pos = match.start()
+                break
+            pos = match.end()
+            if token == ",":
+                if depth == 1:
+                    # Items are only parsed when their batch is validated, so check here that
+                    # there is an item before the comma, which a batch boundary would hide
+                    if not _NON_WHITESPACE_PATTERN.search(buffer, item_start, pos - 1):
+                        raise _JSONSyntaxError("expected a value, found ','", buffer)
+                    item_start = pos
+                    empty = False
+                    count += 1
+                    if count == batch_size:
+                        batches.append((opening + buffer[start : pos - 1] + closing, count))
+                        start = pos
+                        count = 0
+            elif token in "[{":
+                depth += 1
+            elif token in "]}":
+                depth -= 1
+                if depth == 0:
+                    if token != closing:
+                        raise _JSONSyntaxError(f"expected {closing!r}, found {token!r}", buffer)
+                    if not _NON_WHITESPACE_PATTERN.search(buffer, item_start, pos - 1):
+                        # Only an empty array or object has no last item
+                        if not empty:
+                            raise _JSONSyntaxError(f"expected a value, found {token!r}", buffer)
+                    else:
+                        batches.append((opening + buffer[start : pos - 1] + closing, count + 1))
+                    if buffer[pos:].strip():
+                        raise _JSONSyntaxError("unexpected data after the top level", buffer)
+                    self.done = True
+                    self.buffer = ""
+                    return batches
+        else:
+            pos = len(buffer)
+        # Drop the text of batches already split off
+        self.buffer = buffer[start:]
+        self.start, self.pos, self.depth, self.count = 0, pos - start, depth, count
+        self.item_start, self.empty = item_start - start, empty
+        return batches
+
+    def close(self) -> None:
+        if not self.done:
+            expected = self.closing if self.started else self.opening
+            raise _JSONSyntaxError(f"expected {expected!r}, found end of input", self.buffer)
@@ -1,6 +1,28 @@
-from typing import Annotated, Callable, Dict, Iterable, List, Optional, Set
-
-from pydantic import BaseModel, TypeAdapter
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import copy
+import importlib.metadata
+import io
+import json
+import operator
+import pickle
+import random
+import subprocess
+import sys
+from typing import Annotated, Callable, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from pydantic import (
+    AfterValidator,
+    BaseModel,
+    ConfigDict,
+    Field,
+    PlainSerializer,
+    TypeAdapter,
+    ValidationError,
+    ValidationInfo,
+    create_model,
+)
+from pydantic_core import PydanticCustomError, PydanticSerializationError
 import pytest
 import sortedcontainers as sc
 
@@ -159,7 +181,7 @@ def test_sorted_dict():
 
 
 def test_sorted_dict_with_key():
-    expected = sc.SortedDict({"c": 1, "a": 2, "b": 3}, key=lambda x: -x)
+    expected = sc.SortedDict(lambda x: -ord(x), {"c": 1, "a": 2, "b": 3})
 
     annotations = (
         # sortedcontainers_pydantic subclass
@@ -174,21 +196,32 @@ def test_sorted_dict_with_key():
     )
 
     for annotation in annotations:
-        ta = TypeAdapter(Annotated[annotation, sc_p.Key(lambda x: -x)])
-
-        ta.validate_python({"c": 1, "a": 2, "b": 3}) == expected
-        tuple(ta.validate_python([("c", 1), ("a", 2), ("b", 3)]).keys()) == ("c", "b", "a")
-        ta.validate_python({"c": 1.0, "a": 2.0, "b": 3.0}) == expected
+        ta = TypeAdapter(Annotated[annotation, sc_p.Key(lambda x: -ord(x))])
+
+        actual = ta.validate_python({"c": 1, "a": 2, "b": 3})
+        assert actual == expected
+        assert tuple(actual.keys()) == ("c", "b", "a")
+        assert actual.key is not None
+        assert tuple(ta.validate_python([("c", 1), ("a", 2), ("b", 3)]).keys()) == ("c", "b", "a")
+        assert tuple(ta.validate_python(sc.SortedDict({"c": 1, "a": 2, "b": 3}))) == (
+            "c",
+            "b",
+            "a",
+        )
 
         # Wrap in Optional
-        ta = TypeAdapter(Optional[Annotated[annotation, sc_p.Key(lambda x: -x)]])
-        ta.validate_python({"c": 1, "a": 2, "b": 3}) == expected
-        tuple(ta.validate_python([("c", 1), ("a", 2), ("b", 3)]).keys()) == ("c", "b", "a")
+        ta = TypeAdapter(Optional[Annotated[annotation, sc_p.Key(lambda x: -ord(x))]])
+        assert ta.validate_python({"c": 1, "a": 2, "b": 3}) == expected
+        assert tuple(ta.validate_python([("c", 1), ("a", 2), ("b", 3)]).keys()) == ("c", "b", "a")
         assert ta.validate_python(None) is None
 
         # Wrap in list
-        ta = TypeAdapter(list[Annotated[annotation, sc_p.Key(lambda x: -x)]])
-        ta.validate_python([{"c": 1, "a": 2, "b": 3}]) == [expected]
+        ta = TypeAdapter(list[Annotated[annotation, sc_p.Key(lambda x: -ord(x))]])
+        assert ta.validate_python([{"c": 1, "a": 2, "b": 3}]) == [expected]
+
+    # Coerces values with type arguments
+    ta = TypeAdapter(Annotated[sc_p.SortedDict[str, int], sc_p.Key(lambda x: -ord(x))])
+    assert ta.validate_python({"c": 1.0, "a": 2.0, "b": 3.0}) == expected
 
 
 def test_sorted_list():
@@ -314,17 +347,17 @@ def test_sorted_list_with_key():
     for annotation in annotations:
         ta = TypeAdapter(Annotated[annotation, sc_p.Key(lambda x: -x)])
 
-        ta.validate_python([3, 1, 2]) == expected
-        tuple(ta.validate_python([3, 1, 2])) == (3, 2, 1)
+        assert ta.validate_python([3, 1, 2]) == expected
+        assert tuple(ta.validate_python([3, 1, 2])) == (3, 2, 1)
 
         # Wrap in Optional
         ta = TypeAdapter(Optional[Annotated[annotation, sc_p.Key(lambda x: -x)]])
-        ta.validate_python([3, 1, 2]) == expected
+        assert ta.validate_python([3, 1, 2]) == expected
         assert ta.validate_python(None) is None
 
         # Wrap in list
         ta = TypeAdapter(list[Annotated[annotation, sc_p.Key(lambda x: -x)]])
-        ta.validate_python([[3, 1, 2]]) == [expected]
+        assert ta.validate_python([[3, 1, 2]]) == [expected]
 
 
 def test_sorted_set():
@@ -450,17 +483,1595 @@ def test_sorted_set_with_key():
     for annotation in annotations:
         ta = TypeAdapter(Annotated[annotation, sc_p.Key(lambda x: -x)])
 
-        ta.validate_python([3, 1, 2]) == expected
-        tuple(ta.validate_python([3, 1, 2])) == (3, 2, 1)
+        assert ta.validate_python([3, 1, 2]) == expected
+        assert tuple(ta.validate_python([3, 1, 2])) == (3, 2, 1)
 
         # Wrap in Optional
         ta = TypeAdapter(Optional[Annotated[annotation, sc_p.Key(lambda x: -x)]])
-        ta.validate_python([3, 1, 2]) == expected
+        assert ta.validate_python([3, 1, 2]) == expected
         assert ta.validate_python(None) is None
 
         # Wrap in list
         ta = TypeAdapter(list[Annotated[annotation, sc_p.Key(lambda x: -x)]])
-        ta.validate_python([[3, 1, 2]]) == [expected]
+        assert ta.validate_python([[3, 1, 2]]) == [expected]
+
+
+def test_key_builds_container_in_one_pass():
+    # Values that can't be compared to each other can only be sorted using the key, so this
+    # only works if validated values are passed directly into the keyed container
+    values = [3 + 4j, 1 + 0j, 0 + 2j]
+    for annotation in (
+        sc_p.SortedList,
+        sc_p.SortedSet,
+        Annotated[sc.SortedList, sc_p.SortedListPydanticAnnotation],
+        Annotated[sc.SortedSet, sc_p.SortedSetPydanticAnnotation],
+    ):
+        ta = TypeAdapter(Annotated[annotation, sc_p.Key(abs)])
+        actual = ta.validate_python(values)
+        assert list(actual) == [1 + 0j, 0 + 2j, 3 + 4j]
+        assert actual.key is abs
+
+    for annotation in (
+        sc_p.SortedDict,
+        Annotated[sc.SortedDict, sc_p.SortedDictPydanticAnnotation],
+    ):
+        ta = TypeAdapter(Annotated[annotation, sc_p.Key(abs)])
+        actual = ta.validate_python({v: str(v) for v in values})
+        assert list(actual) == [1 + 0j, 0 + 2j, 3 + 4j]
+        assert actual.key is abs
+
+    # Using Key with our SortedList returns our SortedKeyList
+    actual = TypeAdapter(Annotated[sc_p.SortedList[int], sc_p.Key(abs)]).validate_python([-3, 2])
+    assert isinstance(actual, sc_p.SortedKeyList)
+    assert list(actual) == [2, -3]
+
+    # Also when Key follows another annotation that hides the container type from it
+    actual = TypeAdapter(
+        Annotated[sc_p.SortedList[int], AfterValidator(lambda v: v), sc_p.Key(abs)]
+    ).validate_python([-3, 2])
+    assert isinstance(actual, sc_p.SortedKeyList)
+    assert list(actual) == [2, -3]
+
+    # An existing instance without the key is re-sorted with the key
+    ta = TypeAdapter(Annotated[sc_p.SortedList, sc_p.Key(lambda x: -x)])
+    assert list(ta.validate_python(sc_p.SortedList([1, 3, 2]))) == [3, 2, 1]
+
+
+def test_presorted():
+    for annotation, sorted_input, unsorted_input, expected in (
+        (sc_p.SortedList[int], [1, 2, 2, 3], [2, 1, 3, 2], [1, 2, 2, 3]),
+        (sc_p.AnnotatedSortedList[int], [1, 2, 2, 3], [2, 1, 3, 2], [1, 2, 2, 3]),
+        (
+            Annotated[sc.SortedList, sc_p.SortedListPydanticAnnotation],
+            [1, 2, 2, 3],
+            [2, 1, 3, 2],
+            [1, 2, 2, 3],
+        ),
+        (sc_p.SortedSet[int], [1, 2, 2, 3], [2, 1, 3, 2], [1, 2, 3]),
+        (sc_p.AnnotatedSortedSet[int], [1, 2, 2, 3], [2, 1, 3, 2], [1, 2, 3]),
+        (sc_p.SortedDict[str, int], {"a": 1, "b": 2}, {"b": 2, "a": 1}, ["a", "b"]),
+        (
+            sc_p.AnnotatedSortedDict[str, int],
+            [("a", 1), ("b", 2)],
+            [("b", 2), ("a", 1)],
+            ["a", "b"],
+        ),
+    ):
+        ta = TypeAdapter(Annotated[annotation, sc_p.Presorted()])
+        for case in (sorted_input, unsorted_input):
+            actual = ta.validate_python(case)
+            actual._check()
+            assert list(actual) == expected
+        # Dicts are also validated to the same container as without Presorted
+        assert ta.validate_python(sorted_input) == TypeAdapter(annotation).validate_python(
+            sorted_input
+        )
+
+        strict_ta = TypeAdapter(Annotated[annotation, sc_p.Presorted(strict=True)])
+        assert list(strict_ta.validate_python(sorted_input)) == expected
+        with pytest.raises(ValidationError, match="out of order"):
+            strict_ta.validate_python(unsorted_input)
+
+    # Loads input larger than the load factor into multiple sublists
+    ta = TypeAdapter(Annotated[sc_p.SortedList[int], sc_p.Presorted(strict=True)])
+    actual = ta.validate_python(range(5000))
+    actual._check()
+    assert len(actual._lists) == 5
+    assert list(actual) == list(range(5000))
+    assert ta.validate_json("[1, 2, 3]") == sc.SortedList([1, 2, 3])
+
+    # Works with Key, in either order, checking order by key
+    for annotation in (
+        Annotated[sc_p.SortedList[int], sc_p.Key(lambda x: -x), sc_p.Presorted(strict=True)],
+        Annotated[sc_p.SortedList[int], sc_p.Presorted(strict=True), sc_p.Key(lambda x: -x)],
+    ):
+        ta = TypeAdapter(annotation)
+        actual = ta.validate_python(range(2500, 0, -1))
+        actual._check()
+        assert isinstance(actual, sc_p.SortedKeyList)
+        assert list(actual) == list(range(2500, 0, -1))
+        with pytest.raises(ValidationError):
+            ta.validate_python([1, 2])
+
+    ta = TypeAdapter(Annotated[sc_p.SortedSet[int], sc_p.Key(lambda x: -x), sc_p.Presorted()])
+    actual = ta.validate_python([1, 3, 2, 3])
+    actual._check()
+    assert list(actual) == [3, 2, 1]
+
+    ta = TypeAdapter(
+        Annotated[sc_p.SortedDict[str, int], sc_p.Key(lambda x: -ord(x)), sc_p.Presorted()]
+    )
+    actual = ta.validate_python({"c": 1, "b": 2, "a": 3})
+    actual._check()
+    assert list(actual) == ["c", "b", "a"]
+
+    with pytest.raises(sc_p.UnsupportedSourceTypeError):
+        TypeAdapter(Annotated[list, sc_p.Presorted()])
+
+
+def test_typed_serialization():
+    # Items are serialized with the item schema, including custom serializers
+    Item = Annotated[int, PlainSerializer(lambda x: f"#{x}")]
+    for annotation in (
+        sc_p.SortedList[Item],
+        sc_p.SortedSet[Item],
+        sc_p.AnnotatedSortedList[Item],
+        sc_p.AnnotatedSortedSet[Item],
+    ):
+        ta = TypeAdapter(annotation)
+        assert ta.dump_json(ta.validate_python([2, 1])) == b'["#1","#2"]'
+        assert ta.dump_python(ta.validate_python([2, 1])) == ["#1", "#2"]
+    for annotation in (sc_p.SortedDict[Item, Item], sc_p.AnnotatedSortedDict[Item, Item]):
+        ta = TypeAdapter(annotation)
+        assert ta.dump_json(ta.validate_python({2: 3, 1: 4})) == b'{"#1":"#4","#2":"#3"}'
+        assert ta.dump_python(ta.validate_python({2: 3, 1: 4})) == {"#1": "#4", "#2": "#3"}
+
+    # Dicts are serialized in sorted order whether or not insertion order is sorted
+    ta = TypeAdapter(sc_p.SortedDict[int, str])
+    for sorted_dict in (
+        sc_p.SortedDict({1: "a", 2: "b", 3: "c"}),
+        sc_p.SortedDict({3: "c", 1: "a", 2: "b"}),
+        sc_p.SortedDict(lambda x: -x, {1: "c", 2: "b", 3: "a"}),
+    ):
+        expected = dict(sorted_dict)
+        dumped = ta.dump_python(sorted_dict)
+        assert type(dumped) is dict
+        assert list(dumped.items()) == list(expected.items())
+        assert ta.dump_json(sorted_dict) == TypeAdapter(dict).dump_json(expected)
+    sorted_dict = ta.validate_python({1: "a", 3: "c"})
+    sorted_dict[2] = "b"
+    assert ta.dump_json(sorted_dict) == b'{"1":"a","2":"b","3":"c"}'
+
+
+def test_bulk_load():
+    values = random.Random(0).sample(range(100_000), 5000)
+    # Include some duplicates
+    case = values + values[:10]
+    for annotation, expected in (
+        (sc_p.SortedList[int], sorted(case)),
+        (sc_p.AnnotatedSortedList[int], sorted(case)),
+        (sc_p.SortedSet[int], sorted(values)),
+        (sc_p.AnnotatedSortedSet[int], sorted(values)),
+        (Annotated[sc_p.SortedList[int], sc_p.Key(lambda x: -x)], sorted(case, reverse=True)),
+        (Annotated[sc_p.SortedSet[int], sc_p.Key(lambda x: -x)], sorted(values, reverse=True)),
+    ):
+        ta = TypeAdapter(annotation)
+        for actual in (ta.validate_json(json.dumps(case)), ta.validate_python(case)):
+            actual._check()
+            assert list(actual) == expected
+
+    ta = TypeAdapter(sc_p.SortedDict[str, int])
+    actual = ta.validate_json(json.dumps({str(v): v for v in values}))
+    actual._check()
+    assert list(actual) == sorted(str(v) for v in values)
+
+    # SortedSet adopts the validated set, not the input, and its set methods use it
+    for data in (case, set(case), iter(case), json.dumps(case)):
+        ta = TypeAdapter(sc_p.SortedSet[int])
+        actual = ta.validate_json(data) if isinstance(data, str) else ta.validate_python(data)
+        actual._check()
+        assert actual._set is not data
+        assert actual.issuperset(values) and actual.isdisjoint([-1])
+        actual.add(-1)
+        actual._check()
+        assert not actual.isdisjoint([-1])
+        assert -1 not in case and (-1 not in data if isinstance(data, set) else True)
+
+    # Input isn't modified
+    case = [3, 1, 2]
+    assert TypeAdapter(sc_p.SortedList[int]).validate_python(case) == sc.SortedList([1, 2, 3])
+    assert case == [3, 1, 2]
+
+    # A subclass with a custom __init__ is still constructed with it
+    class CustomSortedList(sc_p.SortedList):
+        def __init__(self, iterable=None, key=None):
+            super().__init__(iterable, key)
+            self.custom = True
+
+    assert TypeAdapter(CustomSortedList[int]).validate_json("[2, 1]").custom
+
+
+def test_validation_branch_dispatch():
+    sc_p.reset_validation_branch_counts()
+    # Branches aren't counted unless counting is turned on
+    TypeAdapter(sc_p.SortedList).validate_python([3, 1])
+    assert sc_p.get_validation_branch_counts() == {}
+    sc_p.count_validation_branches()
+    list_ta = TypeAdapter(sc_p.SortedList)
+    for case in ([3, 1], (3, 1), {3, 1}, (x for x in [3, 1]), sc_p.SortedList([3, 1])):
+        assert list_ta.validate_python(case) == sc.SortedList([1, 3])
+    set_ta = TypeAdapter(sc_p.SortedSet[int])
+    for case in ([3, 1, 3], (3, 1), {3, 1}, frozenset([3, 1]), iter([3, 1])):
+        assert set_ta.validate_python(case) == sc.SortedSet([1, 3])
+    dict_ta = TypeAdapter(sc_p.SortedDict[str, int])
+    for case in ({"b": 2, "a": 1}, [("b", 2), ("a", 1)], (("b", 2), ("a", 1)), zip("ba", [2, 1])):
+        assert dict_ta.validate_python(case) == sc.SortedDict({"a": 1, "b": 2})
+
+    assert sc_p.get_validation_branch_counts() == {
+        ("SortedList", "instance"): 1,
+        ("SortedList", "sequence"): 2,
+        ("SortedList", "iterable"): 2,
+        ("SortedSet", "sequence"): 2,
+        ("SortedSet", "set"): 2,
+        ("SortedSet", "iterable"): 1,
+        ("SortedDict", "mapping"): 1,
+        ("SortedDict", "sequence"): 2,
+        ("SortedDict", "iterable"): 1,
+    }
+    sc_p.reset_validation_branch_counts()
+    assert sc_p.get_validation_branch_counts() == {}
+    sc_p.count_validation_branches(False)
+    list_ta.validate_python([3, 1])
+    assert sc_p.get_validation_branch_counts() == {}
+
+    # Lists, tuples, and sets are accepted in strict mode too
+    class Strict(BaseModel):
+        model_config = ConfigDict(strict=True)
+
+        values: sc_p.SortedList[int]
+        unique: sc_p.SortedSet[int]
+
+    for case in ([3, 1, 3], (3, 1, 3), {3, 1}, frozenset([3, 1])):
+        model = Strict(values=case, unique=case)
+        assert list(model.values) == sorted(case)
+        assert model.unique == sc.SortedSet([1, 3])
+        assert list(
+            TypeAdapter(sc_p.SortedList[int]).validate_python(case, strict=True)
+        ) == sorted(case)
+        assert TypeAdapter(sc_p.SortedSet[int]).validate_python(case, strict=True) == sc.SortedSet(
+            [1, 3]
+        )
+    for case in ([("b", 2), ("a", 1)], (("b", 2), ("a", 1))):
+        assert dict_ta.validate_python(case, strict=True) == sc.SortedDict({"a": 1, "b": 2})
+    with pytest.raises(ValidationError) as exc_info:
+        Strict(values=("1",), unique=["1"])
+    assert [(error["type"], error["loc"]) for error in exc_info.value.errors()] == [
+        ("int_type", ("values", 0)),
+        ("int_type", ("unique", 0)),
+    ]
+
+    # Only the chosen branch is reported in errors, at the same locations as without dispatching
+    with pytest.raises(ValidationError) as exc_info:
+        TypeAdapter(sc_p.SortedList[int]).validate_python([1, "x"])
+    assert [error["loc"] for error in exc_info.value.errors()] == [(1,)]
+
+    def check_positive(value: int) -> int:
+        if value <= 0:
+            raise PydanticCustomError("not_positive", "{value} is not positive", {"value": value})
+        return value
+
+    class Scores(BaseModel):
+        scores: sc_p.SortedSet[Annotated[int, AfterValidator(check_positive)]]
+
+    with pytest.raises(ValidationError) as exc_info:
+        Scores(scores={1, -2})
+    assert exc_info.value.errors(include_url=False) == [
+        {
+            "type": "not_positive",
+            "loc": ("scores", 1),
+            "msg": "-2 is not positive",
+            "input": -2,
+            "ctx": {"value": -2},
+        }
+    ]
+    with pytest.raises(ValidationError) as exc_info:
+        dict_ta.validate_python(5)
+    assert [error["type"] for error in exc_info.value.errors()] == ["iterable_type"]
+
+
+def test_reuse_instances():
+    for validate in ("none", "all", "sample"):
+        reuse = sc_p.ReuseInstances(validate, sample_size=2)
+        for annotation, instance in (
+            (sc_p.SortedList[int], sc_p.SortedList([3, 1, 2])),
+            (sc_p.SortedSet[int], sc_p.SortedSet([3, 1, 2])),
+            (sc_p.SortedDict[str, int], sc_p.SortedDict({"c": 3, "a": 1, "b": 2})),
+        ):
+            ta = TypeAdapter(Annotated[annotation, reuse])
+            assert ta.validate_python(instance) is instance
+            # Other input is still validated as usual
+            items = list(instance.items()) if isinstance(instance, dict) else list(instance)
+            assert ta.validate_python(items) == instance
+
+        # Instances sorted with a different key are rebuilt
+        ta = TypeAdapter(Annotated[sc_p.SortedList[int], sc_p.Key(lambda x: -x), reuse])
+        instance = sc_p.SortedList([3, 1, 2])
+        actual = ta.validate_python(instance)
+        assert actual is not instance
+        assert list(actual) == [3, 2, 1]
+        assert ta.validate_python(actual) is actual
+
+    # Values that validation coerces cause the container to be rebuilt
+    for validate in ("all", "sample"):
+        ta = TypeAdapter(Annotated[sc_p.SortedDict[str, int], sc_p.ReuseInstances(validate)])
+        instance = sc_p.SortedDict({"b": "1", "a": 2})
+        actual = ta.validate_python(instance)
+        assert actual is not instance
+        assert actual == {"a": 2, "b": 1}
+        ta = TypeAdapter(Annotated[sc_p.SortedList[int], sc_p.ReuseInstances(validate)])
+        with pytest.raises(ValidationError):
+            ta.validate_python(sc_p.SortedList(["x", "y"]))
+
+    # Trusted instances are not validated
+    ta = TypeAdapter(Annotated[sc_p.SortedList[int], sc_p.ReuseInstances()])
+    instance = sc_p.SortedList(["x", "y"])
+    assert ta.validate_python(instance) is instance
+
+    # Only a sample of values is validated
+    ta = TypeAdapter(
+        Annotated[sc_p.SortedList[int], sc_p.ReuseInstances("sample", sample_size=10)]
+    )
+    instance = sc_p.SortedList([*range(1000), 0.5])
+    with pytest.raises(ValidationError):
+        TypeAdapter(Annotated[sc_p.SortedList[int], sc_p.ReuseInstances("all")]).validate_python(
+            instance
+        )
+    random.seed(0)
+    assert ta.validate_python(instance) is instance
+
+    with pytest.raises(sc_p.UnsupportedSourceTypeError):
+        TypeAdapter(Annotated[list, sc_p.ReuseInstances()])
+
+
+def test_max_items():
+    values = random.sample(range(1000), 1000)
+    for annotation, keep, expected in (
+        (Annotated[sc_p.SortedList[int], sc_p.MaxItems(5)], "smallest", [0, 1, 2, 3, 4]),
+        (
+            Annotated[sc_p.SortedSet[int], sc_p.MaxItems(5, keep="largest")],
+            "largest",
+            [995, 996, 997, 998, 999],
+        ),
+        (
+            Annotated[sc_p.SortedList[int], sc_p.MaxItems(5), sc_p.Key(operator.neg)],
+            "smallest",
+            [999, 998, 997, 996, 995],
+        ),
+        (
+            Annotated[
+                sc.SortedList,
+                sc_p.SortedListPydanticAnnotation,
+                sc_p.Key(operator.neg),
+                sc_p.MaxItems(5, keep="largest"),
+            ],
+            "largest",
+            [4, 3, 2, 1, 0],
+        ),
+    ):
+        ta = TypeAdapter(annotation)
+        for actual in (ta.validate_python(values), ta.validate_json(json.dumps(values))):
+            actual._check()
+            assert list(actual) == expected
+            assert ta.dump_python(actual) == expected
+
+            # Bound is enforced on later additions
+            everything = [*actual, -1, 1000, 1001, -2, 1002]
+            actual.add(-1)
+            actual.update([1000, 1001])
+            actual |= [-2, 1002]
+            actual._check()
+            everything.sort(key=actual.key)
+            assert list(actual) == (everything[:5] if keep == "smallest" else everything[-5:])
+
+            # Values can still be removed
+            remaining = list(actual)
+            actual.discard(remaining[0])
+            actual.remove(remaining[1])
+            assert actual.pop() == remaining[4]
+            del actual[0]
+            actual._check()
+            assert list(actual) == [remaining[3]]
+            del actual[:]
+            assert not actual
+
+            unpickled = pickle.loads(pickle.dumps(ta.validate_python([3, 2, 1])))
+            assert type(unpickled) is type(actual)
+            assert sorted(unpickled) == [1, 2, 3]
+
+    ta = TypeAdapter(Annotated[sc_p.SortedDict[str, int], sc_p.MaxItems(2, keep="largest")])
+    actual = ta.validate_python({"a": 1, "c": 2, "b": 3})
+    actual._check()
+    assert list(actual.items()) == [("b", 3), ("c", 2)]
+    actual["d"] = 4
+    actual.update(a=0)
+    actual.setdefault("e", 5)
+    actual._check()
+    assert actual == {"d": 4, "e": 5}
+    del actual["d"]
+    assert actual.pop("e") == 5
+    actual._check()
+    assert not actual
+    actual.update(a=1, b=2)
+    assert pickle.loads(pickle.dumps(actual)) == actual
+
+    # Duplicates in sets don't count towards the bound
+    ta = TypeAdapter(Annotated[sc_p.SortedSet[int], sc_p.MaxItems(3)])
+    assert list(ta.validate_python([1, 1, 2, 2, 3, 3])) == [1, 2, 3]
+
+    with pytest.raises(ValueError):
+        sc_p.MaxItems(-1)
+    with pytest.raises(sc_p.UnsupportedSourceTypeError):
+        TypeAdapter(Annotated[list, sc_p.MaxItems(1)])
+
+
+def test_load_factor():
+    def get_sorted_list(container):
+        return container if isinstance(container, sc.SortedList) else container._list
+
+    values = random.sample(range(1000), 100)
+    for annotation in (
+        Annotated[sc_p.SortedList[int], sc_p.LoadFactor(8)],
+        Annotated[sc_p.SortedList[int], sc_p.LoadFactor(8), sc_p.Key(operator.neg)],
+        Annotated[sc_p.SortedList[int], sc_p.LoadFactor(8), sc_p.MaxItems(90)],
+        Annotated[sc_p.SortedList[int], sc_p.LoadFactor(8), sc_p.Presorted()],
+        Annotated[sc_p.SortedSet[int], sc_p.LoadFactor(8)],
+        Annotated[sc_p.FrozenSortedSet[int], sc_p.LoadFactor(8)],
+        Annotated[sc_p.SortedDict[int, int], sc_p.LoadFactor(8)],
+        Annotated[sc.SortedList, sc_p.SortedListPydanticAnnotation, sc_p.LoadFactor(8)],
+    ):
+        ta = TypeAdapter(annotation)
+        is_dict = issubclass(type(ta.validate_python([])), sc.SortedDict)
+        data = {value: value for value in values} if is_dict else values
+        for actual in (ta.validate_python(data), ta.validate_json(json.dumps(data))):
+            assert get_sorted_list(actual)._load == 8
+            assert len(get_sorted_list(actual)._lists) == -(-len(actual) // 8)
+            actual._check()
+            if is_dict:
+                for value in range(1000, 1100):
+                    actual[value] = value
+            elif not isinstance(actual, sc_p._FrozenMixin):
+                for value in range(1000, 1100):
+                    actual.add(value)
+            actual._check()
+            if isinstance(actual, (sc_p.SortedList, sc_p.SortedSet, sc_p.SortedDict)):
+                # sortedcontainers' classes copy and pickle their values without the load factor
+                assert get_sorted_list(copy.copy(actual))._load == 8
+                assert get_sorted_list(pickle.loads(pickle.dumps(actual)))._load == 8
+
+    stream = io.StringIO(json.dumps(values))
+    actual = sc_p.validate_json_stream(
+        Annotated[sc_p.SortedList[int], sc_p.LoadFactor(8), sc_p.MaxItems(50)], stream
+    )
+    assert actual._load == 8
+    assert list(actual) == sorted(values)[:50]
+
+    auto = sc_p.LoadFactor("auto")
+    assert TypeAdapter(Annotated[sc_p.SortedList[int], auto]).validate_python(values)._load == 1000
+    assert auto._resolve(0) == auto._resolve(10**6) == 1000
+    assert auto._resolve(10**7) == 3162
+    assert auto._resolve(10**9) == 10_000
+
+    for load in (3, 0, True, "fast"):
+        with pytest.raises(ValueError):
+            sc_p.LoadFactor(load)  # type: ignore[arg-type]
+    with pytest.raises(sc_p.UnsupportedSourceTypeError):
+        TypeAdapter(Annotated[list, sc_p.LoadFactor(8)])
+
+
+def test_binary_format():
+    class MyModel(BaseModel):
+        floats: Annotated[sc_p.SortedList[float], sc_p.BinaryFormat()]
+        ints: Annotated[sc_p.SortedSet[int], sc_p.BinaryFormat("i"), sc_p.Key(operator.neg)]
+
+    floats = [random.random() for _ in range(5000)]
+    ints = random.choices(range(-1000, 1000), k=5000)
+    model = MyModel(floats=floats, ints=ints)
+    assert list(model.floats) == sorted(floats)
+    assert list(model.ints) == sorted(set(ints), reverse=True)
+
+    dumped = model.model_dump()
+    assert dumped["floats"]["dtype"] == "d"
+    assert dumped["floats"]["length"] == 5000
+    assert isinstance(dumped["floats"]["data"], bytes)
+    assert dumped["ints"]["dtype"] == "i"
+    assert dumped["ints"]["length"] == len(set(ints))
+
+    dumped_json = json.loads(model.model_dump_json())
+    assert isinstance(dumped_json["floats"]["data"], str)
+
+    for validated in (
+        MyModel.model_validate(dumped),
+        MyModel.model_validate(dumped_json),
+        MyModel.model_validate_json(model.model_dump_json()),
+    ):
+        validated.floats._check()
+        validated.ints._check()
+        assert validated == model
+
+    # Regular input is still accepted
+    assert MyModel.model_validate_json('{"floats": [2, 1], "ints": [1, 2]}') == MyModel(
+        floats=[1.0, 2.0], ints=[2, 1]
+    )
+
+    # Errors of regular and binary input are reported like without the binary format, only for
+    # the format of the input, in both Python and JSON mode
+    for data, errors in (
+        (
+            {"floats": [1, "a"], "ints": [1, "b"]},
+            [("float_parsing", ("floats", 1)), ("int_parsing", ("ints", 1))],
+        ),
+        (
+            {"floats": {"dtype": "x", "length": 0, "data": ""}, "ints": {"dtype": "i"}},
+            [
+                ("value_error", ("floats",)),
+                ("missing", ("ints", "length")),
+                ("missing", ("ints", "data")),
+            ],
+        ),
+    ):
+        for validate, value in (
+            (MyModel.model_validate, data),
+            (MyModel.model_validate_json, json.dumps(data)),
+        ):
+            with pytest.raises(ValidationError) as exc_info:
+                validate(value)
+            assert [(error["type"], error["loc"]) for error in exc_info.value.errors()] == errors
+    assert MyModel.model_validate_json('{"floats": [2, 1], "ints": [1, 2]}', strict=True) == (
+        MyModel(floats=[1.0, 2.0], ints=[2, 1])
+    )
+
+    # Invalid binary input
+    ta = TypeAdapter(Annotated[sc_p.SortedList[int], sc_p.BinaryFormat()])
+    assert ta.dump_json(ta.validate_python([3, 1, 2])) == (
+        b'{"dtype":"q","length":3,"data":"AQAAAAAAAAACAAAAAAAAAAMAAAAAAAAA"}'
+    )
+    for value in (
+        {"dtype": "d", "length": 1, "data": b"\0" * 8},
+        {"dtype": "q", "length": 2, "data": b"\0" * 8},
+        {"dtype": "q", "length": 1, "data": b"\0" * 7},
+    ):
+        with pytest.raises(ValidationError):
+            ta.validate_python(value)
+
+    # Values must fit in the dtype
+    with pytest.raises(ValidationError):
+        ta.validate_python([2**63])
+    ta = TypeAdapter(Annotated[sc_p.SortedList[int], sc_p.BinaryFormat("B")])
+    assert list(ta.validate_python([0, 255])) == [0, 255]
+    for value in (
+        [-1],
+        {"dtype": "b", "length": 1, "data": b"\xff"},
+        {"dtype": "h", "length": 1, "data": b"\x00\x01"},
+    ):
+        with pytest.raises(ValidationError):
+            ta.validate_python(value)
+    assert list(ta.validate_python({"dtype": "q", "length": 1, "data": b"\x01" + b"\0" * 7})) == [
+        1
+    ]
+    container = ta.validate_python([1])
+    container.add(256)
+    with pytest.raises(PydanticSerializationError):
+        ta.dump_python(container)
+
+    with pytest.raises(ValueError):
+        sc_p.BinaryFormat("x")
+    for annotation in (
+        sc_p.SortedList[str],
+        sc_p.SortedList,
+        sc_p.SortedList[Annotated[int, Field(gt=0)]],
+    ):
+        with pytest.raises(sc_p.UnsupportedSourceTypeError):
+            TypeAdapter(Annotated[annotation, sc_p.BinaryFormat("q")])
+    with pytest.raises(sc_p.UnsupportedSourceTypeError):
+        TypeAdapter(Annotated[sc_p.SortedList[float], sc_p.BinaryFormat("q")])
+    with pytest.raises(sc_p.UnsupportedSourceTypeError):
+        TypeAdapter(Annotated[sc_p.SortedList[int], sc_p.BinaryFormat("d")])
+    with pytest.raises(sc_p.UnsupportedSourceTypeError):
+        TypeAdapter(Annotated[sc_p.SortedList[str], sc_p.BinaryFormat()])
+    with pytest.raises(sc_p.UnsupportedSourceTypeError):
+        TypeAdapter(Annotated[sc_p.SortedDict[int, int], sc_p.BinaryFormat()])
+
+
+def test_columnar_format():
+    class MyModel(BaseModel):
+        by_tuple: Annotated[sc_p.SortedDict[Tuple[int, int], float], sc_p.ColumnarFormat()]
+        by_int: Annotated[sc_p.SortedDict[int, str], sc_p.ColumnarFormat(), sc_p.Key(operator.neg)]
+
+    ints = random.sample(range(10_000), 5000)
+    model = MyModel(by_tuple={(i % 7, i): i / 2 for i in ints}, by_int={i: str(i) for i in ints})
+
+    dumped = model.model_dump()
+    assert dumped["by_tuple"]["keys"] == sorted((i % 7, i) for i in ints)
+    assert dumped["by_tuple"]["values"] == [i / 2 for _, i in dumped["by_tuple"]["keys"]]
+    assert dumped["by_int"]["keys"] == sorted(ints, reverse=True)
+    assert dumped["by_int"]["values"] == [str(i) for i in sorted(ints, reverse=True)]
+    assert json.loads(model.model_dump_json())["by_int"] == dumped["by_int"]
+
+    for validated in (
+        MyModel.model_validate(dumped),
+        MyModel.model_validate_json(model.model_dump_json()),
+    ):
+        validated.by_tuple._check()
+        validated.by_int._check()
+        assert validated == model
+
+    # Regular input is still accepted
+    assert MyModel.model_validate_json('{"by_tuple": {}, "by_int": {"1": "a", "2": "b"}}') == (
+        MyModel(by_tuple={}, by_int={2: "b", 1: "a"})
+    )
+
+    ta = TypeAdapter(Annotated[sc_p.SortedDict[int, int], sc_p.ColumnarFormat()])
+    with pytest.raises(ValidationError):
+        ta.validate_python({"keys": [1, 2], "values": [1]})
+
+    # Duplicate keys aren't dropped
+    with pytest.raises(ValidationError, match="unique keys"):
+        ta.validate_json('{"keys": [1, 2, 1], "values": [1, 2, 3]}')
+
+    # Only the errors of the format of the input are reported
+    class Columns(BaseModel):
+        index: Annotated[sc_p.SortedDict[int, int], sc_p.ColumnarFormat()]
+
+    for data, errors in (
+        ({"keys": [1, 2, 1], "values": [1, 2, 3]}, [("value_error", ("index",))]),
+        ({"keys": [1, "a"], "values": [1, 2]}, [("int_parsing", ("index", "keys", 1))]),
+        ({"1": 1, "2": "b"}, [("int_parsing", ("index", "2"))]),
+    ):
+        for validate, value in (
+            (Columns.model_validate, {"index": data}),
+            (Columns.model_validate_json, json.dumps({"index": data})),
+        ):
+            with pytest.raises(ValidationError) as exc_info:
+                validate(value)
+            assert [(error["type"], error["loc"]) for error in exc_info.value.errors()] == errors
+    assert Columns.model_validate_json('{"index": {"1": 1}}', strict=True).index == {1: 1}
+    # Out of order keys are sorted
+    assert list(ta.validate_python({"keys": [2, 1], "values": [2, 1]}).items()) == [(1, 1), (2, 2)]
+
+    with pytest.raises(sc_p.UnsupportedSourceTypeError):
+        TypeAdapter(Annotated[sc_p.SortedList[int], sc_p.ColumnarFormat()])
+
+
+def test_sorted_array():
+    np = pytest.importorskip("numpy")
+
+    values = random.sample(range(-1000, 1000), 500)
+
+    class MyModel(BaseModel):
+        ints: sc_p.SortedArray[int]
+        floats: sc_p.SortedArray[np.float32]
+        binary: Annotated[sc_p.SortedArray[np.int16], sc_p.BinaryFormat()]
+        inferred: sc_p.SortedArray
+
+    for data in (values, np.array(values), tuple(values), sc_p.SortedArray(values)):
+        model = MyModel(ints=data, floats=data, binary=data, inferred=data)
+        for actual, dtype in (
+            (model.ints, np.int64),
+            (model.floats, np.float32),
+            (model.binary, np.int16),
+            (model.inferred, np.int64),
+        ):
+            assert actual.dtype == dtype
+            assert actual.values.tolist() == sorted(values)
+        for mode in ("python", "json"):
+            dumped = model.model_dump(mode=mode)
+            assert dumped["ints"] == dumped["floats"] == sorted(values)
+            assert dumped["binary"]["dtype"] == "h"
+            assert MyModel.model_validate(dumped) == model
+        assert MyModel.model_validate_json(model.model_dump_json()) == model
+
+    # Instances with the same dtype are reused
+    model = MyModel(ints=values, floats=values, binary=values, inferred=values)
+    assert MyModel(**dict(model)).floats is model.floats
+    assert MyModel(**{**dict(model), "floats": model.ints}).floats.dtype == np.float32
+
+    # Errors are reported at the same locations as for the other containers
+    for field, data, loc in (
+        ("ints", [1.5], ("ints", 0)),
+        ("ints", ["a"], ("ints", 0)),
+        ("ints", np.array([1.5]), ("ints",)),
+        ("ints", np.array([[1]]), ("ints",)),
+        ("binary", [2**15], ("binary", 0)),
+        ("binary", np.array([2**15]), ("binary",)),
+        ("inferred", np.array(["a"]), ("inferred",)),
+        ("inferred", [2**64], ("inferred",)),
+    ):
+        with pytest.raises(ValidationError) as exc_info:
+            MyModel(**{**dict(model), field: data})
+        assert [error["loc"] for error in exc_info.value.errors()] == [loc]
+    for field in ("ints", "binary"):
+        data = {**json.loads(model.model_dump_json()), field: [1, 2.5]}
+        with pytest.raises(ValidationError) as exc_info:
+            MyModel.model_validate_json(json.dumps(data))
+        assert [error["loc"] for error in exc_info.value.errors()] == [(field, 1)]
+    with pytest.raises(sc_p.UnsupportedSourceTypeError):
+        TypeAdapter(sc_p.SortedArray[str])
+    with pytest.raises(sc_p.UnsupportedSourceTypeError):
+        TypeAdapter(Annotated[sc_p.SortedArray, sc_p.BinaryFormat()])
+
+    # Methods match SortedList, except that bisection also accepts arrays
+    sorted_array = sc_p.SortedArray(values, dtype=np.int32)
+    sorted_list = sc.SortedList(values)
+    rng = random.Random(0)
+    for _ in range(1000):
+        value = rng.randrange(-1100, 1100)
+        operation = rng.choice(["add", "discard", "update", "pop", "delete"])
+        if operation == "add":
+            sorted_array.add(value)
+            sorted_list.add(value)
+        elif operation == "discard":
+            sorted_array.discard(value)
+            sorted_list.discard(value)
+        elif operation == "update":
+            sorted_array.update([value, value + 1])
+            sorted_list.update([value, value + 1])
+        elif operation == "pop" and sorted_list:
+            index = rng.randrange(-len(sorted_list), len(sorted_list))
+            assert sorted_array.pop(index) == sorted_list.pop(index)
+        elif operation == "delete":
+            del sorted_array[10:20]
+            del sorted_list[10:20]
+        assert len(sorted_array) == len(sorted_list)
+        assert sorted_array.bisect_left(value) == sorted_list.bisect_left(value)
+        assert sorted_array.bisect_right(value + 0.5) == sorted_list.bisect_right(value + 0.5)
+        assert sorted_array.count(value) == sorted_list.count(value)
+        assert (value in sorted_array) == (value in sorted_list)
+    assert sorted_array == list(sorted_list)
+    assert sorted_array.dtype == np.int32
+    assert sorted_array.bisect_left(np.array([0, 10])).tolist() == [
+        sorted_list.bisect_left(0),
+        sorted_list.bisect_left(10),
+    ]
+    assert list(sorted_array.irange(-10, 10, (False, True), reverse=True)) == list(
+        sorted_list.irange(-10, 10, (False, True), reverse=True)
+    )
+    assert sorted_array.index(sorted_list[5]) == sorted_list.index(sorted_list[5])
+    sorted_array.remove(sorted_list[0])
+    with pytest.raises(ValueError):
+        sorted_array.remove(2000)
+    with pytest.raises(ValueError):
+        sorted_array.add(1.5)
+    with pytest.raises(ValueError):
+        sorted_array.add(2**40)
+
+    # Views of the values are read-only, and copies don't share them
+    with pytest.raises(ValueError):
+        sorted_array.values[0] = 0
+    for copied in (copy.copy(sorted_array), pickle.loads(pickle.dumps(sorted_array))):
+        assert copied == sorted_array and copied.dtype == sorted_array.dtype
+        copied.clear()
+        assert len(sorted_array) > 0
+
+
+def test_lazy():
+    class MyModel(BaseModel):
+        scores: Annotated[sc_p.SortedList[int], sc_p.Lazy()]
+        index: Annotated[sc_p.SortedDict[int, str], sc_p.Lazy()] = {}
+        tags: Annotated[sc_p.FrozenSortedSet[str], sc_p.Lazy()] = ()
+
+    data = '{"scores": [3, 1, 2], "index": {"2": "b", "1": "a"}, "tags": ["b", "a", "b"]}'
+    model = MyModel.model_validate_json(data)
+    for container in (model.scores, model.index, model.tags):
+        assert sc_p._is_lazy(container)
+    assert isinstance(model.scores, sc_p.SortedList)
+    assert isinstance(model.index, sc_p.SortedDict)
+
+    # Containers that were never used are serialized from the input without sorting
+    assert model.model_dump_json() == data.replace(": ", ":").replace(", ", ",")
+    assert model.model_dump()["index"] == {"2": "b", "1": "a"}
+    assert sc_p._is_lazy(model.scores)
+
+    # Using a container builds it
+    assert model.scores[0] == 1
+    assert type(model.scores) is sc_p.SortedList
+    model.scores._check()
+    assert list(model.index.keys()) == [1, 2]
+    assert type(model.index) is sc_p.SortedDict
+    model.index._check()
+    assert hash(model.tags) == hash(frozenset({"a", "b"}))
+    assert model.model_dump() == {
+        "scores": [1, 2, 3],
+        "index": {1: "a", 2: "b"},
+        "tags": ["a", "b"],
+    }
+
+    # Other ways of using a container also build it
+    ta = TypeAdapter(Annotated[sc_p.SortedList[int], sc_p.Lazy()])
+    assert len(ta.validate_python([2, 1])) == 2
+    assert ta.validate_python([2, 1]) == [1, 2]
+    assert list(ta.validate_python((2, 1))) == [1, 2]
+    assert copy.deepcopy(ta.validate_python([2, 1])) == [1, 2]
+    assert pickle.loads(pickle.dumps(ta.validate_python({2, 1}))) == [1, 2]
+    values = [2, 1]
+    container = ta.validate_python(values)
+    values.append(0)
+    container.add(3)
+    assert list(container) == [1, 2, 3]
+
+    # Other input is validated right away
+    assert not sc_p._is_lazy(ta.validate_python(sc_p.SortedList([1, 2])))
+    assert not sc_p._is_lazy(ta.validate_python(iter([2, 1])))
+    with pytest.raises(ValidationError):
+        MyModel(scores=5)
+
+    # Errors are raised when first used, every time until the input is valid
+    model = MyModel.model_validate({"scores": [1, "x", 3]})
+    for _ in range(2):
+        with pytest.raises(ValidationError) as exc_info:
+            model.scores.add(2)
+        assert exc_info.value.errors()[0]["loc"] == ("scores", 1)
+        assert exc_info.value.errors()[0]["type"] == "int_parsing"
+    # Errors have the title of the model, like when validating it eagerly
+    lazy_error = exc_info.value
+    eager_model = create_model("MyModel", scores=(sc_p.SortedList[int], ...))
+    with pytest.raises(ValidationError) as exc_info:
+        eager_model(scores=[1, "x", 3])
+    assert str(lazy_error) == str(exc_info.value)
+    assert str(lazy_error).startswith("1 validation error for MyModel\n")
+    # Errors keep their context and URL
+    positive_ta = TypeAdapter(Annotated[sc_p.SortedList[Annotated[int, Field(gt=0)]], sc_p.Lazy()])
+    with pytest.raises(ValidationError) as exc_info:
+        len(positive_ta.validate_python([1, -1]))
+    [error] = exc_info.value.errors()
+    assert error["ctx"] == {"gt": 0}
+    assert error["url"].endswith("/greater_than")
+    assert exc_info.value.title == "SortedList"
+
+    # Invalid input that was never used is serialized as it is
+    assert MyModel.model_validate({"scores": [1, "x"]}).model_dump()["scores"] == [1, "x"]
+    with pytest.raises(ValidationError):
+        ta.validate_python(["x"])[0]
+    presorted_ta = TypeAdapter(
+        Annotated[sc_p.SortedList[int], sc_p.Lazy(), sc_p.Presorted(strict=True)]
+    )
+    with pytest.raises(ValidationError):
+        list(presorted_ta.validate_python([2, 1]))
+
+    # Works with other annotations, whose containers are built before serializing if needed
+    ta = TypeAdapter(
+        Annotated[sc_p.SortedList[int], sc_p.Key(operator.neg), sc_p.MaxItems(2), sc_p.Lazy()]
+    )
+    container = ta.validate_python([1, 3, 2])
+    assert sc_p._is_lazy(container)
+    assert list(container) == [3, 2]
+    ta = TypeAdapter(Annotated[sc_p.SortedList[int], sc_p.BinaryFormat("q"), sc_p.Lazy()])
+    serialized = ta.dump_json(ta.validate_python([2, 1]))
+    assert list(ta.validate_json(serialized)) == [1, 2]
+
+    # Only built once when used from several threads
+    ta = TypeAdapter(Annotated[sc_p.SortedList[int], sc_p.Lazy()])
+    container = ta.validate_python(list(range(10_000, 0, -1)))
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        assert set(executor.map(container.bisect_left, [5] * 8)) == {4}
+    container._check()
+
+    with pytest.raises(sc_p.UnsupportedSourceTypeError):
+        TypeAdapter(Annotated[List[int], sc_p.Lazy()])
+
+
+class Event(BaseModel):
+    """Model for SortedModelIndex tests, defined at module level so that it can be pickled."""
+
+    ts: int
+    user: str
+    priority: int
+
+
+def test_sorted_model_index():
+    class Log(BaseModel):
+        events: Annotated[
+            sc_p.SortedModelIndex[Event], sc_p.IndexBy("ts", secondary=("user", "priority"))
+        ]
+
+    def check(model_index):
+        model_index._check()
+        assert list(model_index._indexes) == ["user", "priority"]
+        for name, index in model_index._indexes.items():
+            index._check()
+            assert sorted(map(id, index)) == sorted(map(id, model_index))
+            key = operator.attrgetter(name, "ts")
+            assert list(map(key, index)) == sorted(map(key, model_index))
+
+    data = [
+        {"ts": ts, "user": random.choice("abcd"), "priority": random.randrange(5)}
+        for ts in random.sample(range(10_000), 2_000)
+    ]
+    log = Log.model_validate({"events": data})
+    events = log.events
+    assert type(events) is sc_p.SortedModelIndex
+    check(events)
+    assert [event.ts for event in events] == sorted(item["ts"] for item in data)
+    assert Log.model_validate_json(log.model_dump_json()) == log
+
+    # Range queries on any indexed field
+    assert [event.ts for event in events.irange_field("ts", 100, 200)] == sorted(
+        item["ts"] for item in data if 100 <= item["ts"] <= 200
+    )
+    assert sorted(event.ts for event in events.irange_field("user", "b", "c")) == sorted(
+        item["ts"] for item in data if item["user"] in "bc"
+    )
+    assert len(list(events.irange_field("priority", 3, inclusive=(False, True)))) == sum(
+        item["priority"] == 4 for item in data
+    )
+    assert len(list(events.irange_field("priority", 1, 3, inclusive=(True, False)))) == sum(
+        item["priority"] in (1, 2) for item in data
+    )
+    ordered = list(events.irange_field("priority", reverse=True))
+    assert ordered == sorted(events, key=operator.attrgetter("priority", "ts"), reverse=True)
+    with pytest.raises(ValueError):
+        events.irange_field("missing")
+
+    # Secondary indexes are kept in sync
+    events.add(Event(ts=-1, user="z", priority=9))
+    events.update([Event(ts=ts, user="y", priority=1) for ts in range(20_000, 20_010)])
+    check(events)
+    events.update([Event(ts=ts, user="x", priority=2) for ts in range(30_000, 32_000)])
+    check(events)
+    for index in (slice(None, 100), slice(None, None, 3), slice(len(events) // 2, None)):
+        del events[index]
+        check(events)
+    events.pop()
+    events.remove(events[5])
+    events.discard(events[7])
+    check(events)
+    events += [Event(ts=-2, user="w", priority=0)]
+    check(events)
+
+    # Copies and pickles keep the secondary indexes
+    copied = events.copy()
+    copied.add(Event(ts=-3, user="v", priority=0))
+    check(copied)
+    check(events)
+    assert len(copied) == len(events) + 1
+    for restored in (pickle.loads(pickle.dumps(events)), copy.deepcopy(events)):
+        check(restored)
+        assert restored == events
+    events.clear()
+    check(events)
+
+    # Works with other annotations
+    ta = TypeAdapter(
+        Annotated[
+            sc_p.SortedModelIndex[Event],
+            sc_p.IndexBy("ts", ["user"]),
+            sc_p.MaxItems(3, keep="largest"),
+            sc_p.LoadFactor(50),
+        ]
+    )
+    events = ta.validate_python(data)
+    assert [event.ts for event in events] == sorted(item["ts"] for item in data)[-3:]
+    assert events._indexes["user"]._load == 50
+    events.add(Event(ts=100_000, user="a", priority=0))
+    assert len(events._indexes["user"]) == 3
+
+    with pytest.raises(ValueError):
+        TypeAdapter(Annotated[sc_p.SortedModelIndex[Event], sc_p.IndexBy("missing")])
+    with pytest.raises(ValueError):
+        sc_p.IndexBy("ts", ("ts",))
+    with pytest.raises(sc_p.UnsupportedSourceTypeError):
+        TypeAdapter(Annotated[sc_p.SortedList[Event], sc_p.IndexBy("ts")])
+    with pytest.raises(TypeError):
+        sc_p.SortedModelIndex([])
+
+    # IndexBy is required when the schema is built, including for nested indexes
+    with pytest.raises(sc_p.UnsupportedSourceTypeError):
+        TypeAdapter(sc_p.SortedModelIndex[Event])
+    with pytest.raises(sc_p.UnsupportedSourceTypeError):
+        TypeAdapter(Annotated[sc_p.SortedModelIndex[Event], sc_p.MaxItems(3)])
+    with pytest.raises(sc_p.UnsupportedSourceTypeError):
+        TypeAdapter(
+            Annotated[sc_p.SortedModelIndex[sc_p.SortedModelIndex[Event]], sc_p.IndexBy("ts")]
+        )
+
+    # None can't be compared, so it's rejected in indexed fields
+    class MaybeEvent(BaseModel):
+        ts: int
+        user: Optional[str]
+
+    ta = TypeAdapter(Annotated[sc_p.SortedModelIndex[MaybeEvent], sc_p.IndexBy("ts", ["user"])])
+    items = [{"ts": 1, "user": "a"}, {"ts": 2, "user": None}]
+    for validate, value in ((ta.validate_python, items), (ta.validate_json, json.dumps(items))):
+        with pytest.raises(ValidationError) as exc_info:
+            validate(value)
+        (error,) = exc_info.value.errors()
+        assert error["type"] == "value_error"
+        assert "indexed field 'user', got None at index 1" in error["msg"]
+    events = ta.validate_python(items[:1])
+    with pytest.raises(TypeError):
+        events.add(MaybeEvent(ts=3, user=None))
+
+
+def test_core_schema_cache():
+    sc_p._schema_cache.clear()
+
+    class ModelA(BaseModel):
+        a: sc_p.SortedList[int]
+        b: sc_p.SortedDict[str, int]
+
+    assert len(sc_p._schema_cache) == 2
+
+    class ModelB(BaseModel):
+        a: sc_p.SortedList[int]
+        b: Annotated[sc_p.SortedDict[str, int], sc_p.Presorted()]
+
+    # Cached schemas are reused, and annotations rebuilding the schema are cached separately
+    assert len(sc_p._schema_cache) == 3
+    for model in (ModelA, ModelB):
+        assert model(a=[3, 1, 2], b={"b": 2, "a": 1}).model_dump() == {
+            "a": [1, 2, 3],
+            "b": {"a": 1, "b": 2},
+        }
+
+    # Config is part of the key
+    class StrictModel(BaseModel):
+        model_config = ConfigDict(strict=True)
+
+        a: sc_p.SortedList[int]
+
+    assert len(sc_p._schema_cache) == 4
+    with pytest.raises(ValidationError):
+        StrictModel(a=["1"])
+
+    # Schemas referring to other models' definitions aren't cached
+    class Item(BaseModel):
+        x: int
+
+    class ModelC(BaseModel):
+        items: sc_p.SortedDict[int, Item]
+
+    assert len(sc_p._schema_cache) == 4
+    assert ModelC(items={2: {"x": 2}, 1: {"x": 1}}).items == {1: Item(x=1), 2: Item(x=2)}
+
+
+def test_import_time():
+    """Importing the package shouldn't import pydantic or read distribution metadata, which are
+    deferred until they're first needed."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import sortedcontainers_pydantic"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    imported = {
+        line.rsplit("|", 1)[-1].strip()
+        for line in result.stderr.splitlines()
+        if line.startswith("import time:")
+    }
+    assert "sortedcontainers_pydantic" in imported
+    for module in ("pydantic", "pydantic_core", "importlib.metadata", "numpy"):
+        assert module not in imported
+
+    assert sc_p.__version__ == importlib.metadata.version("sortedcontainers-pydantic")
+    with pytest.raises(AttributeError):
+        sc_p.not_an_attribute
+
+
+def test_copy_on_write():
+    rng = random.Random(0)
+
+    def modify(container):
+        for value in rng.sample(range(1000), 100):
+            if isinstance(container, dict):
+                container[str(value)] = value
+                container.pop(str(value + 1), None)
+            else:
+                container.add(value)
+                container.discard(value + 1)
+
+    def contents(container):
+        return list(container.items()) if isinstance(container, dict) else list(container)
+
+    containers = [
+        sc_p.SortedList(rng.sample(range(1000), 500)),
+        sc_p.SortedKeyList(rng.sample(range(1000), 500), key=operator.neg),
+        sc_p.SortedSet(rng.sample(range(1000), 500)),
+        sc_p.SortedDict({str(i): i for i in rng.sample(range(1000), 500)}),
+        TypeAdapter(Annotated[sc_p.SortedList[int], sc_p.MaxItems(400)]).validate_python(
+            rng.sample(range(1000), 500)
+        ),
+    ]
+    for original in containers:
+        cls = type(original)
+        # Small sublists so that modifications split and merge them
+        original._reset(8)
+        for copy_function in (copy.copy, copy.deepcopy):
+            copied = copy_function(original)
+            assert repr(copied) == repr(original)
+            sorted_list = copied._list if isinstance(copied, (dict, sc.SortedSet)) else copied
+            assert sorted_list._load == 8
+            assert (
+                sorted_list._lists[0]
+                is (
+                    original._list if isinstance(original, (dict, sc.SortedSet)) else original
+                )._lists[0]
+            )
+            for modified, unmodified in ((copied, original), (original, copied)):
+                expected = contents(unmodified)
+                modify(modified)
+                modified._check()
+                unmodified._check()
+                assert contents(unmodified) == expected
+            # Pickled as the original class
+            assert type(pickle.loads(pickle.dumps(copied))) is cls
+
+    # Deep copies still copy values that aren't immutable built-in types
+    values = sc_p.SortedDict({"a": [1]})
+    copied = copy.deepcopy(values)
+    copied["a"].append(2)
+    assert values == {"a": [1]}
+
+    class MyModel(BaseModel):
+        values: sc_p.SortedList[int]
+
+    model = MyModel(values=range(100_000))
+    snapshot = model.model_copy(deep=True)
+    assert snapshot.values._lists[0] is model.values._lists[0]
+    model.values.add(-1)
+    assert snapshot.values[0] == 0
+    assert snapshot.values._lists[-1] is model.values._lists[-1]
+
+
+def test_frozen():
+    class MyModel(BaseModel):
+        model_config = ConfigDict(frozen=True)
+
+        values: sc_p.FrozenSortedList[int]
+        keyed: Annotated[sc_p.FrozenSortedList[int], sc_p.Key(operator.neg)]
+        tags: sc_p.FrozenSortedSet[str]
+        index: sc_p.FrozenSortedDict[str, int]
+        top: Annotated[sc_p.FrozenSortedSet[int], sc_p.MaxItems(2)]
+
+    data = json.dumps(
+        {
+            "values": [3, 1, 2],
+            "keyed": [1, 3, 2],
+            "tags": ["b", "a"],
+            "index": {"b": 2, "a": 1},
+            "top": [5, 1, 3],
+        }
+    )
+    model = MyModel.model_validate_json(data)
+    assert type(model.keyed) is sc_p.FrozenSortedKeyList
+    assert list(model.keyed) == [3, 2, 1]
+    assert type(model.top) is sc_p.FrozenSortedSet
+    assert list(model.top) == [1, 3]
+    for container in (model.values, model.keyed, model.tags, model.index, model.top):
+        container._check()
+    assert MyModel.model_validate_json(model.model_dump_json()) == model
+
+    # Hashes match the equivalent built-in immutable types
+    assert hash(model.values) == hash((1, 2, 3))
+    assert hash(model.tags) == hash(frozenset(["a", "b"]))
+    assert hash(model.index) == hash(frozenset({"a": 1, "b": 2}.items()))
+    assert {model: 1}[MyModel.model_validate_json(data)] == 1
+    assert model.values != sc_p.FrozenSortedList([1, 2, 4])
+
+    for modify in (
+        lambda: model.values.add(4),
+        lambda: model.keyed.remove(1),
+        lambda: model.tags.update(["c"]),
+        lambda: model.index.__setitem__("c", 3),
+        lambda: model.index.keys().__delitem__(0),
+        lambda: model.top.clear(),
+        # Private aliases of the methods too
+        lambda: model.values._update([4]),
+        lambda: model.keyed._clear(),
+        lambda: model.values._reset(8),
+        lambda: model.tags._update(["c"]),
+        lambda: model.top._add(4),
+        lambda: model.top._discard(1),
+    ):
+        with pytest.raises(TypeError, match="immutable"):
+            modify()
+    assert list(model.values) == [1, 2, 3]
+    assert list(model.tags) == ["a", "b"]
+
+    # Frozen containers can still be created directly
+    assert list(sc_p.FrozenSortedList([3, 1, 2])) == [1, 2, 3]
+    assert list(sc_p.FrozenSortedList([1, 3, 2], key=operator.neg)) == [3, 2, 1]
+    assert list(sc_p.FrozenSortedSet([1, 3, 1], operator.neg)) == [3, 1]
+    assert sc_p.FrozenSortedList([1, 2]) + [0] == [0, 1, 2]
+    values = model.values
+    values += [0]
+    assert list(values) == [0, 1, 2, 3]
+    assert list(model.values) == [1, 2, 3]
+
+    # Instances are shared without copying, unless items have to be coerced
+    copied = MyModel(**dict(model))
+    assert all(getattr(copied, name) is getattr(model, name) for name in MyModel.model_fields)
+    assert model.model_copy().values is model.values
+    assert copy.copy(model.index) is model.index
+    assert MyModel(**{**dict(model), "values": sc_p.FrozenSortedList(["2", "1"])}).values == [1, 2]
+
+    for container in (model.values, model.keyed, model.tags, model.index):
+        unpickled = pickle.loads(pickle.dumps(container))
+        assert type(unpickled) is type(container)
+        assert unpickled == container
+        assert hash(unpickled) == hash(container)
+
+
+def test_cache_validation():
+    cache = sc_p.CacheValidation(max_entries=3, max_elements=10)
+
+    class MyModel(BaseModel):
+        index: Annotated[sc_p.SortedDict[str, int], cache]
+        scores: Annotated[sc_p.SortedList[int], sc_p.Key(operator.neg), sc_p.MaxItems(3), cache]
+
+    data = '{"index": {"b": 2, "a": 1}, "scores": [1, 5, 3, 4]}'
+    first = MyModel.model_validate_json(data)
+    assert cache.stats() == {"hits": 0, "misses": 2, "evictions": 0, "entries": 2, "elements": 5}
+    second = MyModel.model_validate_json(data)
+    assert cache.stats()["hits"] == 2
+    assert second == first
+    assert type(second.scores) is type(first.scores)
+    for model in (first, second):
+        model.index._check()
+        model.scores._check()
+    assert list(second.scores) == [5, 4, 3]
+
+    # Returned containers are copies, so modifying them doesn't affect the cache
+    assert second.index is not first.index
+    second.index["c"] = 3
+    second.scores.add(10)
+    assert MyModel.model_validate_json(data) == first
+
+    # Mutable items of returned containers aren't shared with the cache either
+    cache.clear()
+    lists_ta = TypeAdapter(Annotated[sc_p.SortedDict[str, List[int]], cache])
+    lists = lists_ta.validate_python({"a": [1]})
+    lists["a"].append(99)
+    cached_lists = lists_ta.validate_python({"a": [1]})
+    assert cached_lists == {"a": [1]}
+    cached_lists["a"].append(99)
+    assert lists_ta.validate_python({"a": [1]}) == {"a": [1]}
+    events_ta = TypeAdapter(Annotated[sc_p.SortedList[Event], sc_p.Key(lambda e: e.ts), cache])
+    events_data = [{"ts": 2, "user": "a", "priority": 0}, {"ts": 1, "user": "b", "priority": 0}]
+    events_ta.validate_python(events_data)[0].user = "z"
+    events = events_ta.validate_python(events_data)
+    assert [event.user for event in events] == ["b", "a"]
+    events[0].user = "z"
+    assert [event.user for event in events_ta.validate_python(events_data)] == ["b", "a"]
+    assert cache.stats()["hits"] == 4
+
+    # Equal input of different types isn't confused
+    ta = TypeAdapter(Annotated[sc_p.SortedList[str], cache])
+    assert list(ta.validate_python(["2", "1"])) == ["1", "2"]
+    assert list(ta.validate_python(["2", "1"])) == ["1", "2"]
+    assert cache.stats()["hits"] == 5
+
+    # Evicted in least recently used order, bounded by entries and elements
+    cache.clear()
+    ta = TypeAdapter(Annotated[sc_p.SortedList[int], cache])
+    for values in ([1], [2], [3], [4]):
+        ta.validate_python(values)
+    assert cache.stats() == {"hits": 0, "misses": 4, "evictions": 1, "entries": 3, "elements": 3}
+    ta.validate_python(list(range(9)))
+    assert cache.stats()["evictions"] == 3
+    assert cache.stats()["elements"] == 10
+    ta.validate_python(list(range(11)))
+    assert cache.stats()["entries"] == 2
+
+    # The same input validated in strict mode or JSON mode isn't confused
+    cache.clear()
+    assert list(ta.validate_python(["2", "1"])) == [1, 2]
+    with pytest.raises(ValidationError):
+        ta.validate_python(["2", "1"], strict=True)
+    with pytest.raises(ValidationError):
+        ta.validate_json('["2", "1"]', strict=True)
+
+    class StrictModel(BaseModel):
+        model_config = ConfigDict(strict=True)
+        scores: Annotated[sc_p.SortedList[int], cache]
+
+    with pytest.raises(ValidationError):
+        StrictModel(scores=["2", "1"])
+
+    # Input validated with a context isn't cached, since validators may use it
+    def scale(value: int, info: ValidationInfo) -> int:
+        return value * info.context["scale"] if info.context else value
+
+    cache.clear()
+    scaled_ta = TypeAdapter(
+        Annotated[sc_p.SortedList[Annotated[int, AfterValidator(scale)]], cache]
+    )
+    assert list(scaled_ta.validate_python([2, 1])) == [1, 2]
+    assert list(scaled_ta.validate_python([2, 1], context={"scale": 10})) == [10, 20]
+    assert cache.stats()["hits"] == 0
+
+    # Input that can't be hashed isn't cached
+    cache.clear()
+    assert list(ta.validate_python(iter([2, 1]))) == [1, 2]
+    assert cache.stats()["entries"] == 0
+
+    with pytest.raises(ValueError):
+        sc_p.CacheValidation(max_entries=0)
+    with pytest.raises(sc_p.UnsupportedSourceTypeError):
+        TypeAdapter(Annotated[List[int], sc_p.CacheValidation()])
+
+
+class CountingInt(int):
+    """Int that counts comparisons, for checking that containers aren't sorted again."""
+
+    comparisons = 0
+
+    def __lt__(self, other):
+        CountingInt.comparisons += 1
+        return int(self) < int(other)
+
+    def __hash__(self):
+        return int(self)
+
+
+def test_pickle():
+    values = [CountingInt(v) for v in random.sample(range(10_000), 5000)]
+    for container in (
+        sc_p.SortedList(values),
+        sc_p.SortedKeyList(values, key=operator.neg),
+        sc_p.SortedSet(values),
+        sc_p.SortedSet(values, operator.neg),
+        sc_p.SortedDict(zip(values, map(str, values))),
+        sc_p.SortedDict(operator.neg, zip(values, map(str, values))),
+        sc_p.SortedList(),
+    ):
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            CountingInt.comparisons = 0
+            unpickled = pickle.loads(pickle.dumps(container, protocol=protocol))
+            assert CountingInt.comparisons == 0
+            assert type(unpickled) is type(container)
+            unpickled._check()
+            assert unpickled == container
+            assert list(unpickled) == list(container)
+
+
+def test_validate_json_stream():
+    values = random.sample(range(100_000), 2000)
+    data = json.dumps(values, indent=1).encode()
+    for annotation, expected in (
+        (sc_p.SortedList[int], sorted(values)),
+        (sc_p.SortedSet[float], sorted(values)),
+        (Annotated[sc_p.SortedList[int], sc_p.Key(operator.neg)], sorted(values, reverse=True)),
+        (Annotated[sc_p.SortedList[int], sc_p.MaxItems(10)], sorted(values)[:10]),
+        (Annotated[sc.SortedList, sc_p.SortedListPydanticAnnotation], sorted(values)),
+    ):
+        for stream in (
+            io.BytesIO(data),
+            io.StringIO(data.decode()),
+            (data[i : i + 7] for i in range(0, len(data), 7)),
+        ):
+            actual = sc_p.validate_json_stream(annotation, stream, batch_size=99, chunk_size=11)
+            actual._check()
+            assert list(actual) == expected
+            assert actual == TypeAdapter(annotation).validate_json(data)
+
+    # Numbers split across chunks
+    chunks = [b"[1", b".", b"5", b"e", b"2", b",", b"-3", b"]"]
+    assert list(sc_p.validate_json_stream(sc_p.SortedList[float], chunks)) == [-3.0, 150.0]
+
+    mapping = {str(v): [v, {"nested": '"quoted", [escaped]'}] for v in values}
+    actual = sc_p.validate_json_stream(
+        sc_p.SortedDict[int, list], io.BytesIO(json.dumps(mapping).encode()), batch_size=99
+    )
+    actual._check()
+    assert actual == {int(k): v for k, v in mapping.items()}
+
+    assert sc_p.validate_json_stream(sc_p.SortedDict, io.BytesIO(b" {} ")) == {}
+    assert sc_p.validate_json_stream(sc_p.SortedSet, io.BytesIO(b"[ ]")) == set()
+
+    # Error locations are indices into the whole array
+    with pytest.raises(ValidationError) as exc_info:
+        sc_p.validate_json_stream(
+            sc_p.SortedList[int], io.BytesIO(b'[1, 2, 3, 4, 5, 6, "x"]'), batch_size=2
+        )
+    assert [error["loc"] for error in exc_info.value.errors()] == [(6,)]
+
+    # Invalid JSON fails validation like validate_json
+    for invalid in (b"", b"[1, 2", b"[1 2]", b"[1,]", b"{}", b"[1] 2"):
+        with pytest.raises(ValidationError) as exc_info:
+            sc_p.validate_json_stream(sc_p.SortedList[int], io.BytesIO(invalid))
+        assert [error["type"] for error in exc_info.value.errors()] == ["json_invalid"]
+    with pytest.raises(ValidationError, match="Invalid JSON: expected ']', found end of input"):
+        sc_p.validate_json_stream(sc_p.SortedList[int], io.BytesIO(b"[1, 2"))
+    with pytest.raises(ValueError, match="batch_size"):
+        sc_p.validate_json_stream(sc_p.SortedList[int], io.BytesIO(b"[]"), batch_size=0)
+
+    # Empty items are rejected wherever the batch boundaries fall
+    for batch_size in (1, 2, 3):
+        for annotation, invalid in (
+            (sc_p.SortedList[int], b"[1,,2]"),
+            (sc_p.SortedList[int], b"[,1]"),
+            (sc_p.SortedList[int], b"[1,]"),
+            (sc_p.SortedList[int], b"[1,2,]"),
+            (sc_p.SortedList[int], b"[1, 2 ,\n ]"),
+            (sc_p.SortedList[int], b"[,]"),
+            (sc_p.SortedDict[str, int], b'{"a": 1,}'),
+            (sc_p.SortedDict[str, int], b'{"a": 1,, "b": 2}'),
+        ):
+            with pytest.raises(ValidationError, match="Invalid JSON"):
+                sc_p.validate_json_stream(annotation, io.BytesIO(invalid), batch_size=batch_size)
+        actual = sc_p.validate_json_stream(
+            sc_p.SortedList[list], io.BytesIO(b"[[3], [], [2, 1]]"), batch_size=batch_size
+        )
+        assert list(actual) == [[], [2, 1], [3]]
+
+    # Duplicates are dropped while reading a SortedSet
+    validator = sc_p._streaming._StreamValidator(sc_p.SortedSet[int], batch_size=2)
+    for batch in validator.split("[3, 1, 3, 1, 2, 3]"):
+        validator.add(batch)
+    assert validator.values == {1, 2, 3}
+    assert list(validator.finish()) == [1, 2, 3]
+
+    # Out of order values with Presorted(strict=True) fail validation
+    presorted = Annotated[sc_p.SortedList[int], sc_p.Presorted(strict=True)]
+    actual = sc_p.validate_json_stream(presorted, io.BytesIO(b"[1, 2, 3]"), batch_size=2)
+    assert list(actual) == [1, 2, 3]
+    with pytest.raises(ValidationError) as exc_info:
+        sc_p.validate_json_stream(presorted, io.BytesIO(b"[1, 3, 2]"), batch_size=2)
+    assert [error["type"] for error in exc_info.value.errors()] == ["value_error"]
+    with pytest.raises(sc_p.UnsupportedSourceTypeError):
+        sc_p.validate_json_stream(List[int], io.BytesIO(b"[]"))
+
+
+def test_validate_json_stream_async():
+    values = random.sample(range(100_000), 2000)
+    data = json.dumps(values).encode()
+
+    async def chunks():
+        for i in range(0, len(data), 7):
+            yield data[i : i + 7]
+
+    async def validate_stream_reader():
+        reader = asyncio.StreamReader()
+        reader.feed_data(data)
+        reader.feed_eof()
+        return await sc_p.validate_json_stream_async(sc_p.SortedList[int], reader, chunk_size=11)
+
+    async def validate_with_other_task():
+        ticks = 0
+
+        async def tick():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0)
+
+        task = asyncio.create_task(tick())
+        result = await sc_p.validate_json_stream_async(
+            sc_p.SortedSet[int], chunks(), batch_size=100
+        )
+        task.cancel()
+        return result, ticks
+
+    actual = asyncio.run(validate_stream_reader())
+    actual._check()
+    assert list(actual) == sorted(values)
+
+    # Other tasks run between batches
+    actual, ticks = asyncio.run(validate_with_other_task())
+    assert list(actual) == sorted(values)
+    assert ticks >= len(values) // 100
+
+    async def invalid_chunks():
+        yield b'[1, "x", 3]'
+
+    with pytest.raises(ValidationError):
+        asyncio.run(sc_p.validate_json_stream_async(sc_p.SortedList[int], invalid_chunks()))
+
+
+def test_validate_json_many():
+    payloads = [json.dumps(random.sample(range(1000), 100)) for _ in range(20)]
+    payloads[3] = '[1, "x"]'
+    annotation = Annotated[sc_p.SortedList[int], sc_p.Key(operator.neg)]
+    ta = TypeAdapter(annotation)
+
+    def check(results):
+        assert len(results) == len(payloads)
+        for payload, result in zip(payloads, results):
+            if payload == payloads[3]:
+                assert isinstance(result, ValidationError)
+                assert [error["loc"] for error in result.errors()] == [(1,)]
+            else:
+                result._check()
+                assert type(result) is sc_p.SortedKeyList
+                assert result == ta.validate_json(payload)
+
+    check(sc_p.validate_json_many(annotation, payloads, max_workers=1))
+    check(sc_p.validate_json_many(annotation, payloads, max_workers=2, chunk_size=3))
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        check(sc_p.validate_json_many(annotation, payloads, chunk_size=3, executor=executor))
+
+    with pytest.raises(ValueError):
+        sc_p.validate_json_many(annotation, payloads, max_workers=0)
+
+
+def test_delta():
+    class MyModel(BaseModel):
+        tags: sc_p.SortedSet[int]
+        index: sc_p.SortedDict[int, str]
+        scores: Annotated[sc_p.SortedList[int], sc_p.Key(operator.neg)]
+        name: str = "name"
+
+    def make_model():
+        return MyModel(tags=range(10), index={i: str(i) for i in range(10)}, scores=[1, 1, 2])
+
+    model = make_model()
+    snapshot = sc_p.Snapshot(model)
+    assert snapshot.delta(model) == {}
+    model.tags.add(100)
+    model.tags.discard(5)
+    model.index[3] = "changed"
+    model.index[100] = "new"
+    del model.index[7]
+    model.scores.add(9)
+    model.scores.remove(1)
+    assert snapshot.delta(model) == {
+        "tags": sc_p.Delta(add=[100], remove=[5]),
+        "index": sc_p.Delta(remove=[7], set={3: "changed", 100: "new"}),
+        "scores": sc_p.Delta(add=[9], remove=[1]),
+    }
+    dumped = snapshot.dump_delta(model, mode="json")
+    assert dumped == {
+        "tags": {"add": [100], "remove": [5]},
+        "index": {"set": {"3": "changed", "100": "new"}, "remove": [7]},
+        "scores": {"add": [9], "remove": [1]},
+    }
+
+    # Validate the dumped changes from JSON and apply them to another instance
+    other = make_model()
+    for name, annotation in (
+        ("tags", sc_p.SortedSet[int]),
+        ("index", sc_p.SortedDict[int, str]),
+        ("scores", Annotated[sc_p.SortedList[int], sc_p.Key(operator.neg)]),
+    ):
+        delta = TypeAdapter(sc_p.Delta[annotation]).validate_json(json.dumps(dumped[name]))
+        assert delta.apply(getattr(other, name)) is getattr(other, name)
+        getattr(other, name)._check()
+    assert other == model
+
+    ta = TypeAdapter(sc_p.Delta[sc_p.SortedSet[int]])
+    assert ta.validate_python({"add": ["1"]}) == sc_p.Delta(add=[1])
+    assert ta.validate_python({}) == sc_p.Delta()
+    # Removing missing values is ignored
+    assert ta.validate_python({"remove": [1, 100]}).apply(sc_p.SortedSet([1, 2])) == {2}
+    for invalid in ({"add": ["x"]}, {"set": {1: 2}}):
+        with pytest.raises(ValidationError):
+            ta.validate_python(invalid)
+    with pytest.raises(sc_p.UnsupportedSourceTypeError):
+        TypeAdapter(sc_p.Delta[List[int]])
+
+    # Optional fields are included, with None treated as an empty container
+    class OptionalModel(BaseModel):
+        tags: Optional[sc_p.SortedSet[int]] = None
+        index: Union[sc_p.SortedDict[int, str], None] = None
+        scores: Optional[Annotated[sc_p.SortedList[int], sc_p.Key(operator.neg)]] = None
+
+    model = OptionalModel(tags=[1, 2])
+    snapshot = sc_p.Snapshot(model)
+    assert set(snapshot.containers) == {"tags", "index", "scores"}
+    assert snapshot.delta(model) == {}
+    model.tags = None
+    model.index = sc_p.SortedDict({1: "a"})
+    model.scores = sc_p.SortedKeyList([3, 4], key=operator.neg)
+    assert snapshot.delta(model) == {
+        "tags": sc_p.Delta(remove=[1, 2]),
+        "index": sc_p.Delta(set={1: "a"}),
+        "scores": sc_p.Delta(add=[4, 3]),
+    }
+    assert snapshot.dump_delta(model, mode="json") == {
+        "tags": {"add": [], "remove": [1, 2]},
+        "index": {"set": {"1": "a"}, "remove": []},
+        "scores": {"add": [4, 3], "remove": []},
+    }
+    assert sc_p.Delta.between(None, None) == sc_p.Delta()
 
 
 def test_annotation_with_bad_source_type():